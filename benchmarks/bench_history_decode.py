@@ -0,0 +1,144 @@
+# 해외 거래내역 10,000건 응답의 디코딩~직렬화 비용 비교
+# (str 디코딩 + 응답 모델 재검증 + FastAPI 기본 직렬화 / bytes 검증 + TradeBatch 컬럼 + TradeBatch.to_json)
+# 사용법: python benchmarks/bench_history_decode.py
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from rich_stock.core.kis_pager import get_type_adapter
+from rich_stock.entities.kis_history_entity import KISOverseasDailyHistoryResponse
+from rich_stock.models.history_model import (
+    DailyHistoryDetailResponse,
+    DailyHistoryResponse,
+)
+from rich_stock.repositories.trade_batch import TradeBatch
+
+
+def make_payload(rows: int) -> bytes:
+    row = {
+        "trad_dt": "20240902",
+        "sttl_dt": "20240904",
+        "sll_buy_dvsn_cd": "02",
+        "sll_buy_dvsn_name": "매수",
+        "pdno": "AAPL",
+        "ovrs_item_name": "애플",
+        "ccld_qty": "3",
+        "amt_unit_ccld_qty": "3.000000",
+        "ft_ccld_unpr2": "229.000000",
+        "ovrs_stck_ccld_unpr": "229.00000000",
+        "tr_frcr_amt2": "687.000000",
+        "tr_amt": "0",
+        "frcr_excc_amt_1": "687.170000",
+        "wcrc_excc_amt": "0",
+        "dmst_frcr_fee1": "0.170000",
+        "frcr_fee1": "0.170000",
+        "dmst_wcrc_fee": "0",
+        "ovrs_wcrc_fee": "0",
+        "crcy_cd": "USD",
+        "std_pdno": "US0378331005",
+        "erlm_exrt": "1340.00000000",
+        "loan_dvsn_cd": "01",
+        "loan_dvsn_name": "현금",
+    }
+    return json.dumps(
+        {
+            "rt_cd": "0",
+            "msg_cd": "KIOK0000",
+            "msg1": "조회가 완료되었습니다",
+            "ctx_area_fk100": "",
+            "ctx_area_nk100": "",
+            "output1": [row] * rows,
+            "output2": {
+                "frcr_buy_amt_smtl": "6870000.000000",
+                "frcr_sll_amt_smtl": "0",
+                "dmst_fee_smtl": "0",
+                "ovrs_fee_smtl": "1700.000000",
+            },
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+def to_detail(item) -> DailyHistoryDetailResponse:
+    return DailyHistoryDetailResponse(
+        trade_day=item.trad_dt,
+        sell_buy_type=item.sll_buy_dvsn_cd,
+        ticker=item.pdno,
+        ticker_name=item.ovrs_item_name,
+        trade_quantity=item.ccld_qty,
+        trade_quantity_decimal=item.amt_unit_ccld_qty,
+        trade_price_unit=item.ft_ccld_unpr2,
+        trade_price=item.tr_frcr_amt2,
+        trade_fee=item.frcr_fee1,
+        currency=item.crcy_cd,
+    )
+
+
+def validated(body: bytes) -> bytes:
+    kis_response = KISOverseasDailyHistoryResponse.model_validate_json(body.decode())
+    response = DailyHistoryResponse(
+        items=[to_detail(item) for item in kis_response.output1],
+        total_buy_amount=kis_response.output2.frcr_buy_amt_smtl,
+        total_sell_amount=kis_response.output2.frcr_sll_amt_smtl,
+    )
+    # FastAPI 가 response_model 로 돌려받은 값을 처리하는 방식: dict 로 풀어 재검증 후 json.dumps
+    response = DailyHistoryResponse.model_validate(response.model_dump())
+    return json.dumps(
+        response.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def columnar(body: bytes) -> bytes:
+    # KISOverseasDailyHistoryRepository.iter_market_history 와 get_daily_history 가 하는 일
+    kis_response = get_type_adapter(KISOverseasDailyHistoryResponse).validate_json(body)
+    page = TradeBatch()
+    for item in kis_response.output1:
+        page.append(
+            item.trad_dt,
+            item.sll_buy_dvsn_cd,
+            item.pdno,
+            item.ovrs_item_name,
+            item.ccld_qty,
+            item.amt_unit_ccld_qty,
+            item.ft_ccld_unpr2,
+            item.tr_frcr_amt2,
+            item.frcr_fee1,
+            item.crcy_cd,
+        )
+    batch = TradeBatch.concatenate(
+        [page],
+        kis_response.output2.frcr_buy_amt_smtl,
+        kis_response.output2.frcr_sll_amt_smtl,
+    )
+    return batch.to_json()
+
+
+def main(rows: int = 10000, repeat: int = 5) -> None:
+    body = make_payload(rows)
+    assert json.loads(validated(body)) == json.loads(columnar(body))
+    print(f"payload {len(body) / 1024:.0f} KiB, {rows} rows")
+
+    for name, func in (("validated", validated), ("TradeBatch", columnar)):
+        cpu_seconds = min(_cpu_time(func, body) for _ in range(repeat))
+        tracemalloc.start()
+        func(body)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:<18} {cpu_seconds * 1e3:8.2f} ms cpu"
+            f" {peak / 1024 / 1024:8.2f} MiB peak alloc"
+        )
+
+
+def _cpu_time(func, body: bytes) -> float:
+    started = time.process_time()
+    func(body)
+    return time.process_time() - started
+
+
+if __name__ == "__main__":
+    main()
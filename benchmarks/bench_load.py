@@ -0,0 +1,217 @@
+# KIS 대역 서버를 띄우고 API 서버에 동시 부하를 걸어 라우트별 처리량/지연시간을 잰다.
+# 결과는 JSON 으로 저장해서 실행 간에 비교할 수 있게 한다.
+# 사용법: python benchmarks/bench_load.py --concurrency 32 --duration 10 --latency-ms 30 --pages 3
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import aiohttp
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARK_DIR, "..", "src")
+
+
+def default_routes() -> list[str]:
+    end_date = date.today() - timedelta(days=3)
+    begin_date = end_date - timedelta(days=6)
+    period = f"begin_date={begin_date:%Y%m%d}&end_date={end_date:%Y%m%d}"
+    return [
+        "/my_balance/kr",
+        "/my_balance/overseas",
+        f"/history/daily/kr?{period}",
+        f"/history/daily/overseas?{period}",
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.head(url) as response:
+                    await response.read()
+                    return
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def run_route(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: dict,
+    concurrency: int,
+    duration: float,
+) -> dict:
+    latencies = []
+    status_codes: dict[str, int] = {}
+    deadline = time.monotonic() + duration
+
+    async def worker() -> None:
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            async with session.get(url, headers=headers) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - started)
+            key = str(response.status)
+            status_codes[key] = status_codes.get(key, 0) + 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    quantiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return {
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+        "status_codes": status_codes,
+    }
+
+
+async def run(args: argparse.Namespace, app_env: dict | None = None) -> dict:
+    emulator_port, app_port = free_port(), free_port()
+    emulator_url = f"http://127.0.0.1:{emulator_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    emulator = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BENCHMARK_DIR, "kis_emulator.py"),
+            f"--port={emulator_port}",
+            f"--latency-ms={args.latency_ms}",
+            f"--rows={args.rows}",
+            f"--pages={args.pages}",
+            f"--rate-limit={args.rate_limit}",
+            f"--error-rate={args.error_rate}",
+            f"--slow-rate={args.slow_rate}",
+            f"--slow-ms={args.slow_ms}",
+        ]
+    )
+    env = {
+        # 캐시/로컬 저장소가 결과를 가리지 않도록 기본은 끄고, --keep-caches 로 켠다.
+        **({} if args.keep_caches else {"balance_cache_ttl": "0"}),
+        **({} if args.keep_caches else {"history_store_path": ""}),
+        "token_cache_path": "",
+        **os.environ,
+        "api_key": "benchmark",
+        "real_domain": emulator_url,
+        "mock_domain": emulator_url,
+        **(app_env or {}),
+    }
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "rich_stock.main:app",
+            f"--port={app_port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+    )
+
+    try:
+        await wait_until_ready(emulator_url + "/")
+        await wait_until_ready(app_url + "/docs")
+
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(app_url, connector=connector) as session:
+            async with session.post(
+                "/auth/issue_token",
+                json={
+                    "appkey": "benchmark",
+                    "appsecret": "benchmark",
+                    "account_number": "12345678-01",
+                    "is_real_domain": True,
+                },
+            ) as response:
+                token = (await response.json())["token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            results = {}
+            for route in args.routes or default_routes():
+                # 연결과 캐시를 데운 뒤에 측정한다.
+                await run_route(session, route, headers, 1, 0.2)
+                results[route] = await run_route(
+                    session, route, headers, args.concurrency, args.duration
+                )
+                print(
+                    f"{route:<60} {results[route]['requests_per_second']:8.1f} req/s"
+                    f"  p50 {results[route]['p50_ms']:7.1f} ms"
+                    f"  p95 {results[route]['p95_ms']:7.1f} ms"
+                    f"  p99 {results[route]['p99_ms']:7.1f} ms"
+                    f"  {results[route]['status_codes']}"
+                )
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(emulator_url + "/stats") as response:
+                upstream_requests = await response.json()
+    finally:
+        app.terminate()
+        emulator.terminate()
+        app.wait()
+        emulator.wait()
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "routes": results,
+        "upstream_requests": upstream_requests,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="rich-stock load benchmark")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="라우트당 초")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument("--keep-caches", action="store_true")
+    parser.add_argument("--routes", nargs="*", help="측정할 경로 (기본: 잔고/거래내역)")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(
+            BENCHMARK_DIR, "results", f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+        ),
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
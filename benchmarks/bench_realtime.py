@@ -0,0 +1,224 @@
+# KIS 대역 서버의 실시간 웹소켓에 API 서버를 붙이고, 여러 클라이언트가 같은 종목을 구독할 때
+# KIS 연결/구독이 하나로 합쳐지는지와 전달 지연, 느린 클라이언트가 끊기는지를 확인한다.
+# 사용법: python benchmarks/bench_realtime.py --clients 10 --tickers 10 --tick-ms 20 --slow-clients 1
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import aiohttp
+
+from bench_load import BENCHMARK_DIR, SRC_DIR, free_port, wait_until_ready
+
+
+async def run_client(
+    session: aiohttp.ClientSession,
+    url: str,
+    keys: list[str],
+    duration: float,
+    latencies: list[float],
+) -> int:
+    received = 0
+    async with session.ws_connect(url) as websocket:
+        for key in keys:
+            await websocket.send_json(
+                {"action": "subscribe", "channel": "H0STCNT0", "key": key}
+            )
+        deadline = time.monotonic() + duration
+        while (timeout := deadline - time.monotonic()) > 0:
+            try:
+                message = await websocket.receive(timeout=timeout)
+            except TimeoutError:
+                break
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            fields = json.loads(message.data).get("fields")
+            if fields:
+                received += 1
+                latencies.append(time.time() * 1000 - float(fields[-1]))
+    return received
+
+
+def masked_frame(payload: bytes) -> bytes:
+    mask = os.urandom(4)
+    header = bytes([0x81, 0x80 | len(payload)])
+    return header + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+async def run_slow_client(
+    port: int, path: str, keys: list[str], duration: float
+) -> None:
+    # 수신 버퍼를 작게 잡고 전혀 읽지 않아서, 서버 쪽 전송이 막히는 클라이언트를 만든다.
+    # (웹소켓 라이브러리는 내부 버퍼에 계속 받아두므로 직접 핸드셰이크한다.)
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    sock.setblocking(False)
+    reader, writer = await asyncio.open_connection(sock=sock, limit=4096)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: 127.0.0.1:{port}\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {base64.b64encode(os.urandom(16)).decode()}\r\n"
+        "Sec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    await reader.readuntil(b"\r\n\r\n")
+    for key in keys:
+        writer.write(
+            masked_frame(
+                json.dumps(
+                    {"action": "subscribe", "channel": "H0STCNT0", "key": key}
+                ).encode()
+            )
+        )
+    await asyncio.sleep(duration)
+    writer.close()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    emulator_port, app_port = free_port(), free_port()
+    emulator_url = f"http://127.0.0.1:{emulator_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    emulator = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BENCHMARK_DIR, "kis_emulator.py"),
+            f"--port={emulator_port}",
+            f"--tick-ms={args.tick_ms}",
+        ]
+    )
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "rich_stock.main:app",
+            f"--port={app_port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        cwd=SRC_DIR,
+        env={
+            "history_store_path": "",
+            "token_cache_path": "",
+            **os.environ,
+            "api_key": "benchmark",
+            "metrics_token": "benchmark",
+            "real_domain": emulator_url,
+            "mock_domain": emulator_url,
+            "real_websocket_domain": f"ws://127.0.0.1:{emulator_port}/websocket",
+            "realtime_queue_size": str(args.queue_size),
+        },
+    )
+
+    try:
+        await wait_until_ready(emulator_url + "/")
+        await wait_until_ready(app_url + "/docs")
+
+        async with aiohttp.ClientSession(app_url) as session:
+            async with session.post(
+                "/auth/issue_token",
+                json={
+                    "appkey": "benchmark",
+                    "appsecret": "benchmark",
+                    "account_number": "12345678-01",
+                    "is_real_domain": True,
+                },
+            ) as response:
+                token = (await response.json())["token"]
+            url = f"/realtime/ws?token={token}"
+            keys = [f"{i:06d}" for i in range(args.tickers)]
+
+            latencies: list[float] = []
+            results = await asyncio.gather(
+                *(
+                    run_client(session, url, keys, args.duration, latencies)
+                    for _ in range(args.clients)
+                ),
+                *(
+                    run_slow_client(app_port, url, keys, args.duration)
+                    for _ in range(args.slow_clients)
+                ),
+            )
+            received = results[: args.clients]
+
+            async with session.get(
+                "/metrics", headers={"Authorization": "Bearer benchmark"}
+            ) as response:
+                dropped = sum(
+                    float(line.split()[-1])
+                    for line in (await response.text()).splitlines()
+                    if line.startswith("realtime_dropped_subscribers_total")
+                )
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(emulator_url + "/stats") as response:
+                upstream = await response.json()
+    finally:
+        app.terminate()
+        emulator.terminate()
+        app.wait()
+        emulator.wait()
+
+    quantiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    )
+    result = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "messages_per_client": statistics.mean(received) if received else 0,
+        "latency_p50_ms": quantiles[49],
+        "latency_p99_ms": quantiles[98],
+        "dropped_subscribers": dropped,
+        "upstream": upstream,
+    }
+    print(
+        f"clients {args.clients} x tickers {args.tickers}:"
+        f" {result['messages_per_client']:.0f} msgs/client"
+        f"  p50 {result['latency_p50_ms']:.1f} ms  p99 {result['latency_p99_ms']:.1f} ms"
+    )
+    print(
+        f"upstream ws_connections={upstream.get('ws_connections')}"
+        f" ws_subscribe={upstream.get('ws_subscribe')}"
+        f"  dropped subscribers={dropped:.0f}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="rich-stock realtime fan-out benchmark"
+    )
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--slow-clients", type=int, default=1)
+    parser.add_argument("--tickers", type=int, default=10)
+    parser.add_argument("--tick-ms", type=float, default=20.0)
+    parser.add_argument("--queue-size", type=int, default=256)
+    # 커널 송신 버퍼(수 MB)가 다 차야 느린 클라이언트가 밀리기 시작하므로 넉넉히 잡는다.
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument(
+        "--output",
+        default=os.path.join(
+            BENCHMARK_DIR, "results", f"realtime-{datetime.now():%Y%m%d-%H%M%S}.json"
+        ),
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
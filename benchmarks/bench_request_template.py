@@ -0,0 +1,59 @@
+# KIS 요청 헤더/파라미터 생성 비용 비교 (요청마다 pydantic 생성+dump / 캐시된 템플릿)
+# 사용법: python benchmarks/bench_request_template.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from rich_stock.entities.kis_base_entity import KISRequestHeaderBase
+from rich_stock.entities.kis_history_entity import KISDomesticDailyHistoryRequest
+from rich_stock.models.token_credential_model import TokenCredential
+from rich_stock.repositories.kis_request_template import (
+    PLACEHOLDER_DATE,
+    get_request_header,
+    get_request_template,
+)
+
+
+def main(number: int = 20000) -> None:
+    token_credential = TokenCredential(
+        appkey="a" * 36,
+        appsecret="s" * 180,
+        account_number="12345678-01",
+        is_real_domain=True,
+        access_token="t" * 350,
+        expires_in=86400,
+        access_token_token_expired="2099-12-31 23:59:59",
+    )
+
+    def per_request() -> None:
+        KISRequestHeaderBase(
+            authorization=f"{token_credential.token_type} {token_credential.access_token}",
+            appkey=token_credential.appkey,
+            appsecret=token_credential.appsecret,
+            tr_id="TTTC8001R",
+        ).model_dump()
+        KISDomesticDailyHistoryRequest(
+            account_number=token_credential.get_account_number_prefix(),
+            account_code=token_credential.get_account_number_suffix(),
+            begin_date="20240901",
+            end_date="20241001",
+        ).model_dump(by_alias=True)
+
+    def template() -> None:
+        get_request_header(token_credential, "TTTC8001R")
+        get_request_template(
+            KISDomesticDailyHistoryRequest,
+            token_credential.account_number,
+            begin_date=PLACEHOLDER_DATE,
+            end_date=PLACEHOLDER_DATE,
+        ).render(begin_date="20240901", end_date="20241001")
+
+    for name, func in (("pydantic per request", per_request), ("template", template)):
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<22} {seconds / number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
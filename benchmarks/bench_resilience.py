@@ -0,0 +1,68 @@
+# KIS 대역 서버에 간헐적인 EGW00201 오류와 느린 응답을 섞어 두고,
+# 재시도/hedged request 설정별로 성공률과 꼬리 지연(p99)을 비교한다.
+# 사용법: python benchmarks/bench_resilience.py --error-rate 0.05 --slow-rate 0.02 --slow-ms 500
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from bench_load import BENCHMARK_DIR, run
+
+
+SCENARIOS = {
+    "no_resilience": {"kis_retry_attempts": "0", "kis_hedge_delay": "0"},
+    "retry": {"kis_retry_attempts": "2", "kis_hedge_delay": "0"},
+    "retry_hedge": {"kis_retry_attempts": "2"},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="rich-stock resilience benchmark")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="시나리오당 초")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.02)
+    parser.add_argument("--slow-ms", type=float, default=500.0)
+    parser.add_argument(
+        "--hedge-delay", type=float, default=0.1, help="retry_hedge 시나리오의 초"
+    )
+    parser.add_argument("--routes", nargs="*", default=["/my_balance/kr"])
+    parser.add_argument(
+        "--output",
+        default=os.path.join(
+            BENCHMARK_DIR,
+            "results",
+            f"resilience-{datetime.now():%Y%m%d-%H%M%S}.json",
+        ),
+    )
+    args = parser.parse_args()
+    load_args = argparse.Namespace(
+        **vars(args), pages=1, rate_limit=0.0, keep_caches=False
+    )
+
+    results = {}
+    for name, app_env in SCENARIOS.items():
+        print(f"[{name}]")
+        results[name] = asyncio.run(
+            run(
+                load_args,
+                {
+                    "kis_hedge_delay": str(args.hedge_delay),
+                    # 오류율을 재는 것이 목적이므로 circuit breaker 는 열리지 않게 한다.
+                    "kis_breaker_failures": "1000000",
+                    **app_env,
+                },
+            )
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
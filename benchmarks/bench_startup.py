@@ -0,0 +1,229 @@
+# API 서버의 콜드 스타트 비용을 잰다: rich_stock.main 임포트 시간과,
+# 프로세스를 띄운 뒤 첫 응답까지/라우트별 첫 요청과 두 번째 요청의 지연시간.
+# 사용법: python benchmarks/bench_startup.py --runs 5 --importtime-top 15
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import aiohttp
+
+from bench_load import (
+    BENCHMARK_DIR,
+    SRC_DIR,
+    default_routes,
+    free_port,
+    wait_until_ready,
+)
+
+
+# 라우터와 무거운 모듈은 create_app() 에서 임포트하므로 모듈 임포트와 앱 생성을 따로 잰다.
+IMPORT_SCRIPT = (
+    "import time; started = time.perf_counter(); import rich_stock.main;"
+    " imported = time.perf_counter(); rich_stock.main.create_app();"
+    " print(imported - started, time.perf_counter() - imported)"
+)
+
+
+def measure_import(env: dict) -> tuple[float, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    import_seconds, create_app_seconds = output.split()
+    return float(import_seconds), float(create_app_seconds)
+
+
+def importtime_top(env: dict, top: int) -> list[tuple[str, float]]:
+    # -X importtime 의 모듈별 self 시간을 최상위 패키지 단위로 더해서 무거운 순으로 보여준다.
+    stderr = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import rich_stock.main; rich_stock.main.create_app()",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    packages: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        elapsed, _, name = line.removeprefix("import time:").split("|")
+        if elapsed.strip().isdigit():
+            package = name.strip().split(".")[0]
+            packages[package] = packages.get(package, 0) + int(elapsed) / 1000
+    return sorted(packages.items(), key=lambda package: package[1], reverse=True)[:top]
+
+
+async def measure_startup(args: argparse.Namespace, env: dict, port: int) -> dict:
+    app_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            *args.target.split(),
+            f"--port={port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+    )
+    try:
+        async with aiohttp.ClientSession(app_url) as session:
+            while True:
+                try:
+                    async with session.get(
+                        "/metrics", headers={"Authorization": "Bearer benchmark"}
+                    ) as response:
+                        await response.read()
+                        break
+                except aiohttp.ClientError:
+                    if time.perf_counter() - started > 30:
+                        raise
+                    await asyncio.sleep(0.01)
+            ready = time.perf_counter() - started
+
+            request_started = time.perf_counter()
+            async with session.post(
+                "/auth/issue_token",
+                json={
+                    "appkey": "benchmark",
+                    "appsecret": "benchmark",
+                    "account_number": "12345678-01",
+                    "is_real_domain": True,
+                },
+            ) as response:
+                token = (await response.json())["token"]
+            routes = {"/auth/issue_token": [time.perf_counter() - request_started]}
+            headers = {"Authorization": f"Bearer {token}"}
+
+            for route in args.routes or default_routes():
+                routes[route] = []
+                for _ in range(2):
+                    request_started = time.perf_counter()
+                    async with session.get(route, headers=headers) as response:
+                        await response.read()
+                    routes[route].append(time.perf_counter() - request_started)
+    finally:
+        app.terminate()
+        app.wait()
+
+    return {"ready": ready, "routes": routes}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    emulator_port = free_port()
+    emulator_url = f"http://127.0.0.1:{emulator_port}"
+    emulator = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BENCHMARK_DIR, "kis_emulator.py"),
+            f"--port={emulator_port}",
+            f"--latency-ms={args.latency_ms}",
+        ]
+    )
+    env = {
+        "balance_cache_ttl": "0",
+        "history_store_path": "",
+        "token_cache_path": "",
+        **os.environ,
+        "api_key": "benchmark",
+        "metrics_token": "benchmark",
+        "real_domain": emulator_url,
+        "mock_domain": emulator_url,
+    }
+
+    try:
+        await wait_until_ready(emulator_url + "/")
+        imports = [measure_import(env) for _ in range(args.runs)]
+        startups = [
+            await measure_startup(args, env, free_port()) for _ in range(args.runs)
+        ]
+    finally:
+        emulator.terminate()
+        emulator.wait()
+
+    result = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "import_ms": statistics.median(seconds for seconds, _ in imports) * 1000,
+        "create_app_ms": statistics.median(seconds for _, seconds in imports) * 1000,
+        "ready_ms": statistics.median(startup["ready"] for startup in startups) * 1000,
+        "routes": {
+            route: {
+                "first_ms": statistics.median(
+                    startup["routes"][route][0] for startup in startups
+                )
+                * 1000,
+                "second_ms": statistics.median(
+                    startup["routes"][route][-1] for startup in startups
+                )
+                * 1000,
+            }
+            for route in startups[0]["routes"]
+        },
+    }
+    print(
+        f"import rich_stock.main {result['import_ms']:7.1f} ms"
+        f"  create_app() {result['create_app_ms']:7.1f} ms"
+        f"  process start -> first response {result['ready_ms']:7.1f} ms"
+    )
+    for route, timing in result["routes"].items():
+        print(
+            f"{route:<60} first {timing['first_ms']:7.1f} ms"
+            f"  second {timing['second_ms']:7.1f} ms"
+        )
+
+    if args.importtime_top:
+        result["importtime_ms"] = dict(importtime_top(env, args.importtime_top))
+        for name, elapsed in result["importtime_ms"].items():
+            print(f"  {name:<50} {elapsed:7.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="rich-stock cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--target",
+        default="rich_stock.main:app",
+        help='uvicorn 대상 (예: "rich_stock.main:create_app --factory")',
+    )
+    parser.add_argument("--importtime-top", type=int, default=10)
+    parser.add_argument("--routes", nargs="*", help="측정할 경로 (기본: 잔고/거래내역)")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(
+            BENCHMARK_DIR, "results", f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+        ),
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# 거래내역 10만 건을 행 모델 리스트(DailyHistoryDetailResponse)와 컬럼형 TradeBatch 로 들고 있을 때의
+# 메모리와, 각각에서 DailyHistoryResponse JSON 을 만드는 시간을 비교한다. (두 JSON 은 같아야 한다)
+# If-None-Match 비교에 쓰는 TradeBatch ETag 계산 시간도 같이 잰다.
+# 사용법: python benchmarks/bench_trade_batch.py --trades 100000
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pydantic_core import to_json
+
+from rich_stock.models.enums import CurrencyCode, SellBuyType
+from rich_stock.models.history_model import (
+    DailyHistoryDetailResponse,
+    DailyHistoryResponse,
+)
+from rich_stock.repositories.trade_batch import TRADE_FIELDS, TradeBatch
+
+
+def make_rows(count: int) -> list[tuple]:
+    # KIS 응답을 파싱한 것처럼 문자열은 행마다 새 객체로 만든다.
+    return [
+        (
+            f"2024{index % 12 + 1:02d}{index % 28 + 1:02d}",
+            SellBuyType.BUY if index % 3 else SellBuyType.SELL,
+            f"{index % 200:06d}",
+            f"종목{index % 200}",
+            index % 100 + 1,
+            0.0,
+            70000.0 + index % 500,
+            (70000.0 + index % 500) * (index % 100 + 1),
+            float(index % 7),
+            CurrencyCode.KRW,
+        )
+        for index in range(count)
+    ]
+
+
+def build_models(rows: list[tuple]) -> list[DailyHistoryDetailResponse]:
+    return [
+        DailyHistoryDetailResponse.model_construct(**dict(zip(TRADE_FIELDS, row)))
+        for row in rows
+    ]
+
+
+def build_batch(rows: list[tuple]) -> TradeBatch:
+    batch = TradeBatch()
+    for row in rows:
+        batch.append(*row)
+    return batch
+
+
+def measure(build, rows: list[tuple]) -> tuple[object, float]:
+    # 입력 행은 재기 전에 만들어 두고, 만든 결과가 새로 잡은 메모리만 잰다.
+    tracemalloc.start()
+    value = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TradeBatch memory benchmark")
+    parser.add_argument("--trades", type=int, default=100_000)
+    args = parser.parse_args()
+
+    models, models_mb = measure(build_models, make_rows(args.trades))
+    batch, batch_mb = measure(build_batch, make_rows(args.trades))
+
+    started = time.perf_counter()
+    models_json = to_json(
+        DailyHistoryResponse.model_construct(
+            items=models, total_buy_amount=0.0, total_sell_amount=0.0
+        )
+    )
+    models_json_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    batch_json = batch.to_json()
+    batch_json_ms = (time.perf_counter() - started) * 1000
+    assert models_json == batch_json, "JSON 이 다릅니다."
+    started = time.perf_counter()
+    batch.etag()
+    etag_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{args.trades} trades ({len(batch_json) / 1024 / 1024:.1f} MB JSON)")
+    print(
+        f"{'DailyHistoryDetailResponse list':<32} {models_mb:7.1f} MB"
+        f"  to_json {models_json_ms:7.1f} ms"
+    )
+    print(f"{'TradeBatch':<32} {batch_mb:7.1f} MB  to_json {batch_json_ms:7.1f} ms")
+    print(f"{'TradeBatch.etag':<32} {etag_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# verify_token 1회 호출 비용 비교 (캐시 미스: 기존 경로 / 캐시 적중: 메모이즈 경로)
+# 사용법: python benchmarks/bench_verify_token.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("api_key", "benchmark")
+
+import jwt
+from fastapi.security import HTTPAuthorizationCredentials
+
+from rich_stock.controllers.auth_controller import verified_tokens, verify_token
+from rich_stock.core.settings import get_settings
+from rich_stock.models.token_credential_model import TokenCredential
+
+
+def call(credentials: HTTPAuthorizationCredentials) -> TokenCredential:
+    # verify_token 은 내부에서 await 하지 않으므로 이벤트 루프 없이 한 번에 실행된다.
+    try:
+        verify_token(credentials).send(None)
+    except StopIteration as e:
+        return e.value
+
+
+def main(number: int = 20000) -> None:
+    token_credential = TokenCredential(
+        appkey="a" * 36,
+        appsecret="s" * 180,
+        account_number="12345678-01",
+        is_real_domain=True,
+        access_token="t" * 350,
+        expires_in=86400,
+        access_token_token_expired="2099-12-31 23:59:59",
+    )
+    token = jwt.encode(
+        token_credential.model_dump(), get_settings().api_key, algorithm="HS256"
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def cold() -> None:
+        verified_tokens.clear()
+        call(credentials)
+
+    def warm() -> None:
+        call(credentials)
+
+    for name, func in (("miss (decode + validate)", cold), ("hit (memoized)", warm)):
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<26} {seconds / number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,541 @@
+# 부하 테스트용 KIS API 대역 서버
+# 토큰 발급, 국내/해외 잔고조회, 국내 일별주문체결조회, 해외 기간손익(체결내역) 조회, 국내/해외 현재가와
+# 실시간 웹소켓(접속키 발급, 구독 등록/해제, 체결가 전송, PINGPONG)을 흉내낸다.
+# 사용법: python benchmarks/kis_emulator.py --port 18080 --latency-ms 30 --rows 100 --pages 3 --rate-limit 20
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+
+TICKERS = [("005930", "삼성전자"), ("000660", "SK하이닉스"), ("035420", "NAVER")]
+OVERSEAS_TICKERS = [("AAPL", "APPLE INC"), ("TSLA", "TESLA INC"), ("NVDA", "NVIDIA")]
+
+FILLER_FIELDS = ("1234567",) * 41
+
+RATE_LIMIT_ERROR = {
+    "rt_cd": "1",
+    "msg_cd": "EGW00201",
+    "msg1": "초당 거래건수를 초과하였습니다.",
+}
+
+
+class KISEmulator:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        rows: int = 100,
+        pages: int = 1,
+        rate_limit: float = 0.0,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 0.0,
+        tick_ms: float = 100.0,
+    ):
+        self.latency = latency_ms / 1000
+        self.rows = rows
+        self.pages = pages
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow = slow_ms / 1000
+        self.tick = tick_ms / 1000
+        # appkey → 최근 1초 동안 받은 요청 시각
+        self.request_times: dict[str, list[float]] = {}
+        self.counts: dict[str, int] = {}
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("HEAD", "/", self.head)
+        app.router.add_get("/stats", self.stats)
+        app.router.add_post("/oauth2/tokenP", self.token)
+        app.router.add_post("/oauth2/Approval", self.approval)
+        app.router.add_get("/websocket", self.websocket)
+        app.router.add_get(
+            "/uapi/domestic-stock/v1/quotations/inquire-price", self.domestic_quote
+        )
+        app.router.add_get(
+            "/uapi/overseas-price/v1/quotations/price", self.overseas_quote
+        )
+        app.router.add_get(
+            "/uapi/domestic-stock/v1/trading/inquire-balance", self.domestic_balance
+        )
+        app.router.add_get(
+            "/uapi/overseas-stock/v1/trading/inquire-balance", self.overseas_balance
+        )
+        app.router.add_get(
+            "/uapi/domestic-stock/v1/trading/inquire-daily-ccld", self.domestic_history
+        )
+        app.router.add_get(
+            "/uapi/overseas-stock/v1/trading/inquire-period-trans",
+            self.overseas_history,
+        )
+        return app
+
+    async def head(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.counts)
+
+    async def token(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        self.counts["tokenP"] = self.counts.get("tokenP", 0) + 1
+        expired = datetime.now() + timedelta(days=1)
+        return web.json_response(
+            {
+                "access_token": "emulator-" + "t" * 340,
+                "token_type": "Bearer",
+                "expires_in": 86400,
+                "access_token_token_expired": expired.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+
+    async def approval(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        self.counts["Approval"] = self.counts.get("Approval", 0) + 1
+        return web.json_response({"approval_key": "emulator-approval-key"})
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.counts["ws_connections"] = self.counts.get("ws_connections", 0) + 1
+        channels: set[tuple[str, str]] = set()
+        ticker = asyncio.create_task(self.send_ticks(websocket, channels))
+        try:
+            async for message in websocket:
+                if message.type != web.WSMsgType.TEXT:
+                    continue
+                body = json.loads(message.data)
+                if body["header"].get("tr_id") == "PINGPONG":
+                    self.counts["PINGPONG"] = self.counts.get("PINGPONG", 0) + 1
+                    continue
+                tr_type = body["header"]["tr_type"]
+                channel = (
+                    body["body"]["input"]["tr_id"],
+                    body["body"]["input"]["tr_key"],
+                )
+                if tr_type == "1":
+                    channels.add(channel)
+                    count_key = "ws_subscribe"
+                else:
+                    channels.discard(channel)
+                    count_key = "ws_unsubscribe"
+                self.counts[count_key] = self.counts.get(count_key, 0) + 1
+                await websocket.send_json(
+                    {
+                        "header": {
+                            "tr_id": channel[0],
+                            "tr_key": channel[1],
+                            "encrypt": "N",
+                        },
+                        "body": {
+                            "rt_cd": "0",
+                            "msg_cd": "OPSP0000",
+                            "msg1": (
+                                "SUBSCRIBE SUCCESS"
+                                if tr_type == "1"
+                                else "UNSUBSCRIBE SUCCESS"
+                            ),
+                        },
+                    }
+                )
+        except ConnectionResetError:
+            # 상대가 이미 연결을 닫는 중이다.
+            pass
+        finally:
+            ticker.cancel()
+        return websocket
+
+    async def send_ticks(
+        self, websocket: web.WebSocketResponse, channels: set[tuple[str, str]]
+    ) -> None:
+        sequence = 0
+        try:
+            while not websocket.closed:
+                await asyncio.sleep(self.tick)
+                sequence += 1
+                if sequence % 100 == 0:
+                    await websocket.send_json(
+                        {
+                            "header": {
+                                "tr_id": "PINGPONG",
+                                "datetime": f"{datetime.now():%Y%m%d%H%M%S}",
+                            }
+                        }
+                    )
+                for tr_id, tr_key in list(channels):
+                    # 마지막 필드에 보낸 시각(ms)을 넣어서 받는 쪽이 전달 지연을 잴 수 있게 한다.
+                    # 실제 국내주식 체결가(H0STCNT0)처럼 46개 필드를 채워 보낸다.
+                    fields = (
+                        tr_key,
+                        f"{datetime.now():%H%M%S}",
+                        str(70000 + random.randint(-500, 500)),
+                        str(sequence),
+                        *FILLER_FIELDS,
+                        f"{time.time() * 1000:.3f}",
+                    )
+                    await websocket.send_str(f"0|{tr_id}|001|{'^'.join(fields)}")
+        except ConnectionResetError:
+            pass
+
+    async def respond(
+        self,
+        request: web.Request,
+        make_body,
+        fk_alias: str | None = None,
+        nk_alias: str | None = None,
+    ) -> web.Response:
+        # 일부 요청만 느리게 응답해서 꼬리 지연(p99)을 흉내 낸다.
+        slow = self.slow_rate and random.random() < self.slow_rate
+        await asyncio.sleep(self.latency + (self.slow if slow else 0))
+        tr_id = request.headers.get("tr_id", "")
+        self.counts[tr_id] = self.counts.get(tr_id, 0) + 1
+
+        if self.is_rate_limited(request.headers.get("appkey", "")) or (
+            self.error_rate and random.random() < self.error_rate
+        ):
+            self.counts["EGW00201"] = self.counts.get("EGW00201", 0) + 1
+            return web.json_response(RATE_LIMIT_ERROR, status=500)
+
+        # 연속조회 키가 없는 API(시세 등)는 항상 한 페이지로 응답한다.
+        key = request.query.get(nk_alias, "") if nk_alias else ""
+        page = int(key) if key else 0
+        has_next = nk_alias is not None and page + 1 < self.pages
+        next_key = str(page + 1) if has_next else ""
+        body = {
+            "rt_cd": "0",
+            "msg_cd": "KIOK0000",
+            "msg1": "조회가 완료되었습니다",
+            **(
+                {fk_alias.lower(): next_key, nk_alias.lower(): next_key}
+                if nk_alias
+                else {}
+            ),
+            **make_body(request, page),
+        }
+        # 첫 페이지는 F/D, 다음 페이지는 M/E 로 응답한다.
+        if page == 0:
+            tr_cont = "F" if has_next else "D"
+        else:
+            tr_cont = "M" if has_next else "E"
+        return web.json_response(body, headers={"tr_cont": tr_cont})
+
+    async def domestic_quote(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            price = 70000 + random.randint(-500, 500)
+            return {
+                "output": {
+                    "stck_prpr": str(price),
+                    "prdy_vrss": str(price - 70000),
+                    "prdy_vrss_sign": "2" if price >= 70000 else "5",
+                    "prdy_ctrt": f"{(price - 70000) / 700:.2f}",
+                    "stck_oprc": "70000",
+                    "stck_hgpr": "70500",
+                    "stck_lwpr": "69500",
+                    "acml_vol": "1234567",
+                    "acml_tr_pbmn": "86419690000",
+                }
+            }
+
+        return await self.respond(request, make_body)
+
+    async def overseas_quote(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            price = 200 + random.randint(-100, 100) / 100
+            return {
+                "output": {
+                    "rsym": f"D{request.query.get('EXCD', '')}{request.query.get('SYMB', '')}",
+                    "zdiv": "4",
+                    "base": "200.0000",
+                    "last": f"{price:.4f}",
+                    "sign": "2" if price >= 200 else "5",
+                    "diff": f"{price - 200:.4f}",
+                    "rate": f"{(price - 200) / 2:.2f}",
+                    "tvol": "123456",
+                    "tamt": "24691200",
+                    "ordy": "매도불가",
+                }
+            }
+
+        return await self.respond(request, make_body)
+
+    def is_rate_limited(self, appkey: str) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        times = [t for t in self.request_times.get(appkey, []) if now - t < 1]
+        times.append(now)
+        self.request_times[appkey] = times
+        return len(times) > self.rate_limit
+
+    async def domestic_balance(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            return {
+                "output1": [
+                    {
+                        **dict.fromkeys(
+                            (
+                                "trad_dvsn_name",
+                                "loan_dt",
+                                "expd_dt",
+                                "item_mgna_rt_name",
+                                "grta_rt_name",
+                            ),
+                            "",
+                        ),
+                        **dict.fromkeys(
+                            (
+                                "bfdy_buy_qty",
+                                "bfdy_sll_qty",
+                                "thdt_buyqty",
+                                "thdt_sll_qty",
+                                "loan_amt",
+                                "stln_slng_chgs",
+                                "bfdy_cprs_icdc",
+                                "sbst_pric",
+                                "stck_loan_unpr",
+                                "evlu_pfls_rt",
+                                "evlu_erng_rt",
+                                "fltt_rt",
+                            ),
+                            "0",
+                        ),
+                        "pdno": ticker,
+                        "prdt_name": ticker_name,
+                        "hldg_qty": "10",
+                        "ord_psbl_qty": "10",
+                        "pchs_avg_pric": "70000.0000",
+                        "pchs_amt": "700000",
+                        "prpr": "71000",
+                        "evlu_amt": "710000",
+                        "evlu_pfls_amt": "10000",
+                    }
+                    for ticker, ticker_name in self.pick(TICKERS)
+                ],
+                "output2": [
+                    {
+                        **dict.fromkeys(
+                            (
+                                "cma_evlu_amt",
+                                "bfdy_buy_amt",
+                                "thdt_buy_amt",
+                                "nxdy_auto_rdpt_amt",
+                                "bfdy_sll_amt",
+                                "thdt_sll_amt",
+                                "d2_auto_rdpt_amt",
+                                "bfdy_tlex_amt",
+                                "thdt_tlex_amt",
+                                "tot_loan_amt",
+                                "tot_stln_slng_chgs",
+                                "asst_icdc_amt",
+                                "asst_icdc_erng_rt",
+                            ),
+                            "0",
+                        ),
+                        "dnca_tot_amt": "1000000",
+                        "nxdy_excc_amt": "1000000",
+                        "prvs_rcdl_excc_amt": "1000000",
+                        "scts_evlu_amt": "710000",
+                        "tot_evlu_amt": "1710000",
+                        "nass_amt": "1710000",
+                        "pchs_amt_smtl_amt": "700000",
+                        "evlu_amt_smtl_amt": "710000",
+                        "evlu_pfls_smtl_amt": "10000",
+                        "bfdy_tot_asst_evlu_amt": "1700000",
+                    }
+                ],
+            }
+
+        return await self.respond(
+            request, make_body, "CTX_AREA_FK100", "CTX_AREA_NK100"
+        )
+
+    async def overseas_balance(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            return {
+                "output1": [
+                    {
+                        "cano": request.query.get("CANO", ""),
+                        "acnt_prdt_cd": request.query.get("ACNT_PRDT_CD", ""),
+                        "prdt_type_cd": "512",
+                        "ovrs_pdno": ticker,
+                        "ovrs_item_name": ticker_name,
+                        "frcr_evlu_pfls_amt": "10.000000",
+                        "evlu_pfls_rt": "0.50",
+                        "pchs_avg_pric": "200.0000",
+                        "ovrs_cblc_qty": "10",
+                        "ord_psbl_qty": "10",
+                        "frcr_pchs_amt1": "2000.00000",
+                        "ovrs_stck_evlu_amt": "2010.00000",
+                        "now_pric2": "201.000000",
+                        "tr_crcy_cd": "USD",
+                        "ovrs_excg_cd": request.query.get("OVRS_EXCG_CD", "NASD"),
+                        "loan_type_cd": "10",
+                        "loan_dt": "",
+                        "expd_dt": "",
+                    }
+                    for ticker, ticker_name in self.pick(OVERSEAS_TICKERS)
+                ],
+                "output2": {
+                    "frcr_pchs_amt1": "2000.00000",
+                    "ovrs_rlzt_pfls_amt": "0.00000",
+                    "ovrs_tot_pfls": "10.00000",
+                    "rlzt_erng_rt": "0.00000000",
+                    "tot_evlu_pfls_amt": "10.00000",
+                    "tot_pftrt": "0.50000000",
+                    "frcr_buy_amt_smtl1": "2000.000000",
+                    "ovrs_rlzt_pfls_amt2": "0.00000",
+                    "frcr_buy_amt_smtl2": "2000.000000",
+                },
+            }
+
+        return await self.respond(
+            request, make_body, "CTX_AREA_FK200", "CTX_AREA_NK200"
+        )
+
+    async def domestic_history(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            trade_day = request.query.get("INQR_STRT_DT", "20240902")
+            return {
+                "output1": [
+                    {
+                        "ord_dt": trade_day,
+                        "ord_gno_brno": "91252",
+                        "odno": f"{page:04d}{i:06d}",
+                        "orgn_odno": "",
+                        "ord_dvsn_name": "현금매수",
+                        "sll_buy_dvsn_cd": "02" if i % 3 else "01",
+                        "sll_buy_dvsn_cd_name": "매수" if i % 3 else "매도",
+                        "pdno": ticker,
+                        "prdt_name": ticker_name,
+                        "ord_qty": "1",
+                        "ord_unpr": "70000",
+                        "ord_tmd": "090000",
+                        "tot_ccld_qty": "1",
+                        "avg_prvs": "70000",
+                        "cncl_yn": "",
+                        "tot_ccld_amt": "70000",
+                        "loan_dt": "",
+                        "ord_dvsn_cd": "00",
+                        "cncl_cfrm_qty": "0",
+                        "rmn_qty": "0",
+                        "rjct_qty": "0",
+                        "ccld_cndt_name": "없음",
+                        "infm_tmd": "",
+                        "ctac_tlno": "",
+                        "prdt_type_cd": "300",
+                        "excg_dvsn_cd": "02",
+                    }
+                    for i, (ticker, ticker_name) in enumerate(self.cycle(TICKERS))
+                ],
+                "output2": {
+                    "tot_ord_qty": str(self.rows),
+                    "tot_ccld_qty": str(self.rows),
+                    "tot_ccld_amt": str(self.rows * 70000),
+                    "prsm_tlex_smtl": "0",
+                    "pchs_avg_pric": "70000",
+                },
+            }
+
+        return await self.respond(
+            request, make_body, "CTX_AREA_FK100", "CTX_AREA_NK100"
+        )
+
+    async def overseas_history(self, request: web.Request) -> web.Response:
+        def make_body(request: web.Request, page: int) -> dict:
+            trade_day = request.query.get("ERLM_STRT_DT", "20240902")
+            return {
+                "output1": [
+                    {
+                        "trad_dt": trade_day,
+                        "sttl_dt": trade_day,
+                        "sll_buy_dvsn_cd": "02" if i % 3 else "01",
+                        "sll_buy_dvsn_name": "매수" if i % 3 else "매도",
+                        "pdno": ticker,
+                        "ovrs_item_name": ticker_name,
+                        "ccld_qty": "1",
+                        "amt_unit_ccld_qty": "1.000000",
+                        "ft_ccld_unpr2": "200.000000",
+                        "ovrs_stck_ccld_unpr": "200.00000000",
+                        "tr_frcr_amt2": "200.000000",
+                        "tr_amt": "0",
+                        "frcr_excc_amt_1": "200.050000",
+                        "wcrc_excc_amt": "0",
+                        "dmst_frcr_fee1": "0.050000",
+                        "frcr_fee1": "0.050000",
+                        "dmst_wcrc_fee": "0",
+                        "ovrs_wcrc_fee": "0",
+                        "crcy_cd": "USD",
+                        "std_pdno": "",
+                        "erlm_exrt": "1340.00000000",
+                        "loan_dvsn_cd": "01",
+                        "loan_dvsn_name": "현금",
+                    }
+                    for i, (ticker, ticker_name) in enumerate(
+                        self.cycle(OVERSEAS_TICKERS)
+                    )
+                ],
+                "output2": {
+                    "frcr_buy_amt_smtl": str(self.rows * 200),
+                    "frcr_sll_amt_smtl": "0",
+                    "dmst_fee_smtl": "0",
+                    "ovrs_fee_smtl": "0",
+                },
+            }
+
+        return await self.respond(
+            request, make_body, "CTX_AREA_FK100", "CTX_AREA_NK100"
+        )
+
+    def pick(self, tickers: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        return [tickers[i % len(tickers)] for i in range(min(self.rows, 50))]
+
+    def cycle(self, tickers: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        return [tickers[i % len(tickers)] for i in range(self.rows)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KIS API emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--rows", type=int, default=100, help="페이지당 행 수")
+    parser.add_argument("--pages", type=int, default=1, help="연속조회 페이지 수")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="appkey 당 초당 요청 수 (0: 무제한)",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="EGW00201 을 무작위로 돌려줄 비율"
+    )
+    parser.add_argument(
+        "--slow-rate", type=float, default=0.0, help="--slow-ms 만큼 늦게 응답할 비율"
+    )
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--tick-ms", type=float, default=100.0, help="실시간 체결가 전송 간격"
+    )
+    args = parser.parse_args()
+
+    emulator = KISEmulator(
+        latency_ms=args.latency_ms,
+        rows=args.rows,
+        pages=args.pages,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        tick_ms=args.tick_ms,
+    )
+    web.run_app(emulator.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
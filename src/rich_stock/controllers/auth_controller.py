@@ -1,60 +1,84 @@
+from collections import OrderedDict
 from datetime import datetime
-import os
-import aiohttp
-from fastapi import APIRouter, Security, HTTPException, status
+from fastapi import APIRouter, Depends, Security, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
 
-from ..entities.kis_token_entity import KISTokenRequest, KISTokenResponse
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.settings import get_settings
 from ..models.token_credential_model import TokenCredential
 from ..models.token_model import (
     TokenIssueResponse,
     TokenIssueRequest,
 )
+from ..repositories.token_repository import (
+    CachedKISTokenRepository,
+    KISTokenCache,
+    get_token_cache,
+)
 
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
-api_key = os.environ.get("api_key")
+
+# 검증을 마친 토큰 → (TokenCredential, access_token 만료일시). 매 요청마다 decode/검증하지 않는다.
+verified_tokens: OrderedDict[str, tuple[TokenCredential, datetime]] = OrderedDict()
 
 
 @auth_router.post("/issue_token", description="토큰발급")
-async def issue_token(body: TokenIssueRequest) -> TokenIssueResponse:
-    url = body.get_domain_url() + "/oauth2/tokenP"
-    kis_request = KISTokenRequest(appkey=body.appkey, appsecret=body.appsecret)
-    data = kis_request.model_dump_json()
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, data=data) as response:
-            text = await response.text()
-            if "error_code" in text:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail=text
-                )
-
-            kis_token_response = KISTokenResponse.model_validate_json(text)
-            payload = TokenCredential.from_model(
-                token_issue_request=body, kis_token_response=kis_token_response
-            ).model_dump()
-            token = jwt.encode(payload, api_key, algorithm="HS256")
-            return TokenIssueResponse(
-                token=token, expired=kis_token_response.access_token_token_expired
-            )
-
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+async def issue_token(
+    body: TokenIssueRequest,
+    kis_client: KISClient = Depends(get_kis_client),
+    token_cache: KISTokenCache = Depends(get_token_cache),
+) -> TokenIssueResponse:
+    kis_token_response = await CachedKISTokenRepository(
+        kis_client, token_cache
+    ).issue_token(body)
+    payload = TokenCredential.from_model(
+        token_issue_request=body, kis_token_response=kis_token_response
+    ).model_dump()
+    token = jwt.encode(payload, get_settings().api_key, algorithm="HS256")
+    return TokenIssueResponse(
+        token=token, expired=kis_token_response.access_token_token_expired
+    )
 
 
-async def verify_token(
-    credentials: HTTPAuthorizationCredentials = Security(HTTPBearer()),
-) -> TokenCredential:
-    credential = credentials.credentials
-    decode = jwt.decode(credential, api_key, algorithms="HS256")
+def decode_token(credential: str) -> tuple[TokenCredential, datetime]:
+    verified = verified_tokens.get(credential)
+    if verified is not None:
+        verified_tokens.move_to_end(credential)
+        return verified
+
+    try:
+        decode = jwt.decode(credential, get_settings().api_key, algorithms="HS256")
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token."
+        )
+
     token_credential = TokenCredential.model_validate(decode)
     access_token_expired = datetime.strptime(
         token_credential.access_token_token_expired, "%Y-%m-%d %H:%M:%S"
     )
+    verified = (token_credential, access_token_expired)
+    verified_tokens[credential] = verified
+    if len(verified_tokens) > get_settings().verified_token_cache_size:
+        verified_tokens.popitem(last=False)
+    return verified
+
+
+def verify_credential(credential: str) -> TokenCredential:
+    token_credential, access_token_expired = decode_token(credential)
 
     if datetime.now() > access_token_expired:
+        verified_tokens.pop(credential, None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="access_token was expired."
         )
 
     return token_credential
+
+
+async def verify_token(
+    credentials: HTTPAuthorizationCredentials = Security(HTTPBearer()),
+) -> TokenCredential:
+    return verify_credential(credentials.credentials)
@@ -1,38 +1,201 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date, timedelta
+from typing import AsyncIterator
 
-from ..models.history_model import DailyHistoryResponse
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json
+
+from ..models.enums import OverseasMarketCode
+from ..models.history_model import (
+    DailyHistoryResponse,
+    DailyHistorySummaryResponse,
+    HistoryAnalyticsResponse,
+)
+from ..repositories.history_analytics_repository import HistoryAnalyticsRepository
 from ..repositories.history_repository import (
+    DailyHistoryRepository,
     KISDomesticDailyHistoryRepository,
     KISOverseasDailyHistoryRepository,
 )
+from ..repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+    get_history_cache,
+    get_history_store,
+    to_str,
+)
 from ..models.token_credential_model import TokenCredential
 from ..controllers.auth_controller import verify_token
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.responses import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    ModelResponse,
+    conditional_response,
+)
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 history_router = APIRouter(
     prefix="/history", dependencies=[Depends(verify_token)], tags=["History"]
 )
 
 
-@history_router.get("/daily/kr")
+async def stream_daily_history(
+    repository: DailyHistoryRepository, begin_date: str, end_date: str
+) -> StreamingResponse:
+    pages = repository.iter_daily_history(begin_date, end_date)
+    # 첫 페이지는 응답을 시작하기 전에 받아서 조회 실패를 상태코드로 돌려줄 수 있게 한다.
+    first_page = await anext(pages)
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        page = first_page
+        while True:
+            # 페이지마다 컬럼에서 바로 만든 행 JSON 을 한 덩어리로 보낸다.
+            if len(page):
+                yield b"\n".join(page.iter_json_rows()) + b"\n"
+            next_page = await anext(pages, None)
+            if next_page is None:
+                break
+            page = next_page
+
+        summary = DailyHistorySummaryResponse(
+            total_buy_amount=page.total_buy_amount,
+            total_sell_amount=page.total_sell_amount,
+        )
+        yield to_json(summary) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def get_daily_history(
+    request: Request,
+    repository: DailyHistoryRepository,
+    begin_date: str,
+    end_date: str,
+    accept: str | None,
+    history_store: TradeHistoryStore | None,
+    history_cache: TTLCache,
+) -> Response:
+    # 체결이 확정된 일자까지만 조회하면 같은 조회는 항상 같은 응답이다.
+    last_closed_day = to_str(date.today() - timedelta(days=repository.open_days))
+    if end_date <= last_closed_day:
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        cache_control = REVALIDATE_CACHE_CONTROL
+
+    if history_store is not None:
+        repository = StoredDailyHistoryRepository(
+            repository, history_store, history_cache
+        )
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return await stream_daily_history(repository, begin_date, end_date)
+    batch = await repository.get_daily_history(begin_date, end_date)
+    return conditional_response(request, batch, batch.etag(), cache_control)
+
+
+async def get_history_analytics(
+    repository: DailyHistoryRepository,
+    begin_date: str,
+    end_date: str,
+    history_store: TradeHistoryStore | None,
+    history_cache: TTLCache,
+) -> ModelResponse:
+    if history_store is not None:
+        repository = StoredDailyHistoryRepository(
+            repository, history_store, history_cache
+        )
+    analytics_repository = HistoryAnalyticsRepository(repository)
+    return ModelResponse(
+        await analytics_repository.get_history_analytics(begin_date, end_date)
+    )
+
+
+@history_router.get("/daily/kr", response_model=DailyHistoryResponse)
 async def get_daily(
+    request: Request,
     begin_date: str = Query(description="조회 시작 날짜", examples=["20240901"]),
     end_date: str = Query(description="조회 종료 날짜", examples=["20241001"]),
+    accept: str | None = Header(
+        default=None,
+        description=f"{NDJSON_MEDIA_TYPE} 이면 거래내역을 한 줄씩 스트리밍하고 마지막 줄에 합계를 보낸다.",
+    ),
     token_credential: TokenCredential = Depends(verify_token),
-) -> DailyHistoryResponse:
-    response = await KISDomesticDailyHistoryRepository(
-        token_credential
-    ).get_daily_history(begin_date, end_date)
-    return response
+    kis_client: KISClient = Depends(get_kis_client),
+    history_store: TradeHistoryStore | None = Depends(get_history_store),
+    history_cache: TTLCache = Depends(get_history_cache),
+) -> Response:
+    repository = KISDomesticDailyHistoryRepository(token_credential, kis_client)
+    return await get_daily_history(
+        request, repository, begin_date, end_date, accept, history_store, history_cache
+    )
 
 
-@history_router.get("/daily/overseas")
+@history_router.get("/daily/overseas", response_model=DailyHistoryResponse)
 async def get_daily_overseas(
+    request: Request,
+    begin_date: str = Query(description="조회 시작 날짜", examples=["20240901"]),
+    end_date: str = Query(description="조회 종료 날짜", examples=["20241001"]),
+    accept: str | None = Header(
+        default=None,
+        description=f"{NDJSON_MEDIA_TYPE} 이면 거래내역을 한 줄씩 스트리밍하고 마지막 줄에 합계를 보낸다.",
+    ),
+    markets: list[OverseasMarketCode] | None = Query(
+        default=None, description="조회할 해외거래소 (공란: 전체 거래소)"
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    history_store: TradeHistoryStore | None = Depends(get_history_store),
+    history_cache: TTLCache = Depends(get_history_cache),
+) -> Response:
+    repository = KISOverseasDailyHistoryRepository(
+        token_credential, kis_client, markets
+    )
+    return await get_daily_history(
+        request, repository, begin_date, end_date, accept, history_store, history_cache
+    )
+
+
+@history_router.get(
+    "/analytics/kr",
+    description="국내 거래내역의 종목별/일자별/통화별 집계",
+    response_model=HistoryAnalyticsResponse,
+)
+async def get_analytics(
+    begin_date: str = Query(description="조회 시작 날짜", examples=["20240901"]),
+    end_date: str = Query(description="조회 종료 날짜", examples=["20241001"]),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    history_store: TradeHistoryStore | None = Depends(get_history_store),
+    history_cache: TTLCache = Depends(get_history_cache),
+) -> ModelResponse:
+    repository = KISDomesticDailyHistoryRepository(token_credential, kis_client)
+    return await get_history_analytics(
+        repository, begin_date, end_date, history_store, history_cache
+    )
+
+
+@history_router.get(
+    "/analytics/overseas",
+    description="해외 거래내역의 종목별/일자별/통화별 집계",
+    response_model=HistoryAnalyticsResponse,
+)
+async def get_analytics_overseas(
     begin_date: str = Query(description="조회 시작 날짜", examples=["20240901"]),
     end_date: str = Query(description="조회 종료 날짜", examples=["20241001"]),
+    markets: list[OverseasMarketCode] | None = Query(
+        default=None, description="조회할 해외거래소 (공란: 전체 거래소)"
+    ),
     token_credential: TokenCredential = Depends(verify_token),
-) -> DailyHistoryResponse:
-    response = await KISOverseasDailyHistoryRepository(
-        token_credential
-    ).get_daily_history(begin_date, end_date)
-    return response
+    kis_client: KISClient = Depends(get_kis_client),
+    history_store: TradeHistoryStore | None = Depends(get_history_store),
+    history_cache: TTLCache = Depends(get_history_cache),
+) -> ModelResponse:
+    repository = KISOverseasDailyHistoryRepository(
+        token_credential, kis_client, markets
+    )
+    return await get_history_analytics(
+        repository, begin_date, end_date, history_store, history_cache
+    )
@@ -1,13 +1,31 @@
-from fastapi import APIRouter, Depends
+from typing import Callable
 
-from ..controllers.auth_controller import verify_token
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import Response
+
+from ..controllers.auth_controller import verify_credential, verify_token
+from ..core.batch import gather_items, item_error
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.responses import (
+    REVALIDATE_CACHE_CONTROL,
+    ModelResponse,
+    conditional_response,
+)
+from ..core.settings import get_settings
 from ..models.my_balance_model import (
+    MyBalanceBatchItemResponse,
+    MyBalanceBatchRequest,
+    MyBalanceBatchResponse,
     MyBalanceResponse,
 )
 from ..models.token_credential_model import TokenCredential
 from ..repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
     KISDomesticBalanceRepository,
     KISOverseasBalanceRepository,
+    MyBalanceRepositoryABC,
+    get_balance_cache,
 )
 
 
@@ -16,17 +34,112 @@ my_balance_router = APIRouter(
 )
 
 
-@my_balance_router.get("/kr", description="국내 주식잔고조회")
+async def get_my_balance_response(
+    request: Request, repository: CachedMyBalanceRepository
+) -> Response:
+    # 잔고 캐시가 바뀌지 않았으면 직렬화한 본문과 ETag 를 그대로 다시 쓴다.
+    encoded = await repository.get_encoded_balance()
+    return conditional_response(
+        request, encoded, encoded.etag, REVALIDATE_CACHE_CONTROL
+    )
+
+
+@my_balance_router.get(
+    "/kr", description="국내 주식잔고조회", response_model=MyBalanceResponse
+)
 async def get_domestic(
+    request: Request,
     token_credential: TokenCredential = Depends(verify_token),
-) -> MyBalanceResponse:
-    repository = KISDomesticBalanceRepository(token_credential)
-    return await repository.get_my_balance()
+    kis_client: KISClient = Depends(get_kis_client),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> Response:
+    repository = CachedMyBalanceRepository(
+        KISDomesticBalanceRepository(token_credential, kis_client), balance_cache
+    )
+    return await get_my_balance_response(request, repository)
 
 
-@my_balance_router.get("/overseas", description="해외 주식잔고조회")
+@my_balance_router.get(
+    "/overseas", description="해외 주식잔고조회", response_model=MyBalanceResponse
+)
 async def get_overseas(
+    request: Request,
     token_credential: TokenCredential = Depends(verify_token),
-) -> MyBalanceResponse:
-    repository = KISOverseasBalanceRepository(token_credential)
-    return await repository.get_my_balance()
+    kis_client: KISClient = Depends(get_kis_client),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> Response:
+    repository = CachedMyBalanceRepository(
+        KISOverseasBalanceRepository(token_credential, kis_client), balance_cache
+    )
+    return await get_my_balance_response(request, repository)
+
+
+async def get_my_balances(
+    tokens: list[str],
+    repository_type: Callable[[TokenCredential, KISClient], MyBalanceRepositoryABC],
+    kis_client: KISClient,
+    balance_cache: TTLCache,
+) -> MyBalanceBatchResponse:
+    async def get_my_balance(token: str) -> MyBalanceBatchItemResponse:
+        account_number = None
+        try:
+            token_credential = verify_credential(token)
+            account_number = token_credential.account_number
+            repository = CachedMyBalanceRepository(
+                repository_type(token_credential, kis_client), balance_cache
+            )
+            balance = await repository.get_my_balance()
+        except Exception as e:
+            status_code, detail = item_error(
+                e, "잔고조회 중 오류가 발생했습니다.", f"balance {account_number}"
+            )
+            return MyBalanceBatchItemResponse(
+                account_number=account_number, status_code=status_code, detail=detail
+            )
+        return MyBalanceBatchItemResponse.model_construct(
+            account_number=account_number,
+            status_code=status.HTTP_200_OK,
+            detail=None,
+            balance=balance,
+        )
+
+    return MyBalanceBatchResponse.model_construct(
+        items=await gather_items(
+            (get_my_balance(token) for token in tokens),
+            get_settings().balance_batch_concurrency,
+        )
+    )
+
+
+@my_balance_router.post(
+    "/batch/kr",
+    description="여러 계좌의 국내 주식잔고를 한 번에 조회",
+    response_model=MyBalanceBatchResponse,
+)
+async def get_domestic_batch(
+    body: MyBalanceBatchRequest,
+    kis_client: KISClient = Depends(get_kis_client),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> ModelResponse:
+    return ModelResponse(
+        await get_my_balances(
+            body.tokens, KISDomesticBalanceRepository, kis_client, balance_cache
+        )
+    )
+
+
+@my_balance_router.post(
+    "/batch/overseas",
+    description="여러 계좌의 해외 주식잔고를 한 번에 조회",
+    response_model=MyBalanceBatchResponse,
+)
+async def get_overseas_batch(
+    body: MyBalanceBatchRequest,
+    kis_client: KISClient = Depends(get_kis_client),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> ModelResponse:
+    return ModelResponse(
+        await get_my_balances(
+            body.tokens, KISOverseasBalanceRepository, kis_client, balance_cache
+        )
+    )
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any, Awaitable
+
+from fastapi import APIRouter, Depends, Query, status
+
+from ..controllers.auth_controller import verify_token
+from ..core.batch import item_error
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.responses import ModelResponse
+from ..core.settings import get_settings
+from ..models.history_model import DailyHistoryResponse
+from ..models.portfolio_model import PortfolioResponse, PortfolioSectionResponse
+from ..models.token_credential_model import TokenCredential
+from ..repositories.history_repository import (
+    DailyHistoryRepository,
+    KISDomesticDailyHistoryRepository,
+    KISOverseasDailyHistoryRepository,
+)
+from ..repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+    get_history_cache,
+    get_history_store,
+)
+from ..repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
+    KISDomesticBalanceRepository,
+    KISOverseasBalanceRepository,
+    get_balance_cache,
+)
+
+
+portfolio_router = APIRouter(
+    prefix="/portfolio", dependencies=[Depends(verify_token)], tags=["Portfolio"]
+)
+
+
+async def get_section(
+    name: str, loader: Awaitable, timeout: float
+) -> PortfolioSectionResponse:
+    # 항목 하나가 실패하거나 늦어도 나머지 항목은 그대로 돌려준다.
+    try:
+        data = await asyncio.wait_for(loader, timeout)
+    except TimeoutError:
+        return PortfolioSectionResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"{timeout}초 안에 조회하지 못했습니다.",
+        )
+    except Exception as e:
+        status_code, detail = item_error(
+            e, "조회 중 오류가 발생했습니다.", f"portfolio {name}"
+        )
+        return PortfolioSectionResponse(status_code=status_code, detail=detail)
+    return PortfolioSectionResponse.model_construct(
+        status_code=status.HTTP_200_OK, detail=None, data=data
+    )
+
+
+async def get_daily_history(
+    repository: DailyHistoryRepository, begin_date: str, end_date: str
+) -> DailyHistoryResponse:
+    batch = await repository.get_daily_history(begin_date, end_date)
+    return batch.to_response()
+
+
+@portfolio_router.get(
+    "",
+    description="국내/해외 잔고와 거래내역을 동시에 조회해서 한 번에 돌려준다.",
+    response_model=PortfolioResponse,
+)
+async def get_portfolio(
+    begin_date: str | None = Query(
+        default=None,
+        description="거래내역 조회 시작 날짜 (공란: 거래내역 제외)",
+        examples=["20240901"],
+    ),
+    end_date: str | None = Query(
+        default=None,
+        description="거래내역 조회 종료 날짜 (공란: 거래내역 제외)",
+        examples=["20241001"],
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+    history_store: TradeHistoryStore | None = Depends(get_history_store),
+    history_cache: TTLCache = Depends(get_history_cache),
+) -> ModelResponse:
+    timeout = get_settings().portfolio_section_timeout
+
+    sections: dict[str, Awaitable[Any]] = {
+        "domestic_balance": CachedMyBalanceRepository(
+            KISDomesticBalanceRepository(token_credential, kis_client), balance_cache
+        ).get_my_balance(),
+        "overseas_balance": CachedMyBalanceRepository(
+            KISOverseasBalanceRepository(token_credential, kis_client), balance_cache
+        ).get_my_balance(),
+    }
+    if begin_date and end_date:
+        history_repositories: dict[str, DailyHistoryRepository] = {
+            "domestic_history": KISDomesticDailyHistoryRepository(
+                token_credential, kis_client
+            ),
+            "overseas_history": KISOverseasDailyHistoryRepository(
+                token_credential, kis_client
+            ),
+        }
+        for name, repository in history_repositories.items():
+            if history_store is not None:
+                repository = StoredDailyHistoryRepository(
+                    repository, history_store, history_cache
+                )
+            sections[name] = get_daily_history(repository, begin_date, end_date)
+
+    results = await asyncio.gather(
+        *(get_section(name, loader, timeout) for name, loader in sections.items())
+    )
+    fields: dict[str, Any] = dict(zip(sections, results))
+    return ModelResponse(PortfolioResponse.model_construct(**fields))
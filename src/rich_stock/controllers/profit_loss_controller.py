@@ -0,0 +1,146 @@
+from fastapi import APIRouter, Depends, Query
+
+from ..controllers.auth_controller import verify_token
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.responses import ModelResponse
+from ..models.enums import LotMatchingMethod
+from ..models.profit_loss_model import (
+    RealizedProfitLossResponse,
+    UnrealizedProfitLossResponse,
+)
+from ..models.token_credential_model import TokenCredential
+from ..repositories.history_repository import (
+    KISDomesticDailyHistoryRepository,
+    KISOverseasDailyHistoryRepository,
+)
+from ..repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
+    KISDomesticBalanceRepository,
+    KISOverseasBalanceRepository,
+    get_balance_cache,
+)
+from ..repositories.profit_loss_repository import (
+    LotStore,
+    ProfitLossRepository,
+    get_lot_store,
+)
+
+
+profit_loss_router = APIRouter(
+    prefix="/profit_loss", dependencies=[Depends(verify_token)], tags=["Profit Loss"]
+)
+
+BEGIN_DATE_DESCRIPTION = (
+    "손익 계산을 시작할 매매 일자. 처음 계산할 때만 필요하고,"
+    " 이후에는 저장된 체크포인트 이후의 체결만 반영한다."
+    " 기존보다 이른 날짜를 주면 처음부터 다시 계산한다."
+)
+
+
+@profit_loss_router.get(
+    "/realized/kr",
+    description="국내 종목별 실현손익 (확정된 체결 기준)",
+    response_model=RealizedProfitLossResponse,
+)
+async def get_realized(
+    begin_date: str | None = Query(
+        default=None, description=BEGIN_DATE_DESCRIPTION, examples=["20240101"]
+    ),
+    method: LotMatchingMethod = Query(
+        default=LotMatchingMethod.FIFO, description="매칭 방식"
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    lot_store: LotStore = Depends(get_lot_store),
+) -> ModelResponse:
+    repository = ProfitLossRepository(
+        KISDomesticDailyHistoryRepository(token_credential, kis_client),
+        lot_store,
+        method,
+    )
+    return ModelResponse(await repository.get_realized_profit_loss(begin_date))
+
+
+@profit_loss_router.get(
+    "/realized/overseas",
+    description="해외 종목별 실현손익 (확정된 체결 기준)",
+    response_model=RealizedProfitLossResponse,
+)
+async def get_realized_overseas(
+    begin_date: str | None = Query(
+        default=None, description=BEGIN_DATE_DESCRIPTION, examples=["20240101"]
+    ),
+    method: LotMatchingMethod = Query(
+        default=LotMatchingMethod.FIFO, description="매칭 방식"
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    lot_store: LotStore = Depends(get_lot_store),
+) -> ModelResponse:
+    repository = ProfitLossRepository(
+        KISOverseasDailyHistoryRepository(token_credential, kis_client),
+        lot_store,
+        method,
+    )
+    return ModelResponse(await repository.get_realized_profit_loss(begin_date))
+
+
+@profit_loss_router.get(
+    "/unrealized/kr",
+    description="국내 종목별 평가손익 (미청산 lot 의 취득원가 기준)",
+    response_model=UnrealizedProfitLossResponse,
+)
+async def get_unrealized(
+    begin_date: str | None = Query(
+        default=None, description=BEGIN_DATE_DESCRIPTION, examples=["20240101"]
+    ),
+    method: LotMatchingMethod = Query(
+        default=LotMatchingMethod.FIFO, description="매칭 방식"
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    lot_store: LotStore = Depends(get_lot_store),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> ModelResponse:
+    repository = ProfitLossRepository(
+        KISDomesticDailyHistoryRepository(token_credential, kis_client),
+        lot_store,
+        method,
+    )
+    balance_repository = CachedMyBalanceRepository(
+        KISDomesticBalanceRepository(token_credential, kis_client), balance_cache
+    )
+    return ModelResponse(
+        await repository.get_unrealized_profit_loss(begin_date, balance_repository)
+    )
+
+
+@profit_loss_router.get(
+    "/unrealized/overseas",
+    description="해외 종목별 평가손익 (미청산 lot 의 취득원가 기준)",
+    response_model=UnrealizedProfitLossResponse,
+)
+async def get_unrealized_overseas(
+    begin_date: str | None = Query(
+        default=None, description=BEGIN_DATE_DESCRIPTION, examples=["20240101"]
+    ),
+    method: LotMatchingMethod = Query(
+        default=LotMatchingMethod.FIFO, description="매칭 방식"
+    ),
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    lot_store: LotStore = Depends(get_lot_store),
+    balance_cache: TTLCache = Depends(get_balance_cache),
+) -> ModelResponse:
+    repository = ProfitLossRepository(
+        KISOverseasDailyHistoryRepository(token_credential, kis_client),
+        lot_store,
+        method,
+    )
+    balance_repository = CachedMyBalanceRepository(
+        KISOverseasBalanceRepository(token_credential, kis_client), balance_cache
+    )
+    return ModelResponse(
+        await repository.get_unrealized_profit_loss(begin_date, balance_repository)
+    )
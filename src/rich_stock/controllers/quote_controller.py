@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, status
+
+from ..controllers.auth_controller import verify_token
+from ..core.batch import gather_items, item_error
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.responses import ModelResponse
+from ..core.settings import get_settings
+from ..models.enums import OverseasMarketCode
+from ..models.quote_model import (
+    OverseasQuoteBatchRequest,
+    QuoteBatchItemResponse,
+    QuoteBatchRequest,
+    QuoteBatchResponse,
+    QuoteResponse,
+)
+from ..models.token_credential_model import TokenCredential
+from ..repositories.quote_repository import (
+    CachedQuoteRepository,
+    KISDomesticQuoteRepository,
+    KISOverseasQuoteRepository,
+    QuoteRepositoryABC,
+    get_quote_cache,
+)
+
+
+quote_router = APIRouter(
+    prefix="/quote", dependencies=[Depends(verify_token)], tags=["Quote"]
+)
+
+
+@quote_router.get(
+    "/kr/{ticker}", description="국내 주식 현재가 시세", response_model=QuoteResponse
+)
+async def get_domestic(
+    ticker: str,
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    quote_cache: TTLCache = Depends(get_quote_cache),
+) -> ModelResponse:
+    repository = CachedQuoteRepository(
+        KISDomesticQuoteRepository(token_credential, kis_client), quote_cache
+    )
+    return ModelResponse(await repository.get_quote(ticker))
+
+
+@quote_router.get(
+    "/overseas/{market}/{ticker}",
+    description="해외 주식 현재체결가",
+    response_model=QuoteResponse,
+)
+async def get_overseas(
+    market: OverseasMarketCode,
+    ticker: str,
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    quote_cache: TTLCache = Depends(get_quote_cache),
+) -> ModelResponse:
+    repository = CachedQuoteRepository(
+        KISOverseasQuoteRepository(token_credential, kis_client, market), quote_cache
+    )
+    return ModelResponse(await repository.get_quote(ticker))
+
+
+async def get_quotes(
+    requests: list[tuple[QuoteRepositoryABC, str]],
+) -> QuoteBatchResponse:
+    # 같은 종목이 여러 번 들어와도 캐시의 single-flight 로 KIS 호출은 한 번이다.
+    async def get_quote(
+        repository: QuoteRepositoryABC, ticker: str
+    ) -> QuoteBatchItemResponse:
+        try:
+            quote = await repository.get_quote(ticker)
+        except Exception as e:
+            status_code, detail = item_error(
+                e, "시세조회 중 오류가 발생했습니다.", f"quote {ticker}"
+            )
+            return QuoteBatchItemResponse(
+                ticker=ticker,
+                market=repository.market,
+                status_code=status_code,
+                detail=detail,
+            )
+        return QuoteBatchItemResponse.model_construct(
+            ticker=ticker,
+            market=repository.market,
+            status_code=status.HTTP_200_OK,
+            detail=None,
+            quote=quote,
+        )
+
+    return QuoteBatchResponse.model_construct(
+        items=await gather_items(
+            (get_quote(repository, ticker) for repository, ticker in requests),
+            get_settings().quote_batch_concurrency,
+        )
+    )
+
+
+@quote_router.post(
+    "/batch/kr",
+    description="여러 국내 종목의 현재가를 한 번에 조회",
+    response_model=QuoteBatchResponse,
+)
+async def get_domestic_batch(
+    body: QuoteBatchRequest,
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    quote_cache: TTLCache = Depends(get_quote_cache),
+) -> ModelResponse:
+    repository = CachedQuoteRepository(
+        KISDomesticQuoteRepository(token_credential, kis_client), quote_cache
+    )
+    return ModelResponse(
+        await get_quotes([(repository, ticker) for ticker in body.tickers])
+    )
+
+
+@quote_router.post(
+    "/batch/overseas",
+    description="여러 해외 종목의 현재체결가를 한 번에 조회",
+    response_model=QuoteBatchResponse,
+)
+async def get_overseas_batch(
+    body: OverseasQuoteBatchRequest,
+    token_credential: TokenCredential = Depends(verify_token),
+    kis_client: KISClient = Depends(get_kis_client),
+    quote_cache: TTLCache = Depends(get_quote_cache),
+) -> ModelResponse:
+    repositories = {
+        market: CachedQuoteRepository(
+            KISOverseasQuoteRepository(token_credential, kis_client, market),
+            quote_cache,
+        )
+        for market in {item.market for item in body.items}
+    }
+    return ModelResponse(
+        await get_quotes(
+            [(repositories[item.market], item.ticker) for item in body.items]
+        )
+    )
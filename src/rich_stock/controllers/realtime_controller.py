@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
+from pydantic import ValidationError
+
+from ..controllers.auth_controller import verify_credential
+from ..models.realtime_model import RealtimeSubscribeRequest
+from ..repositories.realtime_repository import (
+    RealtimeHub,
+    RealtimeSubscriber,
+    get_realtime_hub,
+)
+
+
+realtime_router = APIRouter(prefix="/realtime", tags=["Realtime"])
+
+
+@realtime_router.websocket("/ws")
+async def realtime(websocket: WebSocket, token: str | None = None) -> None:
+    # 브라우저는 웹소켓에 Authorization 헤더를 붙일 수 없으므로 token 쿼리도 받는다.
+    authorization = websocket.headers.get("authorization", "")
+    credential = token or authorization.removeprefix("Bearer ")
+    try:
+        token_credential = verify_credential(credential)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+
+    await websocket.accept()
+    hub = get_realtime_hub(websocket)
+    subscriber = hub.connect(token_credential)
+    receiver = asyncio.create_task(receive_requests(websocket, hub, subscriber))
+    sender = asyncio.create_task(send_messages(websocket, subscriber))
+    try:
+        await asyncio.wait((receiver, sender), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receiver.cancel()
+        sender.cancel()
+        await hub.disconnect(subscriber)
+
+    if subscriber.dropped and websocket.application_state == WebSocketState.CONNECTED:
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER,
+            reason="메세지를 제때 받지 못해서 연결을 끊습니다.",
+        )
+
+
+async def receive_requests(
+    websocket: WebSocket, hub: RealtimeHub, subscriber: RealtimeSubscriber
+) -> None:
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                request = RealtimeSubscribeRequest.model_validate_json(data)
+                channel = (request.channel.value, request.key)
+                if request.action == "subscribe":
+                    await subscriber.feed.subscribe(subscriber, channel)
+                else:
+                    await subscriber.feed.unsubscribe(subscriber, channel)
+            except ValidationError as e:
+                subscriber.send(f'{{"error": {e.json(include_url=False)}}}')
+            except HTTPException as e:
+                subscriber.send(json.dumps({"error": e.detail}, ensure_ascii=False))
+    except WebSocketDisconnect:
+        pass
+
+
+async def send_messages(websocket: WebSocket, subscriber: RealtimeSubscriber) -> None:
+    # 웹소켓 쓰기는 이 태스크 하나에서만 한다. None 은 느린 구독자로 끊겼다는 뜻이다.
+    try:
+        while (message := await subscriber.queue.get()) is not None:
+            await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,98 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Security, status
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from ..controllers.auth_controller import verify_token
+from ..core.kis_client import KISClient, get_kis_client
+from ..core.metrics import PROMETHEUS_MEDIA_TYPE, registry
+from ..core.settings import get_settings
+from ..models.system_model import (
+    CacheStatusResponse,
+    PrefetchStatusResponse,
+    RateLimitStatusResponse,
+    RealtimeFeedStatusResponse,
+)
+from ..repositories.prefetch_repository import (
+    PrefetchScheduler,
+    get_prefetch_scheduler,
+)
+from ..repositories.realtime_repository import RealtimeHub, get_realtime_hub
+
+
+system_router = APIRouter(
+    prefix="/system", dependencies=[Depends(verify_token)], tags=["System"]
+)
+
+
+async def verify_metrics_token(
+    credentials: HTTPAuthorizationCredentials | None = Security(
+        HTTPBearer(auto_error=False)
+    ),
+) -> None:
+    # 지표 수집기는 사용자 인증토큰 대신 설정에 둔 고정 토큰으로 읽는다. 설정하지 않으면 열지 않는다.
+    metrics_token = get_settings().metrics_token
+    if not metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid token."
+        )
+
+
+metrics_router = APIRouter(
+    dependencies=[Depends(verify_metrics_token)], tags=["System"]
+)
+
+
+@metrics_router.get("/metrics", description="Prometheus 형식의 지표")
+async def get_metrics() -> Response:
+    return Response(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+@system_router.get(
+    "/rate_limit",
+    description="KIS 유량제한 대기열 현황",
+    response_model=list[RateLimitStatusResponse],
+)
+async def get_rate_limit(
+    kis_client: KISClient = Depends(get_kis_client),
+) -> list[dict]:
+    return kis_client.scheduler.stats()
+
+
+@system_router.get(
+    "/cache", description="응답 캐시 현황", response_model=list[CacheStatusResponse]
+)
+async def get_cache(request: Request) -> list[dict]:
+    return [
+        request.app.state.balance_cache.stats(),
+        request.app.state.quote_cache.stats(),
+        request.app.state.history_cache.stats(),
+        request.app.state.token_cache.stats(),
+    ]
+
+
+@system_router.get(
+    "/realtime",
+    description="KIS 실시간 웹소켓 연결 현황",
+    response_model=list[RealtimeFeedStatusResponse],
+)
+async def get_realtime(
+    realtime_hub: RealtimeHub = Depends(get_realtime_hub),
+) -> list[dict]:
+    return realtime_hub.stats()
+
+
+@system_router.get(
+    "/prefetch",
+    description="장 시작 전 미리 조회 현황",
+    response_model=list[PrefetchStatusResponse],
+)
+async def get_prefetch(
+    prefetch_scheduler: PrefetchScheduler | None = Depends(get_prefetch_scheduler),
+) -> list[dict]:
+    return prefetch_scheduler.stats() if prefetch_scheduler is not None else []
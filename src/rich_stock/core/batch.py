@@ -0,0 +1,31 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Iterable, TypeVar
+
+from fastapi import HTTPException, status
+
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+async def gather_items(loaders: Iterable[Awaitable[T]], concurrency: int) -> list[T]:
+    # 항목별로 동시에 조회하되 한 번에 concurrency 개까지만 돌린다. 결과는 넘겨받은 순서대로다.
+    # 유량제한은 KISClient 의 appkey 별 스케줄러가 맞춘다.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(loader: Awaitable[T]) -> T:
+        async with semaphore:
+            return await loader
+
+    return await asyncio.gather(*(load(loader) for loader in loaders))
+
+
+def item_error(error: Exception, detail: str, name: object) -> tuple[int, Any]:
+    # 한 항목의 실패로 전체 요청이 실패하지 않도록 항목별 (상태코드, 실패 사유) 로 바꾼다.
+    if isinstance(error, HTTPException):
+        return error.status_code, error.detail
+    # 예외 내용은 서버 로그에만 남기고 클라이언트에는 정해진 문구만 보낸다.
+    logger.error("batch item %s failed", name, exc_info=error)
+    return status.HTTP_502_BAD_GATEWAY, detail
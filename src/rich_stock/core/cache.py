@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float, max_size: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # 키별로 (값, 그 값을 직렬화한 결과). 값이 바뀌면 다시 만든다.
+        self.encoded: dict[Hashable, tuple[Any, Any]] = {}
+        self.inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.invalidate(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            evicted, _ = self.entries.popitem(last=False)
+            self.encoded.pop(evicted, None)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+        self.encoded.pop(key, None)
+
+    def encode(self, key: Hashable, value: Any, encoder: Callable[[Any], Any]) -> Any:
+        # 같은 값을 여러 번 응답할 때 직렬화(와 ETag 계산)는 한 번만 한다.
+        memo = self.encoded.get(key)
+        if memo is not None and memo[0] is value:
+            return memo[1]
+        encoded = encoder(value)
+        if key in self.entries:
+            self.encoded[key] = (value, encoded)
+        return encoded
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        # 같은 키로 동시에 들어온 요청은 진행중인 하나의 조회 결과를 함께 기다린다.
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_load(key, loader)
+
+        # 요청 하나가 취소되어도 다른 요청이 기다리는 조회는 계속 진행되도록 shield 한다.
+        return await asyncio.shield(task)
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        # 값이 남아 있어도 새로 조회해서 덮어쓴다. (미리 채워두기) 진행중인 조회가 있으면 그 결과를 쓴다.
+        task = self.inflight.get(key)
+        if task is None:
+            self.refreshes += 1
+            task = self._start_load(key, loader)
+        return await asyncio.shield(task)
+
+    def _start_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = asyncio.create_task(self._load(key, loader))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value)
+            return value
+        finally:
+            del self.inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+        }
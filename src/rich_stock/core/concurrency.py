@@ -0,0 +1,77 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+
+
+T = TypeVar("T")
+
+_DONE = object()
+
+# source 마다 소비자가 아직 가져가지 않은 결과를 이만큼만 들고 있는다. 꽉 차면 source 는 기다린다.
+# (페이지 단위로 흘려보내므로, 뒤의 source 가 모든 페이지를 미리 받아 메모리에 쌓지 않게 한다)
+BUFFER_SIZE = 1
+
+
+async def _pump(source: AsyncIterator[T], queue: asyncio.Queue) -> None:
+    try:
+        async for item in source:
+            await queue.put(item)
+    except Exception as e:
+        await queue.put(e)
+    else:
+        await queue.put(_DONE)
+
+
+async def merge_in_order(
+    sources: Iterable[Callable[[], AsyncIterator[T]]],
+    concurrency: int,
+    buffer_size: int = BUFFER_SIZE,
+) -> AsyncIterator[T]:
+    # 최대 concurrency 개의 source 를 동시에 읽되, 결과는 source 순서대로 이어서 돌려준다.
+    # 맨 앞 source 는 받는 즉시 흘려보내고, 뒤의 source 는 차례가 올 때까지 buffer_size 개까지만 받아둔다.
+    sources = iter(sources)
+    running: deque[tuple[asyncio.Task, asyncio.Queue]] = deque()
+
+    def start_next() -> None:
+        source = next(sources, None)
+        if source is not None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+            running.append((asyncio.create_task(_pump(source(), queue)), queue))
+
+    try:
+        for _ in range(concurrency):
+            start_next()
+
+        while running:
+            _, queue = running[0]
+            while (item := await queue.get()) is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            running.popleft()
+            start_next()
+    finally:
+        for task, _ in running:
+            task.cancel()
+
+
+async def merge_as_ready(
+    sources: Iterable[AsyncIterator[T]], buffer_size: int = BUFFER_SIZE
+) -> AsyncIterator[T]:
+    # 모든 source 를 동시에 읽고, 어느 source 든 먼저 도착한 것부터 돌려준다.
+    # 소비자가 느리면 source 들은 buffer_size 개가 빠질 때까지 기다린다.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    tasks = [asyncio.create_task(_pump(source, queue)) for source in sources]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
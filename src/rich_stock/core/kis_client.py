@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from typing import Any, Mapping, NamedTuple
+
+import aiohttp
+from fastapi import HTTPException, Request, status
+
+from ..core.metrics import (
+    kis_circuit_open,
+    kis_circuit_rejections,
+    kis_hedged_requests,
+    kis_rate_limit_wait,
+    kis_request_duration,
+    kis_request_errors,
+    kis_retries,
+)
+from ..core.rate_limiter import KISRequestScheduler
+from ..core.resilience import CircuitBreaker, ResiliencePolicy
+from ..core.settings import Settings
+from ..models.token_model import TokenIssueRequest
+
+
+logger = logging.getLogger(__name__)
+
+
+class KISHttpResponse(NamedTuple):
+    body: bytes
+    tr_cont: str
+    status: int
+
+
+class KISClient:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        scheduler: KISRequestScheduler,
+        policy: ResiliencePolicy,
+    ):
+        self.session = session
+        self.scheduler = scheduler
+        self.policy = policy
+        self.breakers: dict[tuple[str, str], CircuitBreaker] = {}
+
+    @classmethod
+    def create(cls, settings: Settings) -> "KISClient":
+        connector = aiohttp.TCPConnector(
+            limit=settings.kis_connection_limit,
+            limit_per_host=settings.kis_connection_limit_per_host,
+            keepalive_timeout=settings.kis_keepalive_timeout,
+            ttl_dns_cache=settings.kis_dns_cache_ttl,
+        )
+        return cls(
+            aiohttp.ClientSession(connector=connector),
+            KISRequestScheduler.create(settings),
+            ResiliencePolicy.create(settings),
+        )
+
+    async def warm_up(self, domains: set[str | None]) -> None:
+        # 첫 요청에서 DNS 조회와 TCP+TLS 핸드셰이크가 일어나지 않도록 미리 연결해 둔다.
+        await asyncio.gather(*(self._connect(domain) for domain in domains if domain))
+
+    async def _connect(self, domain: str) -> None:
+        try:
+            async with self.session.head(domain) as response:
+                await response.read()
+        except aiohttp.ClientError as e:
+            logger.warning("KIS warm-up failed for %s: %s", domain, e)
+
+    async def close(self) -> None:
+        await self.session.close()
+        # SSL 연결이 정상적으로 닫힐 시간을 준다. (aiohttp graceful shutdown 권장사항)
+        await asyncio.sleep(0.25)
+
+    async def get(
+        self,
+        token_credential: TokenIssueRequest,
+        url: str,
+        params: Mapping[str, Any],
+        headers: Mapping[str, str],
+    ) -> KISHttpResponse:
+        domain = get_domain_label(token_credential)
+        tr_id = headers.get("tr_id", "")
+        breaker = self.breakers.get((domain, tr_id))
+        if breaker is None:
+            breaker = self.breakers[(domain, tr_id)] = CircuitBreaker(
+                self.policy.breaker_failures, self.policy.breaker_reset
+            )
+        if not breaker.allow():
+            kis_circuit_rejections.inc(tr_id, domain)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"KIS 응답이 불안정해서 잠시 요청을 보내지 않습니다. ({tr_id})",
+            )
+
+        for attempt in range(self.policy.retry_attempts + 1):
+            try:
+                http_response = await self._get_hedged(
+                    token_credential, url, params, headers, domain, tr_id
+                )
+            except TimeoutError:
+                reason = "timeout"
+            except aiohttp.ClientError as e:
+                reason = type(e).__name__
+            else:
+                retry_reason = self.policy.retry_reason(
+                    http_response.status, http_response.body
+                )
+                if retry_reason is None:
+                    breaker.record_success()
+                    kis_circuit_open.set(0, tr_id, domain)
+                    return http_response
+                reason = retry_reason
+
+            if attempt < self.policy.retry_attempts:
+                kis_retries.inc(tr_id, domain, reason)
+                await asyncio.sleep(self.policy.backoff(attempt))
+
+        breaker.record_failure()
+        kis_circuit_open.set(int(breaker.is_open), tr_id, domain)
+        if reason == "timeout":
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"KIS 응답 시간이 초과되었습니다. ({tr_id})",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"KIS 요청이 재시도 후에도 실패했습니다. ({tr_id}, {reason})",
+        )
+
+    async def _get_hedged(
+        self,
+        token_credential: TokenIssueRequest,
+        url: str,
+        params: Mapping[str, Any],
+        headers: Mapping[str, str],
+        domain: str,
+        tr_id: str,
+    ) -> KISHttpResponse:
+        def fetch() -> asyncio.Task[KISHttpResponse]:
+            return asyncio.create_task(
+                self._get(token_credential, url, params, headers, domain, tr_id)
+            )
+
+        if not self.policy.hedge_delay:
+            return await self._get(
+                token_credential, url, params, headers, domain, tr_id
+            )
+
+        # 조회 TR 은 여러 번 보내도 안전하므로, 응답이 늦으면 같은 요청을 하나 더 보내 먼저 온 쪽을 쓴다.
+        pending = {fetch()}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.policy.hedge_delay)
+            if not done:
+                kis_hedged_requests.inc(tr_id, domain)
+                pending.add(fetch())
+            while True:
+                for task in done:
+                    if task.exception() is None or not pending:
+                        return task.result()
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get(
+        self,
+        token_credential: TokenIssueRequest,
+        url: str,
+        params: Mapping[str, Any],
+        headers: Mapping[str, str],
+        domain: str,
+        tr_id: str,
+    ) -> KISHttpResponse:
+        started = time.perf_counter()
+        await self.scheduler.acquire(token_credential)
+        requested = time.perf_counter()
+        kis_rate_limit_wait.observe(requested - started, domain)
+
+        try:
+            async with self.session.get(
+                url, params=params, headers=headers, timeout=self.policy.timeout
+            ) as response:
+                # 본문은 bytes 그대로 넘겨 str 디코딩 없이 바로 검증한다.
+                body = await response.read()
+        except (aiohttp.ClientError, TimeoutError) as e:
+            kis_request_errors.inc(tr_id, domain, type(e).__name__)
+            raise
+        finally:
+            kis_request_duration.observe(time.perf_counter() - requested, tr_id, domain)
+
+        if response.status >= 400:
+            kis_request_errors.inc(tr_id, domain, f"http_{response.status}")
+        return KISHttpResponse(
+            body=body,
+            tr_cont=response.headers.get("tr_cont", ""),
+            status=response.status,
+        )
+
+    async def post(self, url: str, data: str) -> bytes:
+        async with self.session.post(
+            url, data=data, timeout=self.policy.timeout
+        ) as response:
+            return await response.read()
+
+
+def get_domain_label(token_credential: TokenIssueRequest) -> str:
+    return "real" if token_credential.is_real_domain else "mock"
+
+
+def get_kis_client(request: Request) -> KISClient:
+    return request.app.state.kis_client
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Mapping, TypeVar
+
+from pydantic import TypeAdapter
+
+from ..core.kis_client import KISClient, KISHttpResponse, get_domain_label
+from ..core.metrics import kis_request_errors, kis_response_parse_duration
+from ..core.settings import get_settings
+from ..entities.kis_base_entity import KISResponseBase
+from ..models.token_model import TokenIssueRequest
+
+
+KISResponse = TypeVar("KISResponse", bound=KISResponseBase)
+
+# 응답헤더 tr_cont 가 F(첫 데이터 있음) / M(다음 데이터 있음) 이면 다음 페이지가 있다.
+HAS_NEXT_TR_CONT = ("F", "M")
+
+
+@lru_cache
+def get_type_adapter(response_type: type[KISResponse]) -> TypeAdapter[KISResponse]:
+    return TypeAdapter(response_type)
+
+
+async def warm_up_type_adapters() -> None:
+    # 응답 스키마는 임포트할 때 만들지 않으므로(defer_build), 기동 직후 첫 요청이 오기 전에
+    # 이벤트 루프를 오래 막지 않도록 하나씩 만들어 둔다.
+    for response_type in KISResponseBase.__subclasses__():
+        get_type_adapter(response_type)
+        await asyncio.sleep(0)
+
+
+def parse_response(
+    http_response: KISHttpResponse,
+    response_type: type[KISResponse],
+    token_credential: TokenIssueRequest,
+    tr_id: str,
+) -> KISResponse:
+    started = time.perf_counter()
+    kis_response = get_type_adapter(response_type).validate_json(http_response.body)
+    kis_response_parse_duration.observe(
+        time.perf_counter() - started, response_type.__name__
+    )
+    if not kis_response.isSuccess():
+        kis_request_errors.inc(
+            tr_id, get_domain_label(token_credential), kis_response.msg_cd
+        )
+    return kis_response
+
+
+async def fetch_once(
+    kis_client: KISClient,
+    token_credential: TokenIssueRequest,
+    url: str,
+    params: Mapping[str, Any],
+    headers: Mapping[str, str],
+    response_type: type[KISResponse],
+) -> KISResponse:
+    http_response = await kis_client.get(token_credential, url, params, headers)
+    return parse_response(
+        http_response, response_type, token_credential, headers.get("tr_id", "")
+    )
+
+
+async def paginate(
+    kis_client: KISClient,
+    token_credential: TokenIssueRequest,
+    url: str,
+    params: Mapping[str, Any],
+    headers: Mapping[str, str],
+    response_type: type[KISResponse],
+    search_params_alias: str = "CTX_AREA_FK100",
+    search_key_alias: str = "CTX_AREA_NK100",
+) -> AsyncIterator[KISResponse]:
+    max_pages = get_settings().kis_max_pages
+
+    def fetch(
+        page_params: Mapping[str, Any], tr_cont: str
+    ) -> asyncio.Task[KISHttpResponse]:
+        page_headers = {**headers, "tr_cont": tr_cont} if tr_cont else headers
+        return asyncio.create_task(
+            kis_client.get(token_credential, url, page_params, page_headers)
+        )
+
+    task: asyncio.Task[KISHttpResponse] | None = fetch(params, "")
+    try:
+        for _ in range(max_pages):
+            if task is None:
+                return
+            http_response = await task
+            task = None
+            kis_response = parse_response(
+                http_response, response_type, token_credential, headers.get("tr_id", "")
+            )
+
+            search_params = getattr(kis_response, search_params_alias.lower(), "")
+            search_key = getattr(kis_response, search_key_alias.lower(), "")
+            has_next = (
+                kis_response.isSuccess()
+                and http_response.tr_cont in HAS_NEXT_TR_CONT
+                and bool(search_key)
+                and (
+                    params.get(search_params_alias) != search_params
+                    or params.get(search_key_alias) != search_key
+                )
+            )
+            if has_next:
+                # 현재 페이지를 변환하는 동안 다음 페이지를 미리 받아둔다.
+                params = {
+                    **params,
+                    search_params_alias: search_params,
+                    search_key_alias: search_key,
+                }
+                task = fetch(params, "N")
+
+            yield kis_response
+    finally:
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,277 @@
+import time
+from bisect import bisect_left
+from typing import Iterator, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위. 내부 처리(ms 이하)와 KIS 호출(수십 ms ~ 수 초)을 함께 볼 수 있게 잡는다.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    escaped = (
+        str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        for value in values
+    )
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+def braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+class Metric:
+    type: str
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self.render_samples()
+
+    def render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, description, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def render_samples(self) -> Iterator[str]:
+        for label_values, value in list(self.values.items()):
+            labels = format_labels(self.labels, label_values)
+            yield f"{self.name}{braces(labels)} {value}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+        # 라벨 값 → [버킷별 개수..., +Inf 개수, 합계]. 누적은 출력할 때 계산한다.
+        self.values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts = self.values.get(label_values)
+        if counts is None:
+            counts = self.values[label_values] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render_samples(self) -> Iterator[str]:
+        for label_values, counts in list(self.values.items()):
+            labels = format_labels(self.labels, label_values)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += int(count)
+                yield f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+            cumulative += int(counts[-2])
+            yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}'
+            yield f"{self.name}_sum{braces(labels)} {counts[-1]}"
+            yield f"{self.name}_count{braces(labels)} {cumulative}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return (
+            "\n".join(line for metric in self.metrics for line in metric.render())
+            + "\n"
+        )
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route.",
+        ("method", "route", "status"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests being processed.")
+)
+kis_request_duration = registry.register(
+    Histogram(
+        "kis_request_duration_seconds",
+        "KIS upstream call latency by tr_id and domain.",
+        ("tr_id", "domain"),
+    )
+)
+kis_request_errors = registry.register(
+    Counter(
+        "kis_request_errors_total",
+        "KIS upstream call errors by tr_id, domain and reason.",
+        ("tr_id", "domain", "reason"),
+    )
+)
+kis_retries = registry.register(
+    Counter(
+        "kis_retries_total",
+        "KIS upstream call retries by tr_id, domain and reason.",
+        ("tr_id", "domain", "reason"),
+    )
+)
+kis_hedged_requests = registry.register(
+    Counter(
+        "kis_hedged_requests_total",
+        "Hedged KIS requests sent because the first one was slow.",
+        ("tr_id", "domain"),
+    )
+)
+kis_circuit_open = registry.register(
+    Gauge(
+        "kis_circuit_open",
+        "1 while the circuit breaker for tr_id and domain is open.",
+        ("tr_id", "domain"),
+    )
+)
+kis_circuit_rejections = registry.register(
+    Counter(
+        "kis_circuit_rejections_total",
+        "KIS calls rejected by an open circuit breaker.",
+        ("tr_id", "domain"),
+    )
+)
+realtime_upstream_feeds = registry.register(
+    Gauge("realtime_upstream_feeds", "Connected KIS realtime WebSocket feeds.")
+)
+realtime_subscribers = registry.register(
+    Gauge("realtime_subscribers", "Connected realtime WebSocket clients.")
+)
+realtime_messages = registry.register(
+    Counter(
+        "realtime_messages_total",
+        "Realtime records fanned out to clients by channel.",
+        ("channel",),
+    )
+)
+realtime_dropped_subscribers = registry.register(
+    Counter(
+        "realtime_dropped_subscribers_total",
+        "Realtime clients disconnected because their buffer overflowed.",
+    )
+)
+realtime_invalid_messages = registry.register(
+    Counter(
+        "realtime_invalid_messages_total",
+        "KIS realtime messages skipped because they could not be handled.",
+    )
+)
+kis_rate_limit_wait = registry.register(
+    Histogram(
+        "kis_rate_limit_wait_seconds",
+        "Time spent waiting in the KIS request scheduler.",
+        ("domain",),
+    )
+)
+kis_response_parse_duration = registry.register(
+    Histogram(
+        "kis_response_parse_seconds",
+        "KIS response JSON parse and validation time.",
+        ("response_type",),
+    )
+)
+prefetch_requests = registry.register(
+    Counter(
+        "prefetch_requests_total",
+        "Background prefetch calls by market, kind and outcome.",
+        ("market", "kind", "outcome"),
+    )
+)
+response_serialize_duration = registry.register(
+    Histogram(
+        "response_serialize_seconds",
+        "Response model serialization time.",
+        ("model",),
+    )
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # 라우팅이 끝나면 scope 에 매칭된 route 가 남는다. 경로 파라미터 대신 템플릿으로 묶는다.
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from ..core.settings import Settings
+from ..models.token_model import TokenIssueRequest
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        # 토큰을 가져오면 0, 부족하면 다음 토큰까지 기다려야 하는 시간(초)을 돌려준다.
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def give_back(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class RateLimitLane:
+    def __init__(self, appkey: str, is_real_domain: bool, bucket: TokenBucket):
+        self.appkey = appkey
+        self.is_real_domain = is_real_domain
+        self.bucket = bucket
+        # 계좌별 대기열을 라운드로빈으로 돌면서 같은 appkey 를 쓰는 계좌끼리 공평하게 나눈다.
+        self.queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.dispatcher: asyncio.Task | None = None
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    async def acquire(self, account_number: str) -> None:
+        self.requests += 1
+        if (
+            self.dispatcher is None or self.dispatcher.done()
+        ) and self.bucket.take() == 0:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(account_number, deque()).append(future)
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self._dispatch())
+
+        started_at = time.monotonic()
+        try:
+            await future
+        finally:
+            waited = time.monotonic() - started_at
+            self.throttled += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    async def _dispatch(self) -> None:
+        while self.queues:
+            account_number, queue = next(iter(self.queues.items()))
+            future = queue.popleft()
+            if queue:
+                self.queues.move_to_end(account_number)
+            else:
+                del self.queues[account_number]
+
+            if future.done():
+                continue
+
+            while (wait := self.bucket.take()) > 0:
+                await asyncio.sleep(wait)
+
+            if future.done():
+                self.bucket.give_back()
+            else:
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "appkey": self.appkey[:4] + "****",
+            "is_real_domain": self.is_real_domain,
+            "rate": self.bucket.rate,
+            "queue_depth": self.queue_depth(),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "avg_wait_ms": (
+                self.total_wait / self.throttled * 1000 if self.throttled else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class KISRequestScheduler:
+    def __init__(
+        self, real_rate: float, real_burst: float, mock_rate: float, mock_burst: float
+    ):
+        self.limits = {True: (real_rate, real_burst), False: (mock_rate, mock_burst)}
+        self.lanes: dict[tuple[str, bool], RateLimitLane] = {}
+
+    @classmethod
+    def create(cls, settings: Settings) -> "KISRequestScheduler":
+        return cls(
+            real_rate=settings.kis_real_rate_limit,
+            real_burst=settings.kis_real_rate_burst,
+            mock_rate=settings.kis_mock_rate_limit,
+            mock_burst=settings.kis_mock_rate_burst,
+        )
+
+    def get_lane(self, appkey: str, is_real_domain: bool) -> RateLimitLane:
+        key = (appkey, is_real_domain)
+        lane = self.lanes.get(key)
+        if lane is None:
+            rate, burst = self.limits[is_real_domain]
+            lane = RateLimitLane(appkey, is_real_domain, TokenBucket(rate, burst))
+            self.lanes[key] = lane
+        return lane
+
+    async def acquire(self, token_credential: TokenIssueRequest) -> None:
+        lane = self.get_lane(token_credential.appkey, token_credential.is_real_domain)
+        await lane.acquire(token_credential.account_number)
+
+    def stats(self) -> list[dict]:
+        return [lane.stats() for lane in self.lanes.values()]
@@ -0,0 +1,100 @@
+import json
+import random
+import time
+
+import aiohttp
+
+from ..core.settings import Settings
+
+
+class ResiliencePolicy:
+    def __init__(
+        self,
+        timeout: float,
+        retry_attempts: int,
+        retry_backoff: float,
+        retry_backoff_max: float,
+        retryable_msg_cds: frozenset[str],
+        breaker_failures: int,
+        breaker_reset: float,
+        hedge_delay: float,
+    ):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retryable_msg_cds = retryable_msg_cds
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.hedge_delay = hedge_delay
+
+    @classmethod
+    def create(cls, settings: Settings) -> "ResiliencePolicy":
+        return cls(
+            timeout=settings.kis_request_timeout,
+            retry_attempts=settings.kis_retry_attempts,
+            retry_backoff=settings.kis_retry_backoff,
+            retry_backoff_max=settings.kis_retry_backoff_max,
+            retryable_msg_cds=frozenset(settings.kis_retryable_msg_cds.split(",")),
+            breaker_failures=settings.kis_breaker_failures,
+            breaker_reset=settings.kis_breaker_reset,
+            hedge_delay=settings.kis_hedge_delay,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter: 여러 요청이 같은 순간에 다시 몰리지 않도록 0 ~ 상한 사이에서 고른다.
+        return random.uniform(
+            0, min(self.retry_backoff_max, self.retry_backoff * 2**attempt)
+        )
+
+    def retry_reason(self, status: int, body: bytes) -> str | None:
+        # KIS 는 업무 오류도 500 으로 돌려주므로, 유량제한 같은 일시적인 msg_cd 만 재시도한다.
+        if status in (429, 502, 503, 504):
+            return f"http_{status}"
+        if status >= 500:
+            try:
+                msg_cd = json.loads(body).get("msg_cd")
+            except (ValueError, AttributeError):
+                return None
+            if msg_cd in self.retryable_msg_cds:
+                return msg_cd
+        return None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_started_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        # half-open: 시험 요청 하나만 보내고, 그 결과로 닫을지 다시 열지 정한다.
+        if (
+            self.trial_started_at is not None
+            and now - self.trial_started_at < self.reset_timeout
+        ):
+            return False
+        self.trial_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
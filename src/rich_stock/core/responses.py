@@ -0,0 +1,81 @@
+import hashlib
+import time
+from array import array
+from typing import Any, Protocol, runtime_checkable
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from ..core.metrics import response_serialize_duration
+
+
+# 내용이 바뀔 수 있는 응답은 쓰기 전에 매번 ETag 로 재검증한다.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+# 확정된 과거 일자만 담은 응답은 바뀌지 않는다.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@runtime_checkable
+class JSONRenderable(Protocol):
+    # 응답 모델 없이 JSON 을 직접 만드는 내부 타입. (예: TradeBatch)
+    def to_json(self) -> bytes: ...
+
+
+class ModelResponse(Response):
+    # 응답 모델을 FastAPI 가 dict 로 풀어 다시 검증하고 json.dumps 하지 않도록, pydantic 직렬화기로 한 번에 bytes 로 만든다.
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        if isinstance(content, JSONRenderable):
+            body = content.to_json()
+        else:
+            body = to_json(content)
+        response_serialize_duration.observe(
+            time.perf_counter() - started, type(content).__name__
+        )
+        return body
+
+
+def compute_etag(*parts: bytes | memoryview | array) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+class EncodedJSON:
+    # 한 번 직렬화한 본문과 그 ETag. 캐시된 값을 응답할 때마다 다시 직렬화하지 않도록 같이 들고 있는다.
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = compute_etag(body)
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedJSON":
+        return cls(bytes(ModelResponse(content).body))
+
+    def to_json(self) -> bytes:
+        return self.body
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def conditional_response(
+    request: Request, content: Any, etag: str, cache_control: str
+) -> Response:
+    # If-None-Match 가 같으면 본문을 만들지 않고 304 로 돌려준다.
+    # 계좌마다 내용이 다르므로 브라우저 캐시도 인증토큰별로 나눈다.
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ModelResponse(content, headers=headers)
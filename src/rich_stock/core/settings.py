@@ -0,0 +1,135 @@
+import os
+from functools import lru_cache
+
+from pydantic import BaseModel, Field
+
+
+class Settings(BaseModel):
+    api_key: str | None = Field(default=None, description="인증토큰(JWT) 서명 키")
+    verified_token_cache_size: int = Field(
+        default=4096, description="검증을 마친 인증토큰 캐시 크기"
+    )
+    metrics_token: str | None = Field(
+        default=None, description="/metrics 조회용 Bearer 토큰 (공란: /metrics 비활성)"
+    )
+
+    real_domain: str | None = Field(default=None, description="KIS 실전 도메인")
+    mock_domain: str | None = Field(default=None, description="KIS 모의 도메인")
+    real_websocket_domain: str = Field(
+        default="ws://ops.koreainvestment.com:21000",
+        description="KIS 실전 실시간 웹소켓 주소",
+    )
+    mock_websocket_domain: str = Field(
+        default="ws://ops.koreainvestment.com:31000",
+        description="KIS 모의 실시간 웹소켓 주소",
+    )
+
+    kis_connection_limit: int = Field(default=100, description="KIS 전체 연결 수")
+    kis_connection_limit_per_host: int = Field(
+        default=20, description="KIS 도메인별 연결 수"
+    )
+    kis_keepalive_timeout: float = Field(default=30, description="keep-alive 초")
+    kis_dns_cache_ttl: int = Field(default=300, description="DNS 캐시 초")
+
+    # KIS 유량제한: 실전 초당 20건, 모의 초당 2건 (appkey 기준)
+    kis_real_rate_limit: float = Field(default=20, description="실전 초당 요청 수")
+    kis_real_rate_burst: float = Field(default=5, description="실전 순간 허용 요청 수")
+    kis_mock_rate_limit: float = Field(default=2, description="모의 초당 요청 수")
+    kis_mock_rate_burst: float = Field(default=1, description="모의 순간 허용 요청 수")
+
+    kis_request_timeout: float = Field(default=10, description="KIS 요청 제한시간 초")
+    kis_retry_attempts: int = Field(default=2, description="KIS 요청 재시도 횟수")
+    kis_retry_backoff: float = Field(default=0.2, description="재시도 대기 기본 초")
+    kis_retry_backoff_max: float = Field(default=2, description="재시도 대기 최대 초")
+    kis_retryable_msg_cds: str = Field(
+        default="EGW00201", description="재시도할 KIS 응답코드 (쉼표로 구분)"
+    )
+    kis_breaker_failures: int = Field(
+        default=5, description="서킷 브레이커가 열리는 연속 실패 횟수"
+    )
+    kis_breaker_reset: float = Field(
+        default=30, description="서킷 브레이커가 열려 있는 초"
+    )
+    # 0 이면 hedged request 를 보내지 않는다.
+    kis_hedge_delay: float = Field(default=0, description="hedged request 대기 초")
+
+    kis_max_pages: int = Field(default=100, description="연속조회 최대 페이지 수")
+    kis_history_window_days: int = Field(
+        default=31, description="거래내역 조회 윈도우 일수"
+    )
+    kis_history_concurrency: int = Field(
+        default=4, description="거래내역 윈도우 동시 조회 수"
+    )
+
+    balance_cache_ttl: float = Field(default=3, description="잔고 캐시 초")
+    balance_cache_size: int = Field(default=1024, description="잔고 캐시 크기")
+    quote_cache_ttl: float = Field(default=1, description="시세 캐시 초")
+    quote_cache_size: int = Field(default=4096, description="시세 캐시 크기")
+    history_cache_ttl: float = Field(
+        default=30, description="확정되지 않은 최근 구간 거래내역 캐시 초"
+    )
+    history_cache_size: int = Field(default=1024, description="거래내역 캐시 크기")
+
+    token_cache_path: str = Field(
+        default="kis_token_cache.json", description="접근토큰 캐시 파일 (공란: 끔)"
+    )
+    token_refresh_margin: float = Field(
+        default=600, description="만료 몇 초 전부터 접근토큰을 새로 발급할지"
+    )
+    history_store_path: str = Field(
+        default="history.sqlite3", description="거래내역 저장소 파일 (공란: 끔)"
+    )
+
+    balance_batch_concurrency: int = Field(
+        default=8, description="여러 계좌 잔고 동시 조회 수"
+    )
+    quote_batch_concurrency: int = Field(
+        default=8, description="여러 종목 시세 동시 조회 수"
+    )
+    portfolio_section_timeout: float = Field(
+        default=10, description="포트폴리오 항목별 제한시간 초"
+    )
+
+    realtime_queue_size: int = Field(
+        default=256, description="실시간 구독자별 메세지 대기열 크기"
+    )
+    realtime_max_channels: int = Field(
+        default=41, description="KIS 웹소켓 하나당 최대 구독 수"
+    )
+
+    # 장 시작 전에 등록된 계좌의 잔고/거래내역을 미리 받아 캐시와 저장소를 채운다.
+    prefetch_accounts_path: str = Field(
+        default="", description="미리 조회할 계좌 목록 JSON 파일 (공란: 끔)"
+    )
+    prefetch_kr_times: str = Field(
+        default="08:50", description="국내 미리 조회 시작 시각 (HH:MM, 쉼표로 구분)"
+    )
+    # 미국 정규장 개장(서머타임 22:30, 표준시 23:30) 10분 전
+    prefetch_overseas_times: str = Field(
+        default="22:20,23:20",
+        description="해외 미리 조회 시작 시각 (HH:MM, 쉼표로 구분)",
+    )
+    prefetch_duration: float = Field(
+        default=900, description="미리 조회를 시작한 뒤 잔고를 계속 갱신하는 초"
+    )
+    prefetch_interval: float = Field(
+        default=2, description="잔고 갱신 간격 초 (balance_cache_ttl 보다 짧게)"
+    )
+    prefetch_history_days: int = Field(
+        default=7, description="저장된 거래내역이 없을 때 미리 받아둘 일수"
+    )
+    prefetch_concurrency: int = Field(
+        default=4, description="동시에 미리 조회할 계좌 수"
+    )
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        # 환경변수 이름은 필드 이름(소문자)과 같다. 없는 값은 기본값을 쓴다.
+        return cls.model_validate(
+            {name: os.environ[name] for name in cls.model_fields if name in os.environ}
+        )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings.from_env()
@@ -1,9 +1,13 @@
 from enum import Enum
 from fastapi import Header
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import ConfigDict, Field, field_serializer
 
 from ..models.enums import CurrencyCode, OverseasMarketCode
-from ..entities.kis_base_entity import KISRequestBase, KISResponseBase
+from ..entities.kis_base_entity import (
+    KISRequestBase,
+    KISResponseBase,
+    KISResponseOutputBase,
+)
 
 
 class KISDomesticBalanceRequest(KISRequestBase):
@@ -74,40 +78,40 @@ class KISDomesticBalanceRequest(KISRequestBase):
         return f"0{value}"
 
 
-class KISDomesticBalanceOutput1Response(BaseModel):
-    pdno: int = Field(description="상품번호 (종목번호(뒷 6자리))")
+class KISDomesticBalanceOutput1Response(KISResponseOutputBase):
+    pdno: str = Field(description="상품번호 (종목번호(뒷 6자리))")
     prdt_name: str = Field(description="상품명")
-    trad_dvsn_name: int = Field(description="매매구분명 (매수매도구분)")
+    trad_dvsn_name: str = Field(description="매매구분명 (매수매도구분)")
     bfdy_buy_qty: int = Field(description="전일매수수량")
     bfdy_sll_qty: int = Field(description="전일매도수량")
     thdt_buyqty: int = Field(description="금일매수수량")
     thdt_sll_qty: int = Field(description="금일매도수량")
     hldg_qty: int = Field(description="보유수량")
     ord_psbl_qty: int = Field(description="주문가능수량")
-    pchs_avg_pric: int = Field(description="매입평균가격 (매입금액 / 보유수량)")
+    pchs_avg_pric: float = Field(description="매입평균가격 (매입금액 / 보유수량)")
     pchs_amt: int = Field(description="매입금액")
     prpr: int = Field(description="현재가")
     evlu_amt: int = Field(description="평가금액")
     evlu_pfls_amt: int = Field(description="평가손익금액")
-    evlu_pfls_rt: int = Field(description="평가손익율")
-    evlu_erng_rt: int = Field(description="평가수익율")
-    loan_dt: int = Field(
+    evlu_pfls_rt: float = Field(description="평가손익율")
+    evlu_erng_rt: float = Field(description="평가수익율")
+    loan_dt: str = Field(
         description="대출일자 (INQR_DVSN(조회구분)을 01(대출일별)로 설정해야 값이 나옴)"
     )
     loan_amt: int = Field(description="대출금액")
     stln_slng_chgs: int = Field(description="대주매각대금")
-    expd_dt: int = Field(description="만기일자")
-    fltt_rt: int = Field(description="등락율")
+    expd_dt: str = Field(description="만기일자")
+    fltt_rt: float = Field(description="등락율")
     bfdy_cprs_icdc: int = Field(description="전일대비증감")
-    item_mgna_rt_name: int = Field(description="종목증거금율명")
-    grta_rt_name: int = Field(description="보증금율명")
+    item_mgna_rt_name: str = Field(description="종목증거금율명")
+    grta_rt_name: str = Field(description="보증금율명")
     sbst_pric: int = Field(
         description="대용가격 (증권매매의 위탁보증금으로서 현금 대신에 사용되는 유가증권 가격)"
     )
     stck_loan_unpr: int = Field(description="주식대출단가")
 
 
-class KISDomesticBalanceOutput2Response(BaseModel):
+class KISDomesticBalanceOutput2Response(KISResponseOutputBase):
     dnca_tot_amt: int = Field(description="예수금총금액 (예수금)")
     nxdy_excc_amt: int = Field(description="익일정산금액 (예수금+1)")
     prvs_rcdl_excc_amt: int = Field(description="가수도정산금액 (예수금+2)")
@@ -141,14 +145,15 @@ class KISDomesticBalanceOutput2Response(BaseModel):
 
 
 class KISDomesticBalanceResponse(KISResponseBase):
-    output1: list[KISDomesticBalanceOutput1Response | None] = Field(
-        description="응답상세1"
+    # 실패 응답(rt_cd != 0)에는 output 이 없으므로 모두 기본값을 둔다.
+    output1: list[KISDomesticBalanceOutput1Response | None] | None = Field(
+        default=None, description="응답상세1"
     )
-    output2: list[KISDomesticBalanceOutput2Response | None] = Field(
-        description="응답상세2"
+    output2: list[KISDomesticBalanceOutput2Response | None] | None = Field(
+        default=None, description="응답상세2"
     )
-    ctx_area_fk100: str = Field(description="연속조회검색조건100")
-    ctx_area_nk100: str = Field(description="연속조회키100")
+    ctx_area_fk100: str = Field(default="", description="연속조회검색조건100")
+    ctx_area_nk100: str = Field(default="", description="연속조회키100")
 
 
 class KISOverseasBalanceRequest(KISRequestBase):
@@ -176,20 +181,20 @@ class KISOverseasBalanceRequest(KISRequestBase):
     model_config = ConfigDict(use_enum_values=True, validate_default=True)
 
 
-class KISOverseasOutput1Response(BaseModel):
+class KISOverseasOutput1Response(KISResponseOutputBase):
     cano: str = Field(description="종합계좌번호")
     acnt_prdt_cd: str = Field(description="계좌상품코드")
     prdt_type_cd: str = Field(description="상품유형코드")
     ovrs_pdno: str = Field(description="해외상품번호")
     ovrs_item_name: str = Field(description="해외종목명")
-    frcr_evlu_pfls_amt: str = Field(description="외화평가손익금액")
-    evlu_pfls_rt: str = Field(description="평가손익율")
-    pchs_avg_pric: str = Field(description="매입평균가격")
-    ovrs_cblc_qty: str = Field(description="해외잔고수량")
-    ord_psbl_qty: str = Field(description="주문가능수량")
-    frcr_pchs_amt1: str = Field(description="외화매입금액1")
-    ovrs_stck_evlu_amt: str = Field(description="해외주식평가금액")
-    now_pric2: str = Field(description="현재가격2")
+    frcr_evlu_pfls_amt: float = Field(description="외화평가손익금액")
+    evlu_pfls_rt: float = Field(description="평가손익율")
+    pchs_avg_pric: float = Field(description="매입평균가격")
+    ovrs_cblc_qty: float = Field(description="해외잔고수량")
+    ord_psbl_qty: float = Field(description="주문가능수량")
+    frcr_pchs_amt1: float = Field(description="외화매입금액1")
+    ovrs_stck_evlu_amt: float = Field(description="해외주식평가금액")
+    now_pric2: float = Field(description="현재가격2")
     tr_crcy_cd: str = Field(description="거래통화코드")
     ovrs_excg_cd: str = Field(description="해외거래소코드")
     loan_type_cd: str = Field(description="대출유형코드")
@@ -197,7 +202,7 @@ class KISOverseasOutput1Response(BaseModel):
     expd_dt: str = Field(description="만기일자")
 
 
-class KISOverseasOutput2Response(BaseModel):
+class KISOverseasOutput2Response(KISResponseOutputBase):
     frcr_pchs_amt1: float = Field(description="외화매입금액1")
     ovrs_rlzt_pfls_amt: float = Field(description="해외실현손익금액")
     ovrs_tot_pfls: float = Field(description="해외총손익")
@@ -210,7 +215,10 @@ class KISOverseasOutput2Response(BaseModel):
 
 
 class KISOverseasBalanceResponse(KISResponseBase):
-    output1: list[KISOverseasOutput1Response | None] = Field(description="응답상세1")
+    # 실패 응답(rt_cd != 0)에는 output 이 없으므로 모두 기본값을 둔다.
+    output1: list[KISOverseasOutput1Response | None] | None = Field(
+        default=None, description="응답상세1"
+    )
     output2: KISOverseasOutput2Response | None = Field(
         default=None, description="응답상세2"
     )
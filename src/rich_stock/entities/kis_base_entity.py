@@ -1,5 +1,5 @@
 from fastapi import Header
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class KISRequestBase(BaseModel):
@@ -17,7 +17,14 @@ class KISRequestBase(BaseModel):
     )
 
 
+class KISResponseOutputBase(BaseModel):
+    # 응답 스키마는 임포트할 때가 아니라 처음 쓸 때(또는 기동 직후 warm-up 에서) 만든다.
+    model_config = ConfigDict(defer_build=True)
+
+
 class KISResponseBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     rt_cd: int = Field(description="성공 실패 여부 (0: 성공)")
     msg_cd: str = Field(description="응답코드")
     msg1: str = Field(description="응답메세지")
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import ConfigDict, Field, field_serializer
 
-from ..models.enums import OverseasMarketCode
-from ..entities.kis_base_entity import KISRequestBase, KISResponseBase
+from ..models.enums import CurrencyCode, OverseasMarketCode, SellBuyType
+from ..entities.kis_base_entity import (
+    KISRequestBase,
+    KISResponseBase,
+    KISResponseOutputBase,
+)
 
 
 class KISDomesticDailyHistoryRequest(KISRequestBase):
@@ -71,7 +75,7 @@ class KISDomesticDailyHistoryRequest(KISRequestBase):
     )
 
 
-class KISDomesticDailyHistoryOutput1(BaseModel):
+class KISDomesticDailyHistoryOutput1(KISResponseOutputBase):
     ord_dt: str = Field(description="주문일자")
     ord_gno_brno: str = Field(
         description="주문채번지점번호 (주문시 한국투자증권 시스템에서 지정된 영업점코드)"
@@ -81,7 +85,9 @@ class KISDomesticDailyHistoryOutput1(BaseModel):
     )
     orgn_odno: str = Field(description="원주문번호")
     ord_dvsn_name: str = Field(description="주문구분명")
-    sll_buy_dvsn_cd: str = Field(description="매도매수구분코드 (01: 매도, 02: 매수)")
+    sll_buy_dvsn_cd: SellBuyType = Field(
+        description="매도매수구분코드 (01: 매도, 02: 매수)"
+    )
     sll_buy_dvsn_cd_name: str = Field(
         description="매도매수구분코드명 (반대매매 인경우 '임의매도'로 표시됨 정정취소여부가 Y이면 *이 붙음)"
     )
@@ -90,10 +96,10 @@ class KISDomesticDailyHistoryOutput1(BaseModel):
     ord_qty: int = Field(description="주문수량")
     ord_unpr: float = Field(description="주문단가")
     ord_tmd: str = Field(description="주문시각")
-    tot_ccld_qty: str = Field(description="총체결수량")
+    tot_ccld_qty: int = Field(description="총체결수량")
     avg_prvs: str = Field(description="평균가 (체결평균가 ( 총체결금액 / 총체결수량 ))")
     cncl_yn: str = Field(description="취소여부")
-    tot_ccld_amt: str = Field(description="총체결금액")
+    tot_ccld_amt: float = Field(description="총체결금액")
     loan_dt: str = Field(description="대출일자")
     ord_dvsn_cd: str = Field(description="주문구분코드")
     cncl_cfrm_qty: str = Field(description="취소확인수량")
@@ -110,7 +116,7 @@ class KISDomesticDailyHistoryOutput1(BaseModel):
     )
 
 
-class KISDomesticDailyHistoryOutput2(BaseModel):
+class KISDomesticDailyHistoryOutput2(KISResponseOutputBase):
     tot_ord_qty: int = Field(
         description="총주문수량. 미체결주문수량 + 체결수량 (취소주문제외)"
     )
@@ -184,14 +190,14 @@ class KISOverseasDailyHistoryRequest(KISRequestBase):
     model_config = ConfigDict(use_enum_values=True, validate_default=True)
 
 
-class KISOverseasDailyHistoryOutput1(BaseModel):
+class KISOverseasDailyHistoryOutput1(KISResponseOutputBase):
     trad_dt: str = Field(description="매매일자")
     sttl_dt: str = Field(description="결제일자")
-    sll_buy_dvsn_cd: int = Field(description="매도매수구분코드")
+    sll_buy_dvsn_cd: SellBuyType = Field(description="매도매수구분코드")
     sll_buy_dvsn_name: str = Field(description="매도매수구분명")
     pdno: str = Field(description="상품번호")
     ovrs_item_name: str = Field(description="해외종목명")
-    ccld_qty: str = Field(description="체결수량")
+    ccld_qty: int = Field(description="체결수량")
     amt_unit_ccld_qty: float = Field(description="금액단위체결수량")
     ft_ccld_unpr2: float = Field(description="FT체결단가2")
     ovrs_stck_ccld_unpr: float = Field(description="해외주식체결단가")
@@ -203,14 +209,14 @@ class KISOverseasDailyHistoryOutput1(BaseModel):
     frcr_fee1: float = Field(description="외화수수료1")
     dmst_wcrc_fee: float = Field(description="국내원화수수료")
     ovrs_wcrc_fee: float = Field(description="해외원화수수료")
-    crcy_cd: str = Field(description="통화코드")
+    crcy_cd: CurrencyCode = Field(description="통화코드")
     std_pdno: str = Field(description="표준상품번호")
     erlm_exrt: str = Field(description="등록환율")
     loan_dvsn_cd: str = Field(description="대출구분코드")
     loan_dvsn_name: str = Field(description="대출구분명")
 
 
-class KISOverseasDailyHistoryOutput2(BaseModel):
+class KISOverseasDailyHistoryOutput2(KISResponseOutputBase):
     frcr_buy_amt_smtl: float = Field(description="외화매수금액합계")
     frcr_sll_amt_smtl: float = Field(description="외화매도금액합계")
     dmst_fee_smtl: float = Field(description="국내수수료합계")
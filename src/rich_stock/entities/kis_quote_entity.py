@@ -0,0 +1,69 @@
+from pydantic import BaseModel, Field, field_validator
+
+from ..entities.kis_base_entity import KISResponseBase, KISResponseOutputBase
+
+
+class KISDomesticQuoteRequest(BaseModel):
+    market_division_code: str = Field(
+        default="J",
+        description="조건시장분류코드 (J: 주식, ETF, ETN)",
+        serialization_alias="FID_COND_MRKT_DIV_CODE",
+    )
+    ticker: str = Field(
+        description="입력종목코드 (종목번호 6자리)",
+        serialization_alias="FID_INPUT_ISCD",
+    )
+
+
+class KISDomesticQuoteOutputResponse(KISResponseOutputBase):
+    stck_prpr: int = Field(description="주식현재가")
+    prdy_vrss: int = Field(description="전일대비")
+    prdy_vrss_sign: str = Field(description="전일대비부호")
+    prdy_ctrt: float = Field(description="전일대비율")
+    stck_oprc: int = Field(description="주식시가")
+    stck_hgpr: int = Field(description="주식최고가")
+    stck_lwpr: int = Field(description="주식최저가")
+    acml_vol: int = Field(description="누적거래량")
+    acml_tr_pbmn: int = Field(description="누적거래대금")
+
+
+class KISDomesticQuoteResponse(KISResponseBase):
+    output: KISDomesticQuoteOutputResponse | None = Field(
+        description="응답상세", default=None
+    )
+
+
+class KISOverseasQuoteRequest(BaseModel):
+    auth: str = Field(
+        default="", description="사용자권한정보", serialization_alias="AUTH"
+    )
+    exchange_code: str = Field(
+        description="거래소코드 (NAS: 나스닥, NYS: 뉴욕, AMS: 아멕스)",
+        serialization_alias="EXCD",
+    )
+    ticker: str = Field(description="종목코드", serialization_alias="SYMB")
+
+
+class KISOverseasQuoteOutputResponse(KISResponseOutputBase):
+    rsym: str = Field(description="실시간조회종목코드")
+    zdiv: int | None = Field(description="소수점자리수")
+    base: float | None = Field(description="전일종가")
+    last: float | None = Field(description="현재가")
+    sign: str = Field(description="대비기호")
+    diff: float | None = Field(description="대비")
+    rate: float | None = Field(description="등락율")
+    tvol: int | None = Field(description="거래량")
+    tamt: float | None = Field(description="거래대금")
+
+    # 장 시작 전이나 없는 종목이면 숫자 필드가 빈 문자열로 내려온다.
+    @field_validator(
+        "zdiv", "base", "last", "diff", "rate", "tvol", "tamt", mode="before"
+    )
+    def empty_to_none(cls, value):
+        return None if value == "" else value
+
+
+class KISOverseasQuoteResponse(KISResponseBase):
+    output: KISOverseasQuoteOutputResponse | None = Field(
+        description="응답상세", default=None
+    )
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+
+
+class KISApprovalRequest(BaseModel):
+    grant_type: str = Field(default="client_credentials", description="권한부여 Type")
+    appkey: str = Field(description="한국투자증권 홈페이지에서 발급받은 appkey")
+    secretkey: str = Field(description="한국투자증권 홈페이지에서 발급받은 appsecret")
+
+
+class KISApprovalResponse(BaseModel):
+    approval_key: str = Field(description="웹소켓 접속키")
+
+
+class KISRealtimeRequestHeader(BaseModel):
+    approval_key: str = Field(description="웹소켓 접속키")
+    custtype: str = Field(default="P", description="고객타입 (P: 개인 / B: 법인)")
+    tr_type: str = Field(description="거래타입 (1: 등록 / 2: 해제)")
+    content_type: str = Field(
+        default="utf-8", description="컨텐츠타입", serialization_alias="content-type"
+    )
+
+
+class KISRealtimeRequestInput(BaseModel):
+    tr_id: str = Field(description="거래ID")
+    tr_key: str = Field(description="구분값 (종목코드 등)")
+
+
+class KISRealtimeRequestBody(BaseModel):
+    input: KISRealtimeRequestInput
+
+
+class KISRealtimeRequest(BaseModel):
+    header: KISRealtimeRequestHeader
+    body: KISRealtimeRequestBody
@@ -1,11 +1,101 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from .controllers.auth_controller import auth_router
-from .controllers.my_balance_controller import my_balance_router
-from .controllers.history_controller import history_router
+from .core.metrics import MetricsMiddleware
+from .core.settings import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # aiohttp, 엔티티 모듈처럼 무거운 임포트는 앱을 만들고 띄울 때 한다.
+    from .core.cache import TTLCache
+    from .core.kis_client import KISClient
+    from .core.kis_pager import warm_up_type_adapters
+    from .repositories.history_store_repository import TradeHistoryStore
+    from .repositories.prefetch_repository import PrefetchScheduler
+    from .repositories.profit_loss_repository import LotStore
+    from .repositories.realtime_repository import RealtimeHub
+    from .repositories.token_repository import KISTokenCache
+
+    settings = get_settings()
+    kis_client = KISClient.create(settings)
+    app.state.kis_client = kis_client
+    app.state.history_store = TradeHistoryStore.create(settings)
+    app.state.lot_store = LotStore.create(app.state.history_store)
+    app.state.balance_cache = TTLCache(
+        "balance",
+        ttl=settings.balance_cache_ttl,
+        max_size=settings.balance_cache_size,
+    )
+    app.state.quote_cache = TTLCache(
+        "quote", ttl=settings.quote_cache_ttl, max_size=settings.quote_cache_size
+    )
+    app.state.history_cache = TTLCache(
+        "history",
+        ttl=settings.history_cache_ttl,
+        max_size=settings.history_cache_size,
+    )
+    app.state.token_cache = KISTokenCache.create(settings)
+    app.state.realtime_hub = RealtimeHub.create(kis_client, settings)
+    app.state.prefetch_scheduler = PrefetchScheduler.create(
+        settings,
+        kis_client,
+        app.state.token_cache,
+        app.state.balance_cache,
+        app.state.history_store,
+        app.state.history_cache,
+    )
+    if app.state.prefetch_scheduler is not None:
+        app.state.prefetch_scheduler.start()
+
+    # KIS 연결과 응답 스키마 준비는 기동(첫 응답)을 막지 않도록 백그라운드에서 한다.
+    async def warm_up() -> None:
+        await asyncio.gather(
+            kis_client.warm_up({settings.real_domain, settings.mock_domain}),
+            warm_up_type_adapters(),
+        )
+
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    warm_up_task.cancel()
+    if app.state.prefetch_scheduler is not None:
+        await app.state.prefetch_scheduler.close()
+    await app.state.realtime_hub.close()
+    await kis_client.close()
+    if app.state.history_store is not None:
+        app.state.history_store.close()
+
+
+def create_app() -> FastAPI:
+    from .controllers.auth_controller import auth_router
+    from .controllers.my_balance_controller import my_balance_router
+    from .controllers.history_controller import history_router
+    from .controllers.portfolio_controller import portfolio_router
+    from .controllers.profit_loss_controller import profit_loss_router
+    from .controllers.quote_controller import quote_router
+    from .controllers.realtime_controller import realtime_router
+    from .controllers.system_controller import metrics_router, system_router
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(router=auth_router)
+    app.include_router(router=my_balance_router)
+    app.include_router(router=history_router)
+    app.include_router(router=portfolio_router)
+    app.include_router(router=profit_loss_router)
+    app.include_router(router=quote_router)
+    app.include_router(router=realtime_router)
+    app.include_router(router=system_router)
+    app.include_router(router=metrics_router)
+    return app
 
-app = FastAPI()
 
-app.include_router(router=auth_router)
-app.include_router(router=my_balance_router)
-app.include_router(router=history_router)
+def __getattr__(name: str) -> FastAPI:
+    # "rich_stock.main:app" 으로 띄우는 기존 방식은 그대로 두고, 모듈 임포트만으로는 앱을 만들지 않는다.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,7 @@ class CountryCode(str, Enum):
 
 
 class CurrencyCode(str, Enum):
+    KRW = "KRW"  # 원화
     USD = "USD"  # 미국달러
     HKD = "HKD"  # 홍콩달러
     CNY = "CNY"  # 중국위안화
@@ -35,3 +36,16 @@ class SellBuyType(IntEnum):
     ALL = 0
     SELL = 1
     BUY = 2
+
+
+class LotMatchingMethod(str, Enum):
+    FIFO = "fifo"  # 선입선출
+    AVERAGE = "average"  # 평균단가
+
+
+class RealtimeChannel(str, Enum):
+    DomesticTrade = "H0STCNT0"  # 국내주식 실시간체결가
+    DomesticOrderbook = "H0STASP0"  # 국내주식 실시간호가
+    OverseasTrade = "HDFSCNT0"  # 해외주식 실시간지연체결가
+    OverseasOrderbook = "HDFSASP0"  # 해외주식 실시간호가
+    # 체결통보(H0STCNI0, H0GSCNI0)는 AES 로 암호화되어 내려오므로 아직 지원하지 않는다.
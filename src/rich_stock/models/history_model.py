@@ -20,3 +20,46 @@ class DailyHistoryResponse(BaseModel):
     items: list[DailyHistoryDetailResponse] | None = Field(description="거래내역")
     total_buy_amount: float = Field(description="총 매수금액")
     total_sell_amount: float = Field(description="총 매도금액")
+
+
+class DailyHistorySummaryResponse(BaseModel):
+    total_buy_amount: float = Field(description="총 매수금액")
+    total_sell_amount: float = Field(description="총 매도금액")
+
+
+class HistoryAggregateResponse(BaseModel):
+    trade_count: int = Field(description="체결 건수")
+    buy_count: int = Field(description="매수 체결 건수")
+    sell_count: int = Field(description="매도 체결 건수")
+    buy_quantity: float = Field(description="매수 수량")
+    sell_quantity: float = Field(description="매도 수량")
+    buy_amount: float = Field(description="매수 금액")
+    sell_amount: float = Field(description="매도 금액")
+    buy_average_price: float = Field(description="매수 평균단가 (VWAP)")
+    sell_average_price: float = Field(description="매도 평균단가 (VWAP)")
+    turnover_amount: float = Field(description="거래대금 (매수 금액 + 매도 금액)")
+    fee_amount: float = Field(description="수수료 합계")
+
+
+class TickerHistoryAggregateResponse(HistoryAggregateResponse):
+    ticker: str = Field(description="종목코드")
+    ticker_name: str = Field(description="종목명")
+    currency: CurrencyCode = Field(description="통화코드")
+
+
+class DailyHistoryAggregateResponse(HistoryAggregateResponse):
+    trade_day: str = Field(description="매매 일자")
+    currency: CurrencyCode = Field(description="통화코드")
+
+
+class CurrencyHistoryAggregateResponse(HistoryAggregateResponse):
+    currency: CurrencyCode = Field(description="통화코드")
+
+
+class HistoryAnalyticsResponse(BaseModel):
+    trade_count: int = Field(description="전체 체결 건수")
+    tickers: list[TickerHistoryAggregateResponse] = Field(description="종목별 집계")
+    days: list[DailyHistoryAggregateResponse] = Field(description="일자별 집계")
+    currencies: list[CurrencyHistoryAggregateResponse] = Field(
+        description="통화별 집계"
+    )
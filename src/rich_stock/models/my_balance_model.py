@@ -1,7 +1,44 @@
 from pydantic import BaseModel, Field
 
 
+class MyBalanceHoldingResponse(BaseModel):
+    ticker: str = Field(description="종목코드")
+    ticker_name: str = Field(description="종목명")
+    quantity: float = Field(description="보유수량")
+    average_price: float = Field(description="매입평균가격")
+    current_price: float = Field(description="현재가")
+    purchase_amount: float = Field(description="매입금액")
+    evaluation_amount: float = Field(description="평가금액")
+    profit_loss_amount: float = Field(description="평가손익금액")
+
+
 class MyBalanceResponse(BaseModel):
     deposit: int = Field(description="예수금", default=0)
     deposit_next_day: int = Field(description="예수금 +1", default=0)
     deposit_day_after_next: int = Field(description="예수금 +2", default=0)
+    holdings: list[MyBalanceHoldingResponse] = Field(
+        description="보유종목", default_factory=list
+    )
+
+
+class MyBalanceBatchRequest(BaseModel):
+    tokens: list[str] = Field(
+        description="조회할 계좌들의 인증토큰 (/auth/issue_token 으로 발급)",
+        min_length=1,
+        max_length=100,
+    )
+
+
+class MyBalanceBatchItemResponse(BaseModel):
+    account_number: str | None = Field(
+        description="계좌번호 (토큰 검증에 실패하면 null)"
+    )
+    status_code: int = Field(description="계좌별 조회 결과 상태코드")
+    detail: str | None = Field(description="실패 사유", default=None)
+    balance: MyBalanceResponse | None = Field(description="잔고", default=None)
+
+
+class MyBalanceBatchResponse(BaseModel):
+    items: list[MyBalanceBatchItemResponse] = Field(
+        description="계좌별 결과 (요청한 토큰 순서)"
+    )
@@ -0,0 +1,30 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+from ..models.history_model import DailyHistoryResponse
+from ..models.my_balance_model import MyBalanceResponse
+
+
+T = TypeVar("T")
+
+
+class PortfolioSectionResponse(BaseModel, Generic[T]):
+    status_code: int = Field(description="항목별 조회 결과 상태코드")
+    detail: str | None = Field(description="실패 사유", default=None)
+    data: T | None = Field(description="조회 결과", default=None)
+
+
+class PortfolioResponse(BaseModel):
+    domestic_balance: PortfolioSectionResponse[MyBalanceResponse] = Field(
+        description="국내 주식잔고"
+    )
+    overseas_balance: PortfolioSectionResponse[MyBalanceResponse] = Field(
+        description="해외 주식잔고"
+    )
+    domestic_history: PortfolioSectionResponse[DailyHistoryResponse] | None = Field(
+        description="국내 거래내역 (조회 기간을 주지 않으면 null)", default=None
+    )
+    overseas_history: PortfolioSectionResponse[DailyHistoryResponse] | None = Field(
+        description="해외 거래내역 (조회 기간을 주지 않으면 null)", default=None
+    )
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+
+from ..models.enums import CurrencyCode
+
+
+class RealizedProfitLossDetailResponse(BaseModel):
+    ticker: str = Field(description="종목코드")
+    ticker_name: str = Field(description="종목명")
+    currency: CurrencyCode = Field(description="통화코드")
+    sold_quantity: float = Field(description="매칭된 매도 수량")
+    proceeds_amount: float = Field(description="매도 금액 (수수료 차감)")
+    cost_amount: float = Field(description="매도분의 취득원가 (수수료 포함)")
+    realized_amount: float = Field(description="실현손익")
+    unmatched_quantity: float = Field(
+        description="매칭할 매수 내역이 없는 매도 수량 (조회 시작 이전에 매수한 수량)"
+    )
+
+
+class RealizedProfitLossResponse(BaseModel):
+    processed_through: str = Field(description="반영된 마지막 매매 일자")
+    items: list[RealizedProfitLossDetailResponse] = Field(description="종목별 실현손익")
+
+
+class UnrealizedProfitLossDetailResponse(BaseModel):
+    ticker: str = Field(description="종목코드")
+    ticker_name: str = Field(description="종목명")
+    currency: CurrencyCode = Field(description="통화코드")
+    quantity: float = Field(description="미청산 수량")
+    average_cost: float = Field(description="미청산 수량의 평균 취득단가")
+    cost_amount: float = Field(description="미청산 수량의 취득원가")
+    current_price: float | None = Field(description="현재가 (잔고에 없으면 null)")
+    evaluation_amount: float | None = Field(description="평가금액")
+    unrealized_amount: float | None = Field(description="평가손익")
+
+
+class UnrealizedProfitLossResponse(BaseModel):
+    processed_through: str = Field(description="반영된 마지막 매매 일자")
+    items: list[UnrealizedProfitLossDetailResponse] = Field(
+        description="종목별 평가손익"
+    )
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field
+
+from .enums import CurrencyCode, OverseasMarketCode
+
+
+class QuoteResponse(BaseModel):
+    ticker: str = Field(description="종목코드")
+    market: str = Field(description="시장 (KRX 또는 해외 거래소코드)")
+    currency: CurrencyCode = Field(description="통화")
+    current_price: float = Field(description="현재가")
+    change: float = Field(description="전일대비")
+    change_rate: float = Field(description="전일대비율 (%)")
+    volume: int = Field(description="누적거래량")
+    trade_amount: float = Field(description="누적거래대금")
+
+
+class QuoteBatchRequest(BaseModel):
+    tickers: list[str] = Field(
+        description="종목코드 목록", min_length=1, max_length=100, examples=[["005930"]]
+    )
+
+
+class OverseasQuoteTickerRequest(BaseModel):
+    market: OverseasMarketCode = Field(description="거래소")
+    ticker: str = Field(description="종목코드", examples=["AAPL"])
+
+
+class OverseasQuoteBatchRequest(BaseModel):
+    items: list[OverseasQuoteTickerRequest] = Field(
+        description="거래소별 종목코드 목록", min_length=1, max_length=100
+    )
+
+
+class QuoteBatchItemResponse(BaseModel):
+    ticker: str = Field(description="종목코드")
+    market: str = Field(description="시장 (KRX 또는 해외 거래소코드)")
+    status_code: int = Field(description="종목별 조회 결과 상태코드")
+    detail: str | None = Field(description="실패 사유", default=None)
+    quote: QuoteResponse | None = Field(description="시세", default=None)
+
+
+class QuoteBatchResponse(BaseModel):
+    items: list[QuoteBatchItemResponse] = Field(description="종목별 결과 (요청한 순서)")
@@ -0,0 +1,16 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .enums import RealtimeChannel
+
+
+class RealtimeSubscribeRequest(BaseModel):
+    action: Literal["subscribe", "unsubscribe"] = Field(description="등록 / 해제")
+    channel: RealtimeChannel = Field(description="실시간 채널 (KIS tr_id)")
+    key: str = Field(
+        description="구분값 (국내: 종목코드, 해외: D+거래소+종목코드)",
+        min_length=1,
+        max_length=16,
+        examples=["005930", "DNASAAPL"],
+    )
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+
+
+class RateLimitStatusResponse(BaseModel):
+    appkey: str = Field(description="appkey (마스킹)")
+    is_real_domain: bool = Field(description="실전 도메인 여부")
+    rate: float = Field(description="초당 허용 요청 수")
+    queue_depth: int = Field(description="대기중인 요청 수")
+    requests: int = Field(description="누적 요청 수")
+    throttled: int = Field(description="대기열을 거친 요청 수")
+    avg_wait_ms: float = Field(description="대기열 평균 대기시간 (ms)")
+    max_wait_ms: float = Field(description="대기열 최대 대기시간 (ms)")
+
+
+class CacheStatusResponse(BaseModel):
+    name: str = Field(description="캐시 이름")
+    size: int = Field(description="저장된 항목 수")
+    hits: int = Field(description="캐시 적중 수")
+    misses: int = Field(description="캐시 미스 수 (KIS 조회 수)")
+    coalesced: int = Field(description="진행중인 조회에 합류한 요청 수")
+    refreshes: int = Field(description="미리 조회로 새로 채운 수", default=0)
+
+
+class RealtimeFeedStatusResponse(BaseModel):
+    appkey: str = Field(description="appkey (마스킹)")
+    is_real_domain: bool = Field(description="실전 도메인 여부")
+    connected: bool = Field(description="KIS 웹소켓 연결 여부")
+    channels: int = Field(description="KIS 에 등록한 구독 수")
+    subscribers: int = Field(description="구독중인 클라이언트 수")
+    messages: int = Field(description="KIS 에서 받은 실시간 메세지 수")
+    reconnects: int = Field(description="재연결 횟수")
+
+
+class PrefetchStatusResponse(BaseModel):
+    market: str = Field(description="시장 (kr / overseas)")
+    accounts: int = Field(description="미리 조회할 계좌 수")
+    schedule: list[str] = Field(description="미리 조회 시작 시각 (HH:MM)")
+    next_run_at: str | None = Field(description="다음 미리 조회 시작 일시")
+    last_run_at: str | None = Field(description="마지막 미리 조회 시작 일시")
+    runs: int = Field(description="미리 조회를 시작한 횟수")
@@ -1,6 +1,9 @@
-import os
+import hashlib
+
 from pydantic import BaseModel, Field
 
+from ..core.settings import get_settings
+
 
 class TokenIssueRequest(BaseModel):
     appkey: str = Field(
@@ -23,9 +26,13 @@ class TokenIssueRequest(BaseModel):
 
     def get_domain_url(self) -> str:
         if self.is_real_domain:
-            return os.environ.get("real_domain")
+            return get_settings().real_domain
         else:
-            return os.environ.get("mock_domain")
+            return get_settings().mock_domain
+
+    def get_credential_hash(self) -> str:
+        # 계좌번호는 요청자가 보낸 값 그대로이므로, 계좌별 캐시/저장소는 appkey/appsecret 으로 함께 구분한다.
+        return hashlib.sha256(f"{self.appkey}\n{self.appsecret}".encode()).hexdigest()
 
     def get_account_number_prefix(self) -> str:
         return self.account_number.split("-")[0]
@@ -0,0 +1,147 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from ..models.enums import CurrencyCode, SellBuyType
+from ..models.history_model import (
+    CurrencyHistoryAggregateResponse,
+    DailyHistoryAggregateResponse,
+    HistoryAnalyticsResponse,
+    TickerHistoryAggregateResponse,
+)
+from ..repositories.history_repository import DailyHistoryRepository
+from ..repositories.trade_batch import TradeBatch
+
+
+class TradeColumns(NamedTuple):
+    trade_day: np.ndarray
+    ticker: np.ndarray
+    ticker_name: np.ndarray
+    currency: np.ndarray
+    sell_buy_type: np.ndarray
+    quantity: np.ndarray
+    amount: np.ndarray
+    fee: np.ndarray
+
+    @classmethod
+    def from_batch(cls, batch: TradeBatch) -> "TradeColumns":
+        # 숫자 컬럼은 array 버퍼를 복사 없이 그대로 numpy 배열로 본다.
+        quantity = np.frombuffer(batch.trade_quantity, dtype=np.int64)
+        quantity_decimal = np.frombuffer(batch.trade_quantity_decimal, dtype=np.float64)
+        return cls(
+            trade_day=np.array(batch.trade_day, dtype=str),
+            ticker=np.array(batch.ticker, dtype=str),
+            ticker_name=np.array(batch.ticker_name, dtype=str),
+            currency=np.array(
+                [currency.value for currency in batch.currency], dtype=str
+            ),
+            sell_buy_type=np.frombuffer(batch.sell_buy_type, dtype=np.int8),
+            # 해외 소수점 체결은 소수점 체결수량을, 그 외에는 체결 수량을 쓴다.
+            quantity=np.where(quantity_decimal > 0, quantity_decimal, quantity),
+            amount=np.frombuffer(batch.trade_price, dtype=np.float64),
+            fee=np.frombuffer(batch.trade_fee, dtype=np.float64),
+        )
+
+
+def group_by(*keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # 키마다 정렬된 코드로 바꾼 뒤 하나의 정수로 합쳐서, 여러 키 그룹핑을 np.unique 한 번으로 처리한다.
+    combined = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        uniques, codes = np.unique(key, return_inverse=True)
+        combined = combined * len(uniques) + codes
+    _, first_index, inverse = np.unique(
+        combined, return_index=True, return_inverse=True
+    )
+    return first_index, inverse
+
+
+def aggregate(columns: TradeColumns, inverse: np.ndarray, size: int) -> list[dict]:
+    is_buy = columns.sell_buy_type == SellBuyType.BUY
+    is_sell = columns.sell_buy_type == SellBuyType.SELL
+
+    def total(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(inverse, weights=weights, minlength=size)
+
+    def average(amount: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+        return np.divide(amount, quantity, out=np.zeros(size), where=quantity > 0)
+
+    buy_quantity = total(np.where(is_buy, columns.quantity, 0.0))
+    sell_quantity = total(np.where(is_sell, columns.quantity, 0.0))
+    buy_amount = total(np.where(is_buy, columns.amount, 0.0))
+    sell_amount = total(np.where(is_sell, columns.amount, 0.0))
+    aggregates = {
+        "trade_count": np.bincount(inverse, minlength=size),
+        "buy_count": np.bincount(inverse, weights=is_buy, minlength=size).astype(int),
+        "sell_count": np.bincount(inverse, weights=is_sell, minlength=size).astype(int),
+        "buy_quantity": buy_quantity,
+        "sell_quantity": sell_quantity,
+        "buy_amount": buy_amount,
+        "sell_amount": sell_amount,
+        "buy_average_price": average(buy_amount, buy_quantity),
+        "sell_average_price": average(sell_amount, sell_quantity),
+        "turnover_amount": buy_amount + sell_amount,
+        "fee_amount": total(columns.fee),
+    }
+    return [
+        dict(zip(aggregates, row))
+        for row in zip(*(values.tolist() for values in aggregates.values()))
+    ]
+
+
+def analyze_history(columns: TradeColumns) -> HistoryAnalyticsResponse:
+    first_index, inverse = group_by(columns.ticker, columns.currency)
+    tickers = [
+        TickerHistoryAggregateResponse.model_construct(
+            ticker=ticker,
+            ticker_name=ticker_name,
+            currency=CurrencyCode(currency),
+            **aggregates,
+        )
+        for ticker, ticker_name, currency, aggregates in zip(
+            columns.ticker[first_index].tolist(),
+            columns.ticker_name[first_index].tolist(),
+            columns.currency[first_index].tolist(),
+            aggregate(columns, inverse, len(first_index)),
+        )
+    ]
+
+    first_index, inverse = group_by(columns.trade_day, columns.currency)
+    days = [
+        DailyHistoryAggregateResponse.model_construct(
+            trade_day=trade_day, currency=CurrencyCode(currency), **aggregates
+        )
+        for trade_day, currency, aggregates in zip(
+            columns.trade_day[first_index].tolist(),
+            columns.currency[first_index].tolist(),
+            aggregate(columns, inverse, len(first_index)),
+        )
+    ]
+
+    first_index, inverse = group_by(columns.currency)
+    currencies = [
+        CurrencyHistoryAggregateResponse.model_construct(
+            currency=CurrencyCode(currency), **aggregates
+        )
+        for currency, aggregates in zip(
+            columns.currency[first_index].tolist(),
+            aggregate(columns, inverse, len(first_index)),
+        )
+    ]
+
+    return HistoryAnalyticsResponse.model_construct(
+        trade_count=len(columns.trade_day),
+        tickers=tickers,
+        days=days,
+        currencies=currencies,
+    )
+
+
+class HistoryAnalyticsRepository:
+    def __init__(self, repository: DailyHistoryRepository):
+        self.repository = repository
+
+    async def get_history_analytics(
+        self, begin_date: str, end_date: str
+    ) -> HistoryAnalyticsResponse:
+        batch = await self.repository.get_daily_history(begin_date, end_date)
+        return analyze_history(TradeColumns.from_batch(batch))
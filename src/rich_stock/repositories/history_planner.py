@@ -0,0 +1,38 @@
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+
+class HistoryWindow(NamedTuple):
+    begin_date: str
+    end_date: str
+    is_archive: bool
+
+
+def plan_history_windows(
+    begin_date: str,
+    end_date: str,
+    window_days: int,
+    archive_before: date | None = None,
+) -> list[HistoryWindow]:
+    # 조회기간을 window_days 단위로 나누고, archive_before 이전 구간은 별도 윈도우로 분리한다.
+    begin = datetime.strptime(begin_date, "%Y%m%d").date()
+    end = datetime.strptime(end_date, "%Y%m%d").date()
+
+    windows = []
+    while begin <= end:
+        window_end = min(end, begin + timedelta(days=window_days - 1))
+        is_archive = False
+        if archive_before is not None and begin < archive_before:
+            is_archive = True
+            window_end = min(window_end, archive_before - timedelta(days=1))
+
+        windows.append(
+            HistoryWindow(
+                begin_date=begin.strftime("%Y%m%d"),
+                end_date=window_end.strftime("%Y%m%d"),
+                is_archive=is_archive,
+            )
+        )
+        begin = window_end + timedelta(days=1)
+
+    return windows
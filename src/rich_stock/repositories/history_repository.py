@@ -1,157 +1,275 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from functools import partial
+from itertools import pairwise
+from typing import AsyncIterator, Hashable
 
-import aiohttp
 from fastapi import HTTPException, status
 
-from ..models.history_model import DailyHistoryDetailResponse, DailyHistoryResponse
+from ..core.concurrency import merge_as_ready, merge_in_order
+from ..core.kis_client import KISClient
+from ..core.kis_pager import paginate
+from ..core.settings import get_settings
+from ..models.enums import CurrencyCode, OverseasMarketCode
 from ..entities.kis_history_entity import (
     KISDomesticDailyHistoryRequest,
     KISDomesticDailyHistoryResponse,
     KISOverseasDailyHistoryRequest,
     KISOverseasDailyHistoryResponse,
 )
-from ..entities.kis_base_entity import KISRequestHeaderBase
 from ..models.token_credential_model import TokenCredential
+from ..repositories.history_planner import HistoryWindow, plan_history_windows
+from ..repositories.kis_request_template import (
+    PLACEHOLDER_DATE,
+    get_request_header,
+    get_request_template,
+)
+from ..repositories.trade_batch import TradeBatch, TradeTotals
 
 
 class DailyHistoryRepository(ABC):
+    market: str
+    token_credential: TokenCredential
+    # 오늘을 포함해 이 일수만큼의 최근 일자는 체결이 확정되지 않은 것으로 본다.
+    open_days: int = 1
+    # 이 일수보다 오래된 구간은 별도 tr_id 로 조회한다. (None: 구분 없음)
+    archive_days: int | None = None
+
     @abstractmethod
-    async def get_daily_history(
-        self, begin_date: str, end_date: str
-    ) -> DailyHistoryResponse:
+    def iter_window_history(self, window: HistoryWindow) -> AsyncIterator[TradeBatch]:
         raise NotImplementedError
 
+    def split_markets(self) -> list["DailyHistoryRepository"]:
+        # 여러 거래소를 한 번에 조회하는 저장소는 거래소별 저장소로 나눠서 거래소마다 따로 저장한다.
+        return [self]
 
-class KISDomesticDailyHistoryRepository(DailyHistoryRepository):
-    def __init__(self, token_credential: TokenCredential):
-        # [참고] 3개월 이전의 체결은 tr_id 가 다르다. (실전: CTSC9115R / 모의: VTSC9115R)
-        tr_id = "TTTC8001R" if token_credential.is_real_domain else "VTTC8001R"
-        self.token_credential = token_credential
-        self.url = (
-            token_credential.get_domain_url()
-            + "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
-        )
-        self.kis_request_header = KISRequestHeaderBase(
-            authorization=f"{token_credential.token_type} {token_credential.access_token}",
-            appkey=token_credential.appkey,
-            appsecret=token_credential.appsecret,
-            tr_id=tr_id,
-        ).model_dump()
-
-    async def get_daily_history(
+    async def merge_market_pages(
+        self, tagged_pages: AsyncIterator[tuple[Hashable, TradeBatch]]
+    ) -> AsyncIterator[TradeBatch]:
+        # split_markets 로 나눈 거래소별 페이지를 (거래소, 페이지) 로 받아 하나로 합친다.
+        async for _, page in tagged_pages:
+            yield page
+
+    async def iter_daily_history(
         self, begin_date: str, end_date: str
-    ) -> DailyHistoryResponse:
+    ) -> AsyncIterator[TradeBatch]:
+        # 합계는 KIS 가 주는 값을 쓰지 않고 지금까지 받은 행에서 만든다. (저장소에서 읽어도 같은 값)
+        # 마지막 페이지의 합계가 조회 전체 합계다.
+        totals = TradeTotals()
+        async for page in self.iter_pages(begin_date, end_date):
+            totals.add(page)
+            yield page.with_totals(*totals.amounts())
 
-        if datetime.strptime(begin_date, "%Y%m%d") < (
-            datetime.today() - timedelta(days=90)
-        ):
+    async def iter_pages(
+        self, begin_date: str, end_date: str
+    ) -> AsyncIterator[TradeBatch]:
+        archive_before = (
+            None
+            if self.archive_days is None
+            else date.today() - timedelta(days=self.archive_days)
+        )
+        windows = plan_history_windows(
+            begin_date,
+            end_date,
+            window_days=get_settings().kis_history_window_days,
+            archive_before=archive_before,
+        )
+        if not windows:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="3개월 이전의 데이터는 조회할 수 없습니다.",
+                detail="조회 시작 날짜가 종료 날짜보다 늦습니다.",
             )
 
-        kis_request_body = KISDomesticDailyHistoryRequest(
-            account_number=self.token_credential.get_account_number_prefix(),
-            account_code=self.token_credential.get_account_number_suffix(),
-            begin_date=begin_date,
-            end_date=end_date,
-        ).model_dump(by_alias=True)
+        async for page in merge_in_order(
+            (partial(self.iter_window_history, window) for window in windows),
+            concurrency=get_settings().kis_history_concurrency,
+        ):
+            yield page
+
+    async def get_daily_history(self, begin_date: str, end_date: str) -> TradeBatch:
+        pages = [page async for page in self.iter_daily_history(begin_date, end_date)]
+        if not pages:
+            return TradeBatch()
+
+        # 합계는 조회 전체 기준이므로 마지막 페이지의 값을 사용한다.
+        batch = TradeBatch.concatenate(
+            pages, pages[-1].total_buy_amount, pages[-1].total_sell_amount
+        )
+        # 페이지가 도착 순서대로 오는 경우(해외 거래소별 조회)에도 한 번에 돌려줄 때는 일자순으로 맞춘다.
+        if any(previous > current for previous, current in pairwise(batch.trade_day)):
+            batch = batch.select(
+                sorted(range(len(batch)), key=batch.trade_day.__getitem__)
+            )
+        return batch
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.url,
-                params=kis_request_body,
-                headers=self.kis_request_header,
-            ) as response:
-                text = await response.text()
 
-            kis_response = KISDomesticDailyHistoryResponse.model_validate_json(text)
+class KISDomesticDailyHistoryRepository(DailyHistoryRepository):
+    market = "KRX"
+    archive_days = 90
 
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
+        tr_id = "TTTC8001R" if token_credential.is_real_domain else "VTTC8001R"
+        # 3개월 이전의 체결은 tr_id 가 다르다. (실전: CTSC9115R / 모의: VTSC9115R)
+        archive_tr_id = "CTSC9115R" if token_credential.is_real_domain else "VTSC9115R"
+        self.token_credential = token_credential
+        self.url = (
+            token_credential.get_domain_url()
+            + "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+        )
+        self.kis_request_header = get_request_header(token_credential, tr_id)
+        self.kis_archive_request_header = get_request_header(
+            token_credential, archive_tr_id
+        )
+        self.kis_request_template = get_request_template(
+            KISDomesticDailyHistoryRequest,
+            token_credential.account_number,
+            begin_date=PLACEHOLDER_DATE,
+            end_date=PLACEHOLDER_DATE,
+        )
+        self.kis_client = kis_client
+
+    async def iter_window_history(
+        self, window: HistoryWindow
+    ) -> AsyncIterator[TradeBatch]:
+        kis_request_body = self.kis_request_template.render(
+            begin_date=window.begin_date, end_date=window.end_date
+        )
+
+        async for kis_response in paginate(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=kis_request_body,
+            headers=(
+                self.kis_archive_request_header
+                if window.is_archive
+                else self.kis_request_header
+            ),
+            response_type=KISDomesticDailyHistoryResponse,
+        ):
             if kis_response.isSuccess() is False:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail="국내 일별 거래내역 조회 실패",
+                    detail=f"국내 일별 거래내역 조회 실패 ({kis_response.msg_cd}: {kis_response.msg1})",
                 )
 
-            return DailyHistoryResponse(
-                items=[
-                    DailyHistoryDetailResponse(
-                        trade_day=item.ord_dt,
-                        sell_buy_type=item.sll_buy_dvsn_cd,
-                        ticker=item.pdno,
-                        ticker_name=item.prdt_name,
-                        trade_quantity=item.tot_ccld_qty,
-                        trade_quantity_decimal=0.0,
-                        trade_price_unit=item.ord_unpr,
-                        trade_price=item.tot_ccld_amt,
-                        trade_fee=0.0,
-                        currency="KRW",
-                    )
-                    for item in kis_response.output1
-                ],
-                total_buy_amount=kis_response.output2.tot_ccld_amt,
-                total_sell_amount=0.0,
-            )
+            # KIS 응답을 검증하면서 타입 변환까지 끝냈으므로 컬럼에 값만 옮긴다.
+            page = TradeBatch()
+            for item in kis_response.output1 or []:
+                page.append(
+                    item.ord_dt,
+                    item.sll_buy_dvsn_cd,
+                    item.pdno,
+                    item.prdt_name,
+                    item.tot_ccld_qty,
+                    0.0,
+                    item.ord_unpr,
+                    item.tot_ccld_amt,
+                    0.0,
+                    CurrencyCode.KRW,
+                )
+            yield page
 
 
 class KISOverseasDailyHistoryRepository(DailyHistoryRepository):
-    def __init__(self, token_credential: TokenCredential):
+    # 미국 장은 한국시간 기준 다음날 새벽에 끝나므로 전일까지 열린 것으로 본다.
+    open_days = 2
+
+    def __init__(
+        self,
+        token_credential: TokenCredential,
+        kis_client: KISClient,
+        markets: list[OverseasMarketCode] | None = None,
+    ):
         tr_id = "CTOS4001R"
         self.token_credential = token_credential
+        self.markets = sorted(set(markets)) if markets else list(OverseasMarketCode)
+        self.market = ",".join(market.value for market in self.markets)
         self.url = (
             token_credential.get_domain_url()
             + "/uapi/overseas-stock/v1/trading/inquire-period-trans"
         )
-        self.kis_request_header = KISRequestHeaderBase(
-            authorization=f"{token_credential.token_type} {token_credential.access_token}",
-            appkey=token_credential.appkey,
-            appsecret=token_credential.appsecret,
-            tr_id=tr_id,
-        ).model_dump()
-
-    async def get_daily_history(
-        self, begin_date: str, end_date: str
-    ) -> DailyHistoryResponse:
-        kis_request_body = KISOverseasDailyHistoryRequest(
-            account_number=self.token_credential.get_account_number_prefix(),
-            account_code=self.token_credential.get_account_number_suffix(),
-            begin_date=begin_date,
-            end_date=end_date,
-        ).model_dump(by_alias=True)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.url,
-                params=kis_request_body,
-                headers=self.kis_request_header,
-            ) as response:
-                text = await response.text()
-
-            kis_response = KISOverseasDailyHistoryResponse.model_validate_json(text)
+        self.kis_request_header = get_request_header(token_credential, tr_id)
+        self.kis_client = kis_client
+
+    def split_markets(self) -> list[DailyHistoryRepository]:
+        if len(self.markets) == 1:
+            return [self]
+        return [
+            type(self)(self.token_credential, self.kis_client, [market])
+            for market in self.markets
+        ]
+
+    async def merge_market_pages(
+        self, tagged_pages: AsyncIterator[tuple[Hashable, TradeBatch]]
+    ) -> AsyncIterator[TradeBatch]:
+        # 거래소별 페이지를 도착하는 대로 내보내되, 다른 거래소 조회에서 이미 나온 체결은 중복으로 보고 뺀다.
+        # (같은 체결이 한 거래소에서 n 번, 다른 거래소에서 m 번 나오면 max(n, m) 번만 남긴다)
+        merged_counts: Counter[tuple] = Counter()
+        market_counts: defaultdict[Hashable, Counter[tuple]] = defaultdict(Counter)
+        async for market, page in tagged_pages:
+            counts = market_counts[market]
+            indexes = []
+            for index, key in enumerate(page.rows()):
+                counts[key] += 1
+                if counts[key] > merged_counts[key]:
+                    merged_counts[key] = counts[key]
+                    indexes.append(index)
+            indexes.sort(key=page.trade_day.__getitem__)
+            yield page.select(indexes)
+
+    def iter_window_history(self, window: HistoryWindow) -> AsyncIterator[TradeBatch]:
+        return self.merge_market_pages(
+            merge_as_ready(
+                self._iter_tagged_market_history(window, market)
+                for market in self.markets
+            )
+        )
 
+    async def _iter_tagged_market_history(
+        self, window: HistoryWindow, market: OverseasMarketCode
+    ) -> AsyncIterator[tuple[OverseasMarketCode, TradeBatch]]:
+        async for page in self.iter_market_history(window, market):
+            yield market, page
+
+    async def iter_market_history(
+        self, window: HistoryWindow, market: OverseasMarketCode
+    ) -> AsyncIterator[TradeBatch]:
+        kis_request_body = get_request_template(
+            KISOverseasDailyHistoryRequest,
+            self.token_credential.account_number,
+            begin_date=PLACEHOLDER_DATE,
+            end_date=PLACEHOLDER_DATE,
+            market_code=market,
+        ).render(begin_date=window.begin_date, end_date=window.end_date)
+
+        async for kis_response in paginate(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=kis_request_body,
+            headers=self.kis_request_header,
+            response_type=KISOverseasDailyHistoryResponse,
+        ):
             if kis_response.isSuccess() is False:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail="해외 일별 거래내역 조회 실패",
+                    detail=f"해외 일별 거래내역 조회 실패 ({kis_response.msg_cd}: {kis_response.msg1})",
                 )
 
-            return DailyHistoryResponse(
-                items=[
-                    DailyHistoryDetailResponse(
-                        trade_day=item.trad_dt,
-                        sell_buy_type=item.sll_buy_dvsn_cd,
-                        ticker=item.pdno,
-                        ticker_name=item.ovrs_item_name,
-                        trade_quantity=item.ccld_qty,
-                        trade_quantity_decimal=item.amt_unit_ccld_qty,
-                        trade_price_unit=item.ft_ccld_unpr2,
-                        trade_price=item.tr_frcr_amt2,
-                        trade_fee=item.frcr_fee1,
-                        currency=item.crcy_cd,
-                    )
-                    for item in kis_response.output1
-                ],
-                total_buy_amount=kis_response.output2.frcr_buy_amt_smtl,
-                total_sell_amount=kis_response.output2.frcr_sll_amt_smtl,
-            )
+            page = TradeBatch()
+            for item in kis_response.output1 or []:
+                page.append(
+                    item.trad_dt,
+                    item.sll_buy_dvsn_cd,
+                    item.pdno,
+                    item.ovrs_item_name,
+                    item.ccld_qty,
+                    item.amt_unit_ccld_qty,
+                    item.ft_ccld_unpr2,
+                    item.tr_frcr_amt2,
+                    item.frcr_fee1,
+                    item.crcy_cd,
+                )
+            yield page
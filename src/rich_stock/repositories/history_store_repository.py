@@ -0,0 +1,348 @@
+import asyncio
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, Hashable
+
+from fastapi import Request
+
+from ..core.cache import TTLCache
+from ..core.concurrency import merge_in_order
+from ..core.settings import Settings
+from ..repositories.history_planner import HistoryWindow
+from ..repositories.history_repository import DailyHistoryRepository
+from ..repositories.trade_batch import TRADE_FIELDS, TradeBatch
+
+
+# 테이블 구조가 바뀌면 올린다. 저장된 내용은 KIS 에서 다시 받을 수 있으므로 버전이 다르면 테이블을 새로 만든다.
+SCHEMA_VERSION = 3
+TABLES = ("trade", "sync_state")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trade (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    credential_hash TEXT NOT NULL,
+    account_number TEXT NOT NULL,
+    is_real_domain INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    trade_day TEXT NOT NULL,
+    sell_buy_type INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    ticker_name TEXT NOT NULL,
+    trade_quantity INTEGER NOT NULL,
+    trade_quantity_decimal REAL NOT NULL,
+    trade_price_unit REAL NOT NULL,
+    trade_price REAL NOT NULL,
+    trade_fee REAL NOT NULL,
+    currency TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trade_account_market_day
+    ON trade (credential_hash, account_number, is_real_domain, market, trade_day);
+-- 계좌마다 서로 겹치지 않는 동기화 구간을 여러 개 둔다.
+CREATE TABLE IF NOT EXISTS sync_state (
+    credential_hash TEXT NOT NULL,
+    account_number TEXT NOT NULL,
+    is_real_domain INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    synced_from TEXT NOT NULL,
+    synced_through TEXT NOT NULL,
+    PRIMARY KEY (
+        credential_hash, account_number, is_real_domain, market, synced_from
+    )
+);
+"""
+WHERE = (
+    "WHERE credential_hash = ? AND account_number = ? AND is_real_domain = ?"
+    " AND market = ?"
+)
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+
+def create_schema(
+    connection: sqlite3.Connection,
+    name: str,
+    version: int,
+    tables: tuple[str, ...],
+    schema: str,
+) -> None:
+    # 같은 DB 파일을 여러 저장소가 나눠 쓰므로 저장소(name)마다 버전을 따로 기록한다.
+    with connection:
+        connection.executescript(SCHEMA_VERSION_TABLE)
+        row = connection.execute(
+            "SELECT version FROM schema_version WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None or row[0] != version:
+            for table in tables:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.executescript(schema)
+        connection.execute(
+            "INSERT OR REPLACE INTO schema_version VALUES (?, ?)", (name, version)
+        )
+
+
+def to_date(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def to_str(value: date) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def add_days(value: str, days: int) -> str:
+    return to_str(to_date(value) + timedelta(days=days))
+
+
+def split_segments(
+    begin_date: str, end_date: str, synced_ranges: list[tuple[str, str]]
+) -> list[tuple[str, str, bool]]:
+    # 조회기간을 (시작, 끝, 저장소에 있는지) 구간들로 나눈다. synced_ranges 는 시작일 순이다.
+    if begin_date > end_date:
+        # 잘못된 기간은 KIS 조회 쪽(iter_pages)에서 400 으로 거절하게 그대로 넘긴다.
+        return [(begin_date, end_date, False)]
+    segments = []
+    cursor = begin_date
+    for synced_from, synced_through in synced_ranges:
+        if synced_through < cursor or synced_from > end_date:
+            continue
+        local_begin = max(cursor, synced_from)
+        local_end = min(end_date, synced_through)
+        if cursor < local_begin:
+            segments.append((cursor, add_days(local_begin, -1), False))
+        segments.append((local_begin, local_end, True))
+        cursor = add_days(local_end, 1)
+    if cursor <= end_date:
+        segments.append((cursor, end_date, False))
+    return segments
+
+
+class TradeHistoryStore:
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        create_schema(self.connection, "trade", SCHEMA_VERSION, TABLES, SCHEMA)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def create(cls, settings: Settings) -> "TradeHistoryStore | None":
+        path = settings.history_store_path
+        return cls(path) if path else None
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_synced_ranges(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+    ) -> list[tuple[str, str]]:
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT synced_from, synced_through FROM sync_state {WHERE}"
+                " ORDER BY synced_from",
+                (credential_hash, account_number, is_real_domain, market),
+            ).fetchall()
+
+    def load(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        begin_date: str,
+        end_date: str,
+    ) -> TradeBatch:
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(TRADE_FIELDS)} FROM trade {WHERE}"
+                " AND trade_day BETWEEN ? AND ? ORDER BY trade_day, id",
+                (
+                    credential_hash,
+                    account_number,
+                    is_real_domain,
+                    market,
+                    begin_date,
+                    end_date,
+                ),
+            )
+            # 저장할 때 검증을 마친 값이므로 다시 검증하지 않고 컬럼에 바로 옮긴다.
+            batch = TradeBatch()
+            for row in rows:
+                batch.append(*row)
+        return batch
+
+    def save(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        begin_date: str,
+        end_date: str,
+        batch: TradeBatch,
+    ) -> None:
+        # begin_date ~ end_date 는 체결이 모두 확정된 구간이다. 구간을 통째로 교체하고,
+        # 겹치거나 맞닿은 동기화 구간과는 하나로 합친다. 떨어진 구간은 그대로 둔다.
+        key = (credential_hash, account_number, is_real_domain, market)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"DELETE FROM trade {WHERE} AND trade_day BETWEEN ? AND ?",
+                (*key, begin_date, end_date),
+            )
+            self.connection.executemany(
+                "INSERT INTO trade (credential_hash, account_number, is_real_domain,"
+                f" market, {', '.join(TRADE_FIELDS)})"
+                f" VALUES (?, ?, ?, ?, {', '.join('?' * len(TRADE_FIELDS))})",
+                ((*key, *row[:-1], row[-1].value) for row in batch.rows()),
+            )
+
+            adjacent = (*key, add_days(begin_date, -1), add_days(end_date, 1))
+            for synced_from, synced_through in self.connection.execute(
+                f"SELECT synced_from, synced_through FROM sync_state {WHERE}"
+                " AND synced_through >= ? AND synced_from <= ?",
+                adjacent,
+            ).fetchall():
+                begin_date = min(begin_date, synced_from)
+                end_date = max(end_date, synced_through)
+            self.connection.execute(
+                f"DELETE FROM sync_state {WHERE}"
+                " AND synced_through >= ? AND synced_from <= ?",
+                adjacent,
+            )
+            self.connection.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, begin_date, end_date),
+            )
+
+
+class StoredDailyHistoryRepository(DailyHistoryRepository):
+    def __init__(
+        self,
+        repository: DailyHistoryRepository,
+        store: TradeHistoryStore,
+        cache: TTLCache | None = None,
+    ):
+        self.repository = repository
+        self.store = store
+        self.cache = cache
+        self.token_credential = repository.token_credential
+        self.market = repository.market
+        self.open_days = repository.open_days
+        self.archive_days = repository.archive_days
+        # 같은 계좌번호라도 모의투자와 실전투자의 체결은 따로 저장한다.
+        # 계좌번호는 요청자가 보낸 값이므로 자격증명 해시로 함께 구분한다.
+        self.key = (
+            repository.token_credential.get_credential_hash(),
+            repository.token_credential.account_number,
+            repository.token_credential.is_real_domain,
+            repository.market,
+        )
+        # 여러 거래소를 함께 조회하면 거래소별로 저장하고, 읽을 때 다시 합친다.
+        # (전체 거래소 조회로 저장한 체결을 한 거래소 조회에서도 그대로 쓸 수 있다)
+        markets = repository.split_markets()
+        self.market_repositories = (
+            [StoredDailyHistoryRepository(market, store, cache) for market in markets]
+            if len(markets) > 1
+            else []
+        )
+
+    def iter_window_history(self, window: HistoryWindow) -> AsyncIterator[TradeBatch]:
+        return self.repository.iter_window_history(window)
+
+    async def iter_pages(
+        self, begin_date: str, end_date: str
+    ) -> AsyncIterator[TradeBatch]:
+        # 확정된 과거 일자는 로컬 저장소에서 읽고, 나머지 구간만 KIS 에서 받아온다.
+        # 합계는 base 의 iter_daily_history 가 행에서 만들므로 어느 쪽에서 읽어도 같다.
+        if self.market_repositories:
+            # 거래소 순서대로 이어 붙여서, 같은 조회는 항상 같은 순서로 돌려준다.
+            async for page in self.repository.merge_market_pages(
+                merge_in_order(
+                    (
+                        partial(
+                            self._iter_market_pages, repository, begin_date, end_date
+                        )
+                        for repository in self.market_repositories
+                    ),
+                    concurrency=len(self.market_repositories),
+                )
+            ):
+                yield page
+            return
+
+        synced_ranges = await asyncio.to_thread(self.store.get_synced_ranges, *self.key)
+        segments = split_segments(begin_date, end_date, synced_ranges)
+
+        last_closed_day = to_str(date.today() - timedelta(days=self.open_days))
+        for segment_begin, segment_end, is_local in segments:
+            if is_local:
+                yield await asyncio.to_thread(
+                    self.store.load, *self.key, segment_begin, segment_end
+                )
+            elif self.cache is not None and segment_begin > last_closed_day:
+                # 확정되지 않은 최근 구간은 저장하지 않는 대신 잠깐 캐시해서 같은 조회끼리 함께 쓴다.
+                # (장 시작 전 미리 조회가 같은 키로 채워둔다)
+                yield await self.cache.get_or_load(
+                    self.cache_key(segment_begin, segment_end),
+                    partial(self._load_upstream, segment_begin, segment_end),
+                )
+            else:
+                async for page in self._iter_upstream(
+                    segment_begin, segment_end, last_closed_day
+                ):
+                    yield page
+
+    async def _iter_market_pages(
+        self, repository: DailyHistoryRepository, begin_date: str, end_date: str
+    ) -> AsyncIterator[tuple[Hashable, TradeBatch]]:
+        async for page in repository.iter_pages(begin_date, end_date):
+            yield repository.market, page
+
+    def cache_key(self, begin_date: str, end_date: str) -> tuple:
+        return (*self.key, begin_date, end_date)
+
+    async def _load_upstream(self, begin_date: str, end_date: str) -> TradeBatch:
+        pages = [
+            page async for page in self.repository.iter_pages(begin_date, end_date)
+        ]
+        return TradeBatch.concatenate(pages, 0.0, 0.0)
+
+    async def _iter_upstream(
+        self, begin_date: str, end_date: str, last_closed_day: str
+    ) -> AsyncIterator[TradeBatch]:
+        closed = TradeBatch()
+        opened = TradeBatch()
+        async for page in self.repository.iter_pages(begin_date, end_date):
+            closed_indexes, open_indexes = [], []
+            for index, trade_day in enumerate(page.trade_day):
+                if trade_day <= last_closed_day:
+                    closed_indexes.append(index)
+                else:
+                    open_indexes.append(index)
+            closed.extend(page.select(closed_indexes))
+            opened.extend(page.select(open_indexes))
+            yield page
+
+        closed_end = min(end_date, last_closed_day)
+        if begin_date <= closed_end:
+            await asyncio.to_thread(
+                self.store.save, *self.key, begin_date, closed_end, closed
+            )
+        # 확정된 구간을 저장하고 나면 다음 조회는 마지막 확정일 다음날부터 KIS 에서 받으므로 그 키로 캐시한다.
+        if self.cache is not None and last_closed_day < end_date:
+            open_begin = max(begin_date, add_days(last_closed_day, 1))
+            self.cache.set(self.cache_key(open_begin, end_date), opened)
+
+
+def get_history_store(request: Request) -> TradeHistoryStore | None:
+    return request.app.state.history_store
+
+
+def get_history_cache(request: Request) -> TTLCache:
+    return request.app.state.history_cache
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from pydantic import BaseModel
+
+from ..entities.kis_base_entity import KISRequestBase, KISRequestHeaderBase
+from ..models.token_credential_model import TokenCredential
+
+
+# 요청마다 바뀌는 필드(조회일자 등)는 템플릿을 만들 때 이 값으로 채워두고 render 에서 덮어쓴다.
+PLACEHOLDER_DATE = "00000000"
+
+
+class KISRequestTemplate:
+    def __init__(self, request_type: type[BaseModel], **fields: Any):
+        self.params = MappingProxyType(request_type(**fields).model_dump(by_alias=True))
+        self.aliases = {
+            name: field.serialization_alias or name
+            for name, field in request_type.model_fields.items()
+        }
+
+    def render(self, **fields: str) -> dict:
+        return {
+            **self.params,
+            **{self.aliases[name]: value for name, value in fields.items()},
+        }
+
+
+@lru_cache(maxsize=4096)
+def get_request_template(
+    request_type: type[KISRequestBase], account_number: str, **fields: Any
+) -> KISRequestTemplate:
+    account_number_prefix, account_number_suffix = account_number.split("-")
+    return KISRequestTemplate(
+        request_type,
+        account_number=account_number_prefix,
+        account_code=account_number_suffix,
+        **fields,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _get_request_header(
+    authorization: str, appkey: str, appsecret: str, tr_id: str
+) -> Mapping[str, str]:
+    return MappingProxyType(
+        KISRequestHeaderBase(
+            authorization=authorization,
+            appkey=appkey,
+            appsecret=appsecret,
+            tr_id=tr_id,
+        ).model_dump()
+    )
+
+
+def get_request_header(
+    token_credential: TokenCredential, tr_id: str
+) -> Mapping[str, str]:
+    return _get_request_header(
+        f"{token_credential.token_type} {token_credential.access_token}",
+        token_credential.appkey,
+        token_credential.appsecret,
+        tr_id,
+    )
@@ -1,104 +1,182 @@
 from abc import ABC, abstractmethod
 
-import aiohttp
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 
-from ..entities.kis_base_entity import KISRequestHeaderBase
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient
+from ..core.kis_pager import paginate
+from ..core.responses import EncodedJSON
 from ..entities.kis_balance_entity import (
     KISDomesticBalanceRequest,
     KISDomesticBalanceResponse,
     KISOverseasBalanceRequest,
     KISOverseasBalanceResponse,
 )
-from ..models.my_balance_model import MyBalanceResponse
+from ..models.my_balance_model import MyBalanceHoldingResponse, MyBalanceResponse
 from ..models.token_credential_model import TokenCredential
+from ..repositories.kis_request_template import (
+    get_request_header,
+    get_request_template,
+)
 
 
 class MyBalanceRepositoryABC(ABC):
+    market: str
+    token_credential: TokenCredential
+
     @abstractmethod
     async def get_my_balance(self) -> MyBalanceResponse:
         raise NotImplementedError
 
 
 class KISDomesticBalanceRepository(MyBalanceRepositoryABC):
-    def __init__(self, token_credential: TokenCredential):
+    market = "KRX"
+
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
         tr_id = "TTTC8434R" if token_credential.is_real_domain else "VTTC8434R"
+        self.token_credential = token_credential
 
         self.url = (
             token_credential.get_domain_url()
             + "/uapi/domestic-stock/v1/trading/inquire-balance"
         )
 
-        self.kis_request_body = KISDomesticBalanceRequest(
-            account_number=token_credential.get_account_number_prefix(),
-            account_code=token_credential.get_account_number_suffix(),
-        ).model_dump(by_alias=True)
+        self.kis_request_body = get_request_template(
+            KISDomesticBalanceRequest, token_credential.account_number
+        ).params
 
-        self.kis_request_header = KISRequestHeaderBase(
-            authorization=f"{token_credential.token_type} {token_credential.access_token}",
-            appkey=token_credential.appkey,
-            appsecret=token_credential.appsecret,
-            tr_id=tr_id,
-        ).model_dump()
+        self.kis_request_header = get_request_header(token_credential, tr_id)
+        self.kis_client = kis_client
 
     async def get_my_balance(self) -> MyBalanceResponse:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.url,
-                params=self.kis_request_body,
-                headers=self.kis_request_header,
-            ) as response:
-                text = await response.text()
-
-            kis_response = KISDomesticBalanceResponse.model_validate_json(text)
-
+        my_balance = None
+        async for kis_response in paginate(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=self.kis_request_body,
+            headers=self.kis_request_header,
+            response_type=KISDomesticBalanceResponse,
+        ):
             if kis_response.isSuccess() is False:
                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="국내 잔고조회 실패"
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"국내 잔고조회 실패 ({kis_response.msg_cd}: {kis_response.msg1})",
                 )
 
-            return MyBalanceResponse(
-                deposit=kis_response.output2[0].dnca_tot_amt,
-                deposit_next_day=kis_response.output2[0].nxdy_excc_amt,
-                deposit_day_after_next=kis_response.output2[0].prvs_rcdl_excc_amt,
+            if my_balance is None:
+                summary = kis_response.output2[0] if kis_response.output2 else None
+                if summary is None:
+                    my_balance = MyBalanceResponse()
+                else:
+                    my_balance = MyBalanceResponse(
+                        deposit=summary.dnca_tot_amt,
+                        deposit_next_day=summary.nxdy_excc_amt,
+                        deposit_day_after_next=summary.prvs_rcdl_excc_amt,
+                    )
+
+            my_balance.holdings.extend(
+                MyBalanceHoldingResponse(
+                    ticker=item.pdno,
+                    ticker_name=item.prdt_name,
+                    quantity=item.hldg_qty,
+                    average_price=item.pchs_avg_pric,
+                    current_price=item.prpr,
+                    purchase_amount=item.pchs_amt,
+                    evaluation_amount=item.evlu_amt,
+                    profit_loss_amount=item.evlu_pfls_amt,
+                )
+                for item in kis_response.output1 or []
+                if item is not None
             )
 
+        return my_balance if my_balance is not None else MyBalanceResponse()
+
 
 class KISOverseasBalanceRepository(MyBalanceRepositoryABC):
-    def __init__(self, token_credential: TokenCredential):
+    market = "OVERSEAS"
+
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
         tr_id = "TTTS3012R" if token_credential.is_real_domain else "VTTS3012R"
+        self.token_credential = token_credential
 
         self.url = (
             token_credential.get_domain_url()
             + "/uapi/overseas-stock/v1/trading/inquire-balance"
         )
 
-        self.kis_request_body = KISOverseasBalanceRequest(
-            account_number=token_credential.get_account_number_prefix(),
-            account_code=token_credential.get_account_number_suffix(),
-        ).model_dump(by_alias=True)
+        self.kis_request_body = get_request_template(
+            KISOverseasBalanceRequest, token_credential.account_number
+        ).params
 
-        self.kis_request_header = KISRequestHeaderBase(
-            authorization=f"{token_credential.token_type} {token_credential.access_token}",
-            appkey=token_credential.appkey,
-            appsecret=token_credential.appsecret,
-            tr_id=tr_id,
-        ).model_dump()
+        self.kis_request_header = get_request_header(token_credential, tr_id)
+        self.kis_client = kis_client
 
     async def get_my_balance(self) -> MyBalanceResponse:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.url,
-                params=self.kis_request_body,
-                headers=self.kis_request_header,
-            ) as response:
-                text = await response.text()
-
-            kis_response = KISOverseasBalanceResponse.model_validate_json(text)
-
+        my_balance = MyBalanceResponse()
+        async for kis_response in paginate(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=self.kis_request_body,
+            headers=self.kis_request_header,
+            response_type=KISOverseasBalanceResponse,
+            search_params_alias="CTX_AREA_FK200",
+            search_key_alias="CTX_AREA_NK200",
+        ):
             if kis_response.isSuccess() is False:
                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, detail="해외 잔고조회 실패"
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"해외 잔고조회 실패 ({kis_response.msg_cd}: {kis_response.msg1})",
                 )
 
-            return None
+            my_balance.holdings.extend(
+                MyBalanceHoldingResponse(
+                    ticker=item.ovrs_pdno,
+                    ticker_name=item.ovrs_item_name,
+                    quantity=item.ovrs_cblc_qty,
+                    average_price=item.pchs_avg_pric,
+                    current_price=item.now_pric2,
+                    purchase_amount=item.frcr_pchs_amt1,
+                    evaluation_amount=item.ovrs_stck_evlu_amt,
+                    profit_loss_amount=item.frcr_evlu_pfls_amt,
+                )
+                for item in kis_response.output1 or []
+                if item is not None
+            )
+
+        return my_balance
+
+
+class CachedMyBalanceRepository(MyBalanceRepositoryABC):
+    def __init__(self, repository: MyBalanceRepositoryABC, cache: TTLCache):
+        self.repository = repository
+        self.cache = cache
+        self.market = repository.market
+        self.token_credential = repository.token_credential
+
+    def cache_key(self) -> tuple[str, str, bool, str]:
+        return (
+            self.token_credential.get_credential_hash(),
+            self.token_credential.account_number,
+            self.token_credential.is_real_domain,
+            self.market,
+        )
+
+    async def get_my_balance(self) -> MyBalanceResponse:
+        return await self.cache.get_or_load(
+            self.cache_key(), self.repository.get_my_balance
+        )
+
+    async def get_encoded_balance(self) -> EncodedJSON:
+        balance = await self.get_my_balance()
+        return self.cache.encode(self.cache_key(), balance, EncodedJSON.from_content)
+
+    async def refresh(self) -> MyBalanceResponse:
+        return await self.cache.refresh(
+            self.cache_key(), self.repository.get_my_balance
+        )
+
+
+def get_balance_cache(request: Request) -> TTLCache:
+    return request.app.state.balance_cache
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Awaitable, TypeVar
+
+from fastapi import Request
+from pydantic import TypeAdapter
+
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient
+from ..core.metrics import prefetch_requests
+from ..core.settings import Settings
+from ..models.token_credential_model import TokenCredential
+from ..models.token_model import TokenIssueRequest
+from ..repositories.history_repository import (
+    KISDomesticDailyHistoryRepository,
+    KISOverseasDailyHistoryRepository,
+)
+from ..repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+    to_date,
+    to_str,
+)
+from ..repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
+    KISDomesticBalanceRepository,
+    KISOverseasBalanceRepository,
+)
+from ..repositories.token_repository import CachedKISTokenRepository, KISTokenCache
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BALANCE_REPOSITORIES = {
+    "kr": KISDomesticBalanceRepository,
+    "overseas": KISOverseasBalanceRepository,
+}
+HISTORY_REPOSITORIES = {
+    "kr": KISDomesticDailyHistoryRepository,
+    "overseas": KISOverseasDailyHistoryRepository,
+}
+
+
+def parse_times(value: str) -> list[time]:
+    return sorted(
+        time.fromisoformat(item.strip()) for item in value.split(",") if item.strip()
+    )
+
+
+def next_run_at(now: datetime, times: list[time]) -> datetime:
+    for at in times:
+        run_at = datetime.combine(now.date(), at)
+        if run_at > now:
+            return run_at
+    return datetime.combine(now.date() + timedelta(days=1), times[0])
+
+
+class PrefetchScheduler:
+    def __init__(
+        self,
+        kis_client: KISClient,
+        token_cache: KISTokenCache,
+        balance_cache: TTLCache,
+        history_store: TradeHistoryStore | None,
+        history_cache: TTLCache,
+        accounts: list[TokenIssueRequest],
+        schedules: dict[str, list[time]],
+        duration: float,
+        interval: float,
+        history_days: int,
+        concurrency: int,
+    ):
+        self.kis_client = kis_client
+        self.token_cache = token_cache
+        self.balance_cache = balance_cache
+        self.history_store = history_store
+        self.history_cache = history_cache
+        self.accounts = accounts
+        self.schedules = schedules
+        self.duration = duration
+        self.interval = interval
+        self.history_days = history_days
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tasks: list[asyncio.Task] = []
+        self.next_run_at: dict[str, datetime] = {}
+        self.last_run_at: dict[str, datetime] = {}
+        self.runs = dict.fromkeys(schedules, 0)
+
+    @classmethod
+    def create(
+        cls,
+        settings: Settings,
+        kis_client: KISClient,
+        token_cache: KISTokenCache,
+        balance_cache: TTLCache,
+        history_store: TradeHistoryStore | None,
+        history_cache: TTLCache,
+    ) -> "PrefetchScheduler | None":
+        if not settings.prefetch_accounts_path:
+            return None
+        with open(settings.prefetch_accounts_path, "rb") as f:
+            accounts = TypeAdapter(list[TokenIssueRequest]).validate_json(f.read())
+        return cls(
+            kis_client,
+            token_cache,
+            balance_cache,
+            history_store,
+            history_cache,
+            accounts,
+            schedules={
+                "kr": parse_times(settings.prefetch_kr_times),
+                "overseas": parse_times(settings.prefetch_overseas_times),
+            },
+            duration=settings.prefetch_duration,
+            interval=settings.prefetch_interval,
+            history_days=settings.prefetch_history_days,
+            concurrency=settings.prefetch_concurrency,
+        )
+
+    def start(self) -> None:
+        self.tasks = [
+            asyncio.create_task(self.run(market, times))
+            for market, times in self.schedules.items()
+            if times and self.accounts
+        ]
+
+    async def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def run(self, market: str, times: list[time]) -> None:
+        while True:
+            run_at = next_run_at(datetime.now(), times)
+            self.next_run_at[market] = run_at
+            await asyncio.sleep(max((run_at - datetime.now()).total_seconds(), 0))
+            # 주말에는 국내/미국 장이 모두 열리지 않는다. (한국시간 기준)
+            if run_at.weekday() >= 5:
+                continue
+            self.runs[market] += 1
+            self.last_run_at[market] = run_at
+            await self.prefetch(market, run_at + timedelta(seconds=self.duration))
+
+    async def prefetch(self, market: str, until: datetime) -> None:
+        credentials = [
+            credential
+            for credential in await asyncio.gather(
+                *(
+                    self.guard(market, "token", self.get_credential(account))
+                    for account in self.accounts
+                )
+            )
+            if credential is not None
+        ]
+
+        # 거래내역은 장 시작 전에 한 번만 저장소를 마지막 확정일까지 맞춰둔다.
+        if self.history_store is not None:
+            await asyncio.gather(
+                *(
+                    self.guard(
+                        market,
+                        "history",
+                        self.sync_history(market, credential, self.history_store),
+                    )
+                    for credential in credentials
+                )
+            )
+
+        # 잔고는 장 초반 동안 캐시가 만료되기 전에 계속 새로 채운다.
+        while True:
+            await asyncio.gather(
+                *(
+                    self.guard(
+                        market, "balance", self.refresh_balance(market, credential)
+                    )
+                    for credential in credentials
+                )
+            )
+            if datetime.now() + timedelta(seconds=self.interval) >= until:
+                break
+            await asyncio.sleep(self.interval)
+
+    async def guard(self, market: str, kind: str, call: Awaitable[T]) -> T | None:
+        async with self.semaphore:
+            try:
+                result = await call
+            except Exception as e:
+                logger.warning("prefetch %s %s failed: %r", market, kind, e)
+                prefetch_requests.inc(market, kind, "error")
+                return None
+        prefetch_requests.inc(market, kind, "ok" if result is not False else "skipped")
+        return result
+
+    async def get_credential(self, account: TokenIssueRequest) -> TokenCredential:
+        kis_token_response = await CachedKISTokenRepository(
+            self.kis_client, self.token_cache
+        ).issue_token(account)
+        return TokenCredential.from_model(
+            token_issue_request=account, kis_token_response=kis_token_response
+        )
+
+    async def sync_history(
+        self,
+        market: str,
+        credential: TokenCredential,
+        history_store: TradeHistoryStore,
+    ) -> None:
+        # 조회 API 와 같은 저장소를 거치므로, 채워두는 항목도 자격증명 해시로 구분된 같은 키를 쓴다.
+        repository = StoredDailyHistoryRepository(
+            HISTORY_REPOSITORIES[market](credential, self.kis_client),
+            history_store,
+            self.history_cache,
+        )
+        # 여러 거래소를 함께 조회하는 저장소는 거래소별로 저장되므로 거래소마다 맞춘다.
+        await asyncio.gather(
+            *(
+                self.sync_market_history(market_repository, history_store)
+                for market_repository in repository.market_repositories or [repository]
+            )
+        )
+
+    async def sync_market_history(
+        self, repository: StoredDailyHistoryRepository, history_store: TradeHistoryStore
+    ) -> None:
+        synced_ranges = await asyncio.to_thread(
+            history_store.get_synced_ranges, *repository.key
+        )
+        today = date.today()
+        if synced_ranges:
+            begin_date = to_date(synced_ranges[-1][1]) + timedelta(days=1)
+        else:
+            begin_date = today - timedelta(days=self.history_days)
+        # 확정된 일자는 저장소에, 최근 구간은 조회 API 가 읽는 거래내역 캐시에 들어간다.
+        async for _ in repository.iter_pages(to_str(begin_date), to_str(today)):
+            pass
+
+    async def refresh_balance(self, market: str, credential: TokenCredential) -> bool:
+        # 사용자 요청이 유량제한에 걸려 기다리는 중이면 미리 조회는 양보한다.
+        # (그 요청이 끝나면 같은 캐시가 채워진다)
+        lane = self.kis_client.scheduler.get_lane(
+            credential.appkey, credential.is_real_domain
+        )
+        if lane.queue_depth():
+            return False
+        repository = CachedMyBalanceRepository(
+            BALANCE_REPOSITORIES[market](credential, self.kis_client),
+            self.balance_cache,
+        )
+        await repository.refresh()
+        return True
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "market": market,
+                "accounts": len(self.accounts),
+                "schedule": [at.strftime("%H:%M") for at in times],
+                "next_run_at": (
+                    self.next_run_at[market].isoformat(timespec="seconds")
+                    if market in self.next_run_at
+                    else None
+                ),
+                "last_run_at": (
+                    self.last_run_at[market].isoformat(timespec="seconds")
+                    if market in self.last_run_at
+                    else None
+                ),
+                "runs": self.runs[market],
+            }
+            for market, times in self.schedules.items()
+        ]
+
+
+def get_prefetch_scheduler(request: Request) -> PrefetchScheduler | None:
+    return request.app.state.prefetch_scheduler
@@ -0,0 +1,449 @@
+import asyncio
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from typing import Iterable
+
+from fastapi import HTTPException, Request, status
+
+from ..models.enums import CurrencyCode, LotMatchingMethod, SellBuyType
+from ..models.profit_loss_model import (
+    RealizedProfitLossDetailResponse,
+    RealizedProfitLossResponse,
+    UnrealizedProfitLossDetailResponse,
+    UnrealizedProfitLossResponse,
+)
+from ..repositories.history_repository import DailyHistoryRepository
+from ..repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+    create_schema,
+    to_date,
+    to_str,
+)
+from ..repositories.my_balance_repository import MyBalanceRepositoryABC
+from ..repositories.trade_batch import TradeRow
+
+
+# 버전이 다르면 lot 상태를 처음부터 다시 쌓는다.
+# 2: 체결금액 기준으로 원가를 다시 계산, 3: 자격증명(appkey/appsecret) 해시로 계좌를 구분
+SCHEMA_VERSION = 3
+TABLES = ("lot_position", "lot", "lot_checkpoint")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lot_position (
+    credential_hash TEXT NOT NULL,
+    account_number TEXT NOT NULL,
+    is_real_domain INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    method TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    ticker_name TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    sold_quantity REAL NOT NULL,
+    proceeds_amount REAL NOT NULL,
+    cost_amount REAL NOT NULL,
+    unmatched_quantity REAL NOT NULL,
+    PRIMARY KEY (
+        credential_hash, account_number, is_real_domain, market, method, ticker
+    )
+);
+CREATE TABLE IF NOT EXISTS lot (
+    credential_hash TEXT NOT NULL,
+    account_number TEXT NOT NULL,
+    is_real_domain INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    method TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    trade_day TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    unit_cost REAL NOT NULL,
+    PRIMARY KEY (
+        credential_hash, account_number, is_real_domain, market, method, ticker, seq
+    )
+);
+CREATE TABLE IF NOT EXISTS lot_checkpoint (
+    credential_hash TEXT NOT NULL,
+    account_number TEXT NOT NULL,
+    is_real_domain INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    method TEXT NOT NULL,
+    processed_from TEXT NOT NULL,
+    processed_through TEXT NOT NULL,
+    PRIMARY KEY (credential_hash, account_number, is_real_domain, market, method)
+);
+"""
+
+WHERE = (
+    "WHERE credential_hash = ? AND account_number = ? AND is_real_domain = ?"
+    " AND market = ? AND method = ?"
+)
+
+# 소수점 수량을 빼고 남는 부동소수 오차는 0 으로 본다.
+QUANTITY_EPSILON = 1e-9
+
+# SQLite 의 바인딩 변수 개수 제한보다 작게 나눠서 조회한다.
+TICKER_CHUNK_SIZE = 500
+
+
+class Position:
+    def __init__(
+        self,
+        ticker: str,
+        ticker_name: str,
+        currency: CurrencyCode,
+        sold_quantity: float = 0.0,
+        proceeds_amount: float = 0.0,
+        cost_amount: float = 0.0,
+        unmatched_quantity: float = 0.0,
+    ):
+        self.ticker = ticker
+        self.ticker_name = ticker_name
+        self.currency = currency
+        self.sold_quantity = sold_quantity
+        self.proceeds_amount = proceeds_amount
+        self.cost_amount = cost_amount
+        self.unmatched_quantity = unmatched_quantity
+        # [매수 일자, 남은 수량, 단위 취득원가] 를 매수 순서대로 들고 있는다.
+        self.lots: deque[list] = deque()
+
+    @property
+    def quantity(self) -> float:
+        return sum(lot[1] for lot in self.lots)
+
+    @property
+    def open_cost_amount(self) -> float:
+        return sum(lot[1] * lot[2] for lot in self.lots)
+
+    def apply(self, item: TradeRow, method: LotMatchingMethod):
+        quantity = item.trade_quantity_decimal or float(item.trade_quantity)
+        if quantity <= 0:
+            return
+
+        self.ticker_name = item.ticker_name
+        self.currency = item.currency
+        # trade_price_unit 은 국내의 경우 주문단가라서(시장가 주문이면 0) 체결금액을 쓴다.
+        amount = item.trade_price
+        if item.sell_buy_type == SellBuyType.BUY:
+            self.buy(item.trade_day, quantity, amount + item.trade_fee, method)
+        elif item.sell_buy_type == SellBuyType.SELL:
+            self.sell(quantity, amount - item.trade_fee)
+
+    def buy(
+        self,
+        trade_day: str,
+        quantity: float,
+        amount: float,
+        method: LotMatchingMethod,
+    ) -> None:
+        if method == LotMatchingMethod.AVERAGE and self.lots:
+            # 평균단가 방식은 lot 하나에 수량과 평균단가를 합쳐서 들고 있는다.
+            lot = self.lots[0]
+            held_amount = lot[1] * lot[2]
+            lot[1] += quantity
+            lot[2] = (held_amount + amount) / lot[1]
+        else:
+            self.lots.append([trade_day, quantity, amount / quantity])
+
+    def sell(self, quantity: float, amount: float) -> None:
+        remaining = quantity
+        cost_amount = 0.0
+        while remaining > QUANTITY_EPSILON and self.lots:
+            lot = self.lots[0]
+            matched = min(lot[1], remaining)
+            cost_amount += matched * lot[2]
+            lot[1] -= matched
+            remaining -= matched
+            if lot[1] <= QUANTITY_EPSILON:
+                self.lots.popleft()
+
+        # 매칭된 수량만큼의 매도금액만 실현손익에 반영한다.
+        matched_quantity = quantity - max(remaining, 0.0)
+        self.sold_quantity += matched_quantity
+        self.proceeds_amount += amount * matched_quantity / quantity
+        self.cost_amount += cost_amount
+        if remaining > QUANTITY_EPSILON:
+            self.unmatched_quantity += remaining
+
+
+class LotStore:
+    def __init__(self, history_store: TradeHistoryStore):
+        # 체결 내역과 같은 DB 파일에 lot 상태를 둔다.
+        self.history_store = history_store
+        self.connection = history_store.connection
+        self.lock = history_store.lock
+        with self.lock:
+            create_schema(self.connection, "lot", SCHEMA_VERSION, TABLES, SCHEMA)
+        self.update_locks: defaultdict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @classmethod
+    def create(cls, history_store: TradeHistoryStore | None) -> "LotStore | None":
+        return cls(history_store) if history_store is not None else None
+
+    def get_checkpoint(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        method: LotMatchingMethod,
+    ) -> tuple[str, str] | None:
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT processed_from, processed_through FROM lot_checkpoint {WHERE}",
+                (credential_hash, account_number, is_real_domain, market, method.value),
+            ).fetchone()
+
+    def reset(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        method: LotMatchingMethod,
+    ) -> None:
+        with self.lock, self.connection:
+            for table in TABLES:
+                self.connection.execute(
+                    f"DELETE FROM {table} {WHERE}",
+                    (
+                        credential_hash,
+                        account_number,
+                        is_real_domain,
+                        market,
+                        method.value,
+                    ),
+                )
+
+    def load_positions(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        method: LotMatchingMethod,
+        tickers: Iterable[str] | None = None,
+    ) -> dict[str, Position]:
+        key = (credential_hash, account_number, is_real_domain, market, method.value)
+        chunks: list[tuple[list[str], str]]
+        if tickers is None:
+            chunks = [([], "")]
+        else:
+            sorted_tickers = sorted(tickers)
+            chunks = [
+                (chunk, f" AND ticker IN ({', '.join('?' * len(chunk))})")
+                for chunk in (
+                    sorted_tickers[i : i + TICKER_CHUNK_SIZE]
+                    for i in range(0, len(sorted_tickers), TICKER_CHUNK_SIZE)
+                )
+            ]
+
+        positions = {}
+        with self.lock:
+            for chunk, ticker_filter in chunks:
+                for row in self.connection.execute(
+                    "SELECT ticker, ticker_name, currency, sold_quantity,"
+                    " proceeds_amount, cost_amount, unmatched_quantity"
+                    f" FROM lot_position {WHERE}{ticker_filter}",
+                    (*key, *chunk),
+                ):
+                    positions[row[0]] = Position(
+                        row[0], row[1], CurrencyCode(row[2]), *row[3:]
+                    )
+                for ticker, trade_day, quantity, unit_cost in self.connection.execute(
+                    "SELECT ticker, trade_day, quantity, unit_cost"
+                    f" FROM lot {WHERE}{ticker_filter} ORDER BY ticker, seq",
+                    (*key, *chunk),
+                ):
+                    positions[ticker].lots.append([trade_day, quantity, unit_cost])
+        return positions
+
+    def save_positions(
+        self,
+        credential_hash: str,
+        account_number: str,
+        is_real_domain: bool,
+        market: str,
+        method: LotMatchingMethod,
+        positions: dict[str, Position],
+        processed_from: str,
+        processed_through: str,
+    ) -> None:
+        key = (credential_hash, account_number, is_real_domain, market, method.value)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO lot_position"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        *key,
+                        position.ticker,
+                        position.ticker_name,
+                        CurrencyCode(position.currency).value,
+                        position.sold_quantity,
+                        position.proceeds_amount,
+                        position.cost_amount,
+                        position.unmatched_quantity,
+                    )
+                    for position in positions.values()
+                ),
+            )
+            self.connection.executemany(
+                f"DELETE FROM lot {WHERE} AND ticker = ?",
+                ((*key, ticker) for ticker in positions),
+            )
+            self.connection.executemany(
+                "INSERT INTO lot VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (*key, position.ticker, seq, *lot)
+                    for position in positions.values()
+                    for seq, lot in enumerate(position.lots)
+                ),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO lot_checkpoint VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, processed_from, processed_through),
+            )
+
+
+class ProfitLossRepository:
+    def __init__(
+        self,
+        history_repository: DailyHistoryRepository,
+        lot_store: LotStore,
+        method: LotMatchingMethod,
+    ):
+        self.history_repository = StoredDailyHistoryRepository(
+            history_repository, lot_store.history_store
+        )
+        self.open_days = history_repository.open_days
+        self.lot_store = lot_store
+        self.method = method
+        # 거래내역 저장소와 같은 (자격증명 해시, 계좌, 도메인, 시장) 에 매칭 방식을 더한다.
+        self.key = (*self.history_repository.key, method)
+
+    async def update(self, begin_date: str | None) -> str:
+        # 체크포인트 이후에 확정된 체결만 받아서 lot 상태에 반영한다.
+        key = self.key
+        async with self.lot_store.update_locks[key]:
+            checkpoint = await asyncio.to_thread(self.lot_store.get_checkpoint, *key)
+            if checkpoint is not None and begin_date and begin_date < checkpoint[0]:
+                # 더 이전부터 다시 계산해 달라는 요청이면 처음부터 다시 쌓는다.
+                await asyncio.to_thread(self.lot_store.reset, *key)
+                checkpoint = None
+
+            if checkpoint is None:
+                if not begin_date:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="처음 계산할 때는 조회 시작 날짜가 필요합니다.",
+                    )
+                processed_from = begin_date
+                processed_through = to_str(to_date(begin_date) - timedelta(days=1))
+            else:
+                processed_from, processed_through = checkpoint
+
+            begin_date = to_str(to_date(processed_through) + timedelta(days=1))
+            end_date = to_str(date.today() - timedelta(days=self.open_days))
+            if begin_date > end_date:
+                return processed_through
+
+            batch = await self.history_repository.get_daily_history(
+                begin_date, end_date
+            )
+            positions = await asyncio.to_thread(
+                self.lot_store.load_positions,
+                *key,
+                set(batch.ticker),
+            )
+            for item in batch:
+                position = positions.get(item.ticker)
+                if position is None:
+                    position = positions[item.ticker] = Position(
+                        item.ticker, item.ticker_name, item.currency
+                    )
+                position.apply(item, self.method)
+
+            await asyncio.to_thread(
+                self.lot_store.save_positions,
+                *key,
+                positions,
+                processed_from,
+                end_date,
+            )
+            return end_date
+
+    async def get_realized_profit_loss(
+        self, begin_date: str | None
+    ) -> RealizedProfitLossResponse:
+        processed_through = await self.update(begin_date)
+        positions = await asyncio.to_thread(self.lot_store.load_positions, *self.key)
+        return RealizedProfitLossResponse.model_construct(
+            processed_through=processed_through,
+            items=[
+                RealizedProfitLossDetailResponse.model_construct(
+                    ticker=position.ticker,
+                    ticker_name=position.ticker_name,
+                    currency=position.currency,
+                    sold_quantity=position.sold_quantity,
+                    proceeds_amount=position.proceeds_amount,
+                    cost_amount=position.cost_amount,
+                    realized_amount=position.proceeds_amount - position.cost_amount,
+                    unmatched_quantity=position.unmatched_quantity,
+                )
+                for position in positions.values()
+                if position.sold_quantity > 0 or position.unmatched_quantity > 0
+            ],
+        )
+
+    async def get_unrealized_profit_loss(
+        self, begin_date: str | None, balance_repository: MyBalanceRepositoryABC
+    ) -> UnrealizedProfitLossResponse:
+        processed_through, my_balance = await asyncio.gather(
+            self.update(begin_date), balance_repository.get_my_balance()
+        )
+        positions = await asyncio.to_thread(self.lot_store.load_positions, *self.key)
+        current_prices = {
+            holding.ticker: holding.current_price for holding in my_balance.holdings
+        }
+
+        items = []
+        for position in positions.values():
+            quantity = position.quantity
+            if quantity <= QUANTITY_EPSILON:
+                continue
+            cost_amount = position.open_cost_amount
+            current_price = current_prices.get(position.ticker)
+            evaluation_amount = (
+                None if current_price is None else current_price * quantity
+            )
+            items.append(
+                UnrealizedProfitLossDetailResponse.model_construct(
+                    ticker=position.ticker,
+                    ticker_name=position.ticker_name,
+                    currency=position.currency,
+                    quantity=quantity,
+                    average_cost=cost_amount / quantity,
+                    cost_amount=cost_amount,
+                    current_price=current_price,
+                    evaluation_amount=evaluation_amount,
+                    unrealized_amount=(
+                        None
+                        if evaluation_amount is None
+                        else evaluation_amount - cost_amount
+                    ),
+                )
+            )
+
+        return UnrealizedProfitLossResponse.model_construct(
+            processed_through=processed_through, items=items
+        )
+
+
+def get_lot_store(request: Request) -> LotStore:
+    lot_store = request.app.state.lot_store
+    if lot_store is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="거래내역 저장소가 설정되지 않아 손익을 계산할 수 없습니다.",
+        )
+    return lot_store
@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from typing import NoReturn
+
+from fastapi import HTTPException, Request, status
+
+from ..core.cache import TTLCache
+from ..core.kis_client import KISClient
+from ..core.kis_pager import fetch_once
+from ..entities.kis_base_entity import KISResponseBase
+from ..entities.kis_quote_entity import (
+    KISDomesticQuoteRequest,
+    KISDomesticQuoteResponse,
+    KISOverseasQuoteRequest,
+    KISOverseasQuoteResponse,
+)
+from ..models.enums import CurrencyCode, OverseasMarketCode
+from ..models.quote_model import QuoteResponse
+from ..models.token_credential_model import TokenCredential
+from ..repositories.kis_request_template import KISRequestTemplate, get_request_header
+
+
+DOMESTIC_QUOTE_TEMPLATE = KISRequestTemplate(KISDomesticQuoteRequest, ticker="")
+OVERSEAS_QUOTE_TEMPLATE = KISRequestTemplate(
+    KISOverseasQuoteRequest, exchange_code="", ticker=""
+)
+
+# 시세조회(HHDFS00000300)는 주문/잔고 API 와 다른 거래소코드를 쓴다.
+OVERSEAS_QUOTE_EXCHANGE_CODES = {
+    OverseasMarketCode.Nasdaq: "NAS",
+    OverseasMarketCode.NYSE: "NYS",
+    OverseasMarketCode.AMEX: "AMS",
+}
+OVERSEAS_QUOTE_CURRENCIES = {
+    OverseasMarketCode.Nasdaq: CurrencyCode.USD,
+    OverseasMarketCode.NYSE: CurrencyCode.USD,
+    OverseasMarketCode.AMEX: CurrencyCode.USD,
+}
+
+# 초당 거래건수 초과
+RATE_LIMIT_MSG_CD = "EGW00201"
+
+
+def raise_quote_error(kis_response: KISResponseBase, detail: str) -> NoReturn:
+    # 없는 종목만 404 이고, KIS 가 거절한 요청은 유량제한(429)과 나머지(502)로 나눈다.
+    if kis_response.msg_cd == RATE_LIMIT_MSG_CD:
+        status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    else:
+        status_code = status.HTTP_502_BAD_GATEWAY
+    raise HTTPException(
+        status_code=status_code,
+        detail=f"{detail} ({kis_response.msg_cd}: {kis_response.msg1})",
+    )
+
+
+class QuoteRepositoryABC(ABC):
+    market: str
+    token_credential: TokenCredential
+
+    @abstractmethod
+    async def get_quote(self, ticker: str) -> QuoteResponse:
+        raise NotImplementedError
+
+
+class KISDomesticQuoteRepository(QuoteRepositoryABC):
+    market = "KRX"
+
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
+        self.token_credential = token_credential
+        self.url = (
+            token_credential.get_domain_url()
+            + "/uapi/domestic-stock/v1/quotations/inquire-price"
+        )
+        self.kis_request_header = get_request_header(token_credential, "FHKST01010100")
+        self.kis_client = kis_client
+
+    async def get_quote(self, ticker: str) -> QuoteResponse:
+        kis_response = await fetch_once(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=DOMESTIC_QUOTE_TEMPLATE.render(ticker=ticker),
+            headers=self.kis_request_header,
+            response_type=KISDomesticQuoteResponse,
+        )
+        if kis_response.isSuccess() is False:
+            raise_quote_error(kis_response, f"국내 시세조회 실패 ({ticker})")
+        # 없는 종목은 성공으로 오고 현재가가 비어 있거나 0 이다.
+        if kis_response.output is None or not kis_response.output.stck_prpr:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"국내 종목을 찾을 수 없습니다. ({ticker})",
+            )
+
+        output = kis_response.output
+        return QuoteResponse.model_construct(
+            ticker=ticker,
+            market=self.market,
+            currency=CurrencyCode.KRW,
+            current_price=output.stck_prpr,
+            change=output.prdy_vrss,
+            change_rate=output.prdy_ctrt,
+            volume=output.acml_vol,
+            trade_amount=output.acml_tr_pbmn,
+        )
+
+
+class KISOverseasQuoteRepository(QuoteRepositoryABC):
+    def __init__(
+        self,
+        token_credential: TokenCredential,
+        kis_client: KISClient,
+        market: OverseasMarketCode,
+    ):
+        self.market = market.value
+        self.currency = OVERSEAS_QUOTE_CURRENCIES[market]
+        self.exchange_code = OVERSEAS_QUOTE_EXCHANGE_CODES[market]
+        self.token_credential = token_credential
+        self.url = (
+            token_credential.get_domain_url()
+            + "/uapi/overseas-price/v1/quotations/price"
+        )
+        self.kis_request_header = get_request_header(token_credential, "HHDFS00000300")
+        self.kis_client = kis_client
+
+    async def get_quote(self, ticker: str) -> QuoteResponse:
+        kis_response = await fetch_once(
+            self.kis_client,
+            self.token_credential,
+            self.url,
+            params=OVERSEAS_QUOTE_TEMPLATE.render(
+                exchange_code=self.exchange_code, ticker=ticker
+            ),
+            headers=self.kis_request_header,
+            response_type=KISOverseasQuoteResponse,
+        )
+        if kis_response.isSuccess() is False:
+            raise_quote_error(
+                kis_response, f"해외 시세조회 실패 ({self.market} {ticker})"
+            )
+        # 없는 종목도 성공(rt_cd 0)으로 오고 현재가만 비어 있다.
+        if kis_response.output is None or kis_response.output.last is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"해외 종목을 찾을 수 없습니다. ({self.market} {ticker})",
+            )
+
+        output = kis_response.output
+        return QuoteResponse.model_construct(
+            ticker=ticker,
+            market=self.market,
+            currency=self.currency,
+            current_price=output.last,
+            change=output.diff or 0.0,
+            change_rate=output.rate or 0.0,
+            volume=output.tvol or 0,
+            trade_amount=output.tamt or 0.0,
+        )
+
+
+class CachedQuoteRepository(QuoteRepositoryABC):
+    def __init__(self, repository: QuoteRepositoryABC, cache: TTLCache):
+        self.repository = repository
+        self.cache = cache
+        self.market = repository.market
+        self.token_credential = repository.token_credential
+
+    def cache_key(self, ticker: str) -> tuple[bool, str, str]:
+        # 시세는 계좌와 상관없으므로 도메인/시장/종목이 같으면 모든 사용자가 함께 쓴다.
+        return (self.token_credential.is_real_domain, self.market, ticker)
+
+    async def get_quote(self, ticker: str) -> QuoteResponse:
+        return await self.cache.get_or_load(
+            self.cache_key(ticker), lambda: self.repository.get_quote(ticker)
+        )
+
+
+def get_quote_cache(request: Request) -> TTLCache:
+    return request.app.state.quote_cache
@@ -0,0 +1,318 @@
+import asyncio
+import json
+import logging
+import random
+
+import aiohttp
+from fastapi import HTTPException, status
+from fastapi.requests import HTTPConnection
+
+from ..core.kis_client import KISClient
+from ..core.metrics import (
+    realtime_dropped_subscribers,
+    realtime_invalid_messages,
+    realtime_messages,
+    realtime_subscribers,
+    realtime_upstream_feeds,
+)
+from ..core.settings import Settings, get_settings
+from ..entities.kis_realtime_entity import (
+    KISApprovalRequest,
+    KISApprovalResponse,
+    KISRealtimeRequest,
+    KISRealtimeRequestBody,
+    KISRealtimeRequestHeader,
+    KISRealtimeRequestInput,
+)
+from ..models.token_model import TokenIssueRequest
+
+
+logger = logging.getLogger(__name__)
+
+# (tr_id, tr_key)
+Channel = tuple[str, str]
+
+
+class RealtimeSubscriber:
+    def __init__(self, feed: "KISRealtimeFeed", queue_size: int):
+        self.feed = feed
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(queue_size)
+        self.channels: set[Channel] = set()
+        self.dropped = False
+
+    def send(self, message: str) -> None:
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.drop()
+
+    def drop(self) -> None:
+        # 느린 클라이언트 하나 때문에 KIS 수신과 다른 구독자가 밀리지 않도록, 버퍼가 넘치면 끊는다.
+        self.dropped = True
+        realtime_dropped_subscribers.inc()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class KISRealtimeFeed:
+    def __init__(
+        self,
+        kis_client: KISClient,
+        token_issue_request: TokenIssueRequest,
+        url: str,
+        max_channels: int,
+    ):
+        self.kis_client = kis_client
+        self.token_issue_request = token_issue_request
+        self.url = url
+        self.max_channels = max_channels
+        self.subscribers: dict[Channel, set[RealtimeSubscriber]] = {}
+        self.clients = 0
+        self.approval_key: str | None = None
+        self.websocket: aiohttp.ClientWebSocketResponse | None = None
+        self.task: asyncio.Task | None = None
+        self.messages = 0
+        self.reconnects = 0
+
+    async def subscribe(self, subscriber: RealtimeSubscriber, channel: Channel) -> None:
+        subscribers = self.subscribers.get(channel)
+        if subscribers is None:
+            # KIS 는 웹소켓 세션 하나에 등록할 수 있는 구독 수를 제한한다.
+            if len(self.subscribers) >= self.max_channels:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"실시간 구독은 {self.max_channels}개까지 가능합니다.",
+                )
+            subscribers = self.subscribers[channel] = set()
+            await self.send_request(channel, "1")
+        subscribers.add(subscriber)
+        subscriber.channels.add(channel)
+
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def unsubscribe(
+        self, subscriber: RealtimeSubscriber, channel: Channel
+    ) -> None:
+        subscriber.channels.discard(channel)
+        subscribers = self.subscribers.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[channel]
+            await self.send_request(channel, "2")
+
+    async def send_request(self, channel: Channel, tr_type: str) -> None:
+        # 연결 전이거나 끊긴 상태면 run 에서 (재)연결할 때 현재 구독을 모두 다시 등록한다.
+        if self.websocket is None or self.websocket.closed or not self.approval_key:
+            return
+        tr_id, tr_key = channel
+        kis_request = KISRealtimeRequest(
+            header=KISRealtimeRequestHeader(
+                approval_key=self.approval_key, tr_type=tr_type
+            ),
+            body=KISRealtimeRequestBody(
+                input=KISRealtimeRequestInput(tr_id=tr_id, tr_key=tr_key)
+            ),
+        )
+        try:
+            await self.websocket.send_str(kis_request.model_dump_json(by_alias=True))
+        except ConnectionError as e:
+            logger.warning("KIS realtime request failed for %s: %s", channel, e)
+
+    async def issue_approval_key(self) -> str:
+        url = self.token_issue_request.get_domain_url() + "/oauth2/Approval"
+        kis_request = KISApprovalRequest(
+            appkey=self.token_issue_request.appkey,
+            secretkey=self.token_issue_request.appsecret,
+        )
+        body = await self.kis_client.post(url, data=kis_request.model_dump_json())
+        return KISApprovalResponse.model_validate_json(body).approval_key
+
+    async def run(self) -> None:
+        try:
+            await self.connect_forever()
+        finally:
+            # 어떤 이유로든 끝나면 다음 구독 때 새로 시작하도록 비워둔다.
+            if self.task is asyncio.current_task():
+                self.task = None
+
+    async def connect_forever(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                if self.approval_key is None:
+                    self.approval_key = await self.issue_approval_key()
+                async with self.kis_client.session.ws_connect(self.url) as websocket:
+                    self.websocket = websocket
+                    realtime_upstream_feeds.inc()
+                    attempt = 0
+                    try:
+                        for channel in list(self.subscribers):
+                            await self.send_request(channel, "1")
+                        async for message in websocket:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                await self.handle(message.data)
+                    finally:
+                        self.websocket = None
+                        realtime_upstream_feeds.dec()
+            except aiohttp.WSServerHandshakeError as e:
+                # 접속키가 만료되었을 수 있으므로 다음 연결에서 새로 발급받는다.
+                logger.warning("KIS realtime handshake failed: %s", e)
+                self.approval_key = None
+            except (aiohttp.ClientError, TimeoutError, ValueError) as e:
+                logger.warning("KIS realtime feed failed: %s", e)
+            except Exception:
+                # 예상하지 못한 오류로 구독자 전체가 끊기지 않도록 다시 연결한다.
+                logger.exception("KIS realtime feed failed")
+
+            self.reconnects += 1
+            attempt += 1
+            await asyncio.sleep(random.uniform(0, min(30, 0.5 * 2**attempt)))
+
+    async def handle(self, data: str) -> None:
+        # 메시지 하나를 처리하지 못해도 연결과 다른 메시지 처리는 계속한다.
+        try:
+            await self.dispatch(data)
+        except Exception as e:
+            logger.warning("KIS realtime message skipped: %r %.100r", e, data)
+            realtime_invalid_messages.inc()
+
+    async def dispatch(self, data: str) -> None:
+        # 실시간 데이터: "0|tr_id|건수|필드^필드^..." (1 로 시작하면 암호화된 데이터)
+        if data.startswith("0"):
+            parts = data.split("|", 3)
+            if len(parts) != 4:
+                raise ValueError("실시간 데이터 형식이 아닙니다.")
+            _, tr_id, count_text, payload = parts
+            fields = payload.split("^")
+            count = int(count_text)
+            if count <= 0 or len(fields) < count:
+                raise ValueError(f"실시간 데이터 건수가 맞지 않습니다. ({count_text})")
+            self.messages += 1
+            size = len(fields) // count
+            for offset in range(0, size * count, size):
+                record = fields[offset : offset + size]
+                self.publish(
+                    (tr_id, record[0]),
+                    {"channel": tr_id, "key": record[0], "fields": record},
+                )
+            return
+        if data.startswith("1"):
+            return
+
+        message = json.loads(data)
+        if not isinstance(message, dict):
+            raise ValueError("실시간 응답 형식이 아닙니다.")
+        header = message.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            # KIS 는 받은 PINGPONG 을 그대로 돌려보내야 연결을 유지한다.
+            if self.websocket is not None:
+                await self.websocket.send_str(data)
+            return
+
+        body = message.get("body", {})
+        if body.get("rt_cd", "0") != "0":
+            # 잘못된 종목코드 등으로 등록이 거절되면 해당 채널 구독자에게 알린다.
+            tr_id, tr_key = header.get("tr_id", ""), header.get("tr_key", "")
+            self.publish(
+                (tr_id, tr_key),
+                {"channel": tr_id, "key": tr_key, "error": body.get("msg1", "")},
+            )
+
+    def publish(self, channel: Channel, message: dict) -> None:
+        subscribers = self.subscribers.get(channel)
+        if not subscribers:
+            return
+        realtime_messages.inc(channel[0])
+        # 구독자 수와 상관없이 한 번만 직렬화한다.
+        text = json.dumps(message, ensure_ascii=False)
+        for subscriber in subscribers:
+            subscriber.send(text)
+
+    async def close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "appkey": self.token_issue_request.appkey[:4] + "****",
+            "is_real_domain": self.token_issue_request.is_real_domain,
+            "connected": self.websocket is not None,
+            "channels": len(self.subscribers),
+            "subscribers": self.clients,
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+        }
+
+
+class RealtimeHub:
+    def __init__(self, kis_client: KISClient, queue_size: int, max_channels: int):
+        self.kis_client = kis_client
+        self.queue_size = queue_size
+        self.max_channels = max_channels
+        # (appkey, 실전 도메인 여부) 마다 KIS 웹소켓 하나를 여러 클라이언트가 함께 쓴다.
+        self.feeds: dict[tuple[str, bool], KISRealtimeFeed] = {}
+
+    @classmethod
+    def create(cls, kis_client: KISClient, settings: Settings) -> "RealtimeHub":
+        return cls(
+            kis_client,
+            queue_size=settings.realtime_queue_size,
+            max_channels=settings.realtime_max_channels,
+        )
+
+    @staticmethod
+    def get_websocket_url(token_issue_request: TokenIssueRequest) -> str:
+        if token_issue_request.is_real_domain:
+            return get_settings().real_websocket_domain
+        else:
+            return get_settings().mock_websocket_domain
+
+    def connect(self, token_issue_request: TokenIssueRequest) -> RealtimeSubscriber:
+        key = (token_issue_request.appkey, token_issue_request.is_real_domain)
+        feed = self.feeds.get(key)
+        if feed is None:
+            feed = self.feeds[key] = KISRealtimeFeed(
+                self.kis_client,
+                token_issue_request,
+                self.get_websocket_url(token_issue_request),
+                self.max_channels,
+            )
+        feed.clients += 1
+        realtime_subscribers.inc()
+        return RealtimeSubscriber(feed, self.queue_size)
+
+    async def disconnect(self, subscriber: RealtimeSubscriber) -> None:
+        feed = subscriber.feed
+        for channel in list(subscriber.channels):
+            await feed.unsubscribe(subscriber, channel)
+        feed.clients -= 1
+        realtime_subscribers.dec()
+
+        # 마지막 클라이언트가 나가면 KIS 연결도 닫는다.
+        key = (feed.token_issue_request.appkey, feed.token_issue_request.is_real_domain)
+        if feed.clients == 0 and self.feeds.get(key) is feed:
+            del self.feeds[key]
+            await feed.close()
+
+    async def close(self) -> None:
+        feeds = list(self.feeds.values())
+        self.feeds.clear()
+        await asyncio.gather(*(feed.close() for feed in feeds))
+
+    def stats(self) -> list[dict]:
+        return [feed.stats() for feed in self.feeds.values()]
+
+
+def get_realtime_hub(connection: HTTPConnection) -> RealtimeHub:
+    return connection.app.state.realtime_hub
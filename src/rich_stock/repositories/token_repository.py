@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request, status
+
+from ..core.kis_client import KISClient
+from ..core.settings import Settings
+from ..entities.kis_token_entity import KISTokenRequest, KISTokenResponse
+from ..models.token_model import TokenIssueRequest
+
+
+class KISTokenRepository:
+    def __init__(self, kis_client: KISClient):
+        self.kis_client = kis_client
+
+    async def issue_token(
+        self, token_issue_request: TokenIssueRequest
+    ) -> KISTokenResponse:
+        url = token_issue_request.get_domain_url() + "/oauth2/tokenP"
+        kis_request = KISTokenRequest(
+            appkey=token_issue_request.appkey, appsecret=token_issue_request.appsecret
+        )
+        body = await self.kis_client.post(url, data=kis_request.model_dump_json())
+        if b"error_code" in body:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail=body.decode()
+            )
+
+        return KISTokenResponse.model_validate_json(body)
+
+
+class KISTokenCache:
+    def __init__(self, path: str | None, refresh_margin: float):
+        self.path = path
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self.entries: dict[str, KISTokenResponse] = {}
+        self.inflight: dict[str, asyncio.Task] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.entries = {
+                    key: KISTokenResponse.model_validate(value)
+                    for key, value in json.load(f).items()
+                }
+
+    @classmethod
+    def create(cls, settings: Settings) -> "KISTokenCache":
+        return cls(
+            path=settings.token_cache_path or None,
+            refresh_margin=settings.token_refresh_margin,
+        )
+
+    @staticmethod
+    def cache_key(token_issue_request: TokenIssueRequest) -> str:
+        # appsecret 까지 포함해서, 올바른 appsecret 을 가진 요청만 캐시된 토큰을 받도록 한다.
+        return hashlib.sha256(
+            "\n".join(
+                (
+                    token_issue_request.appkey,
+                    token_issue_request.appsecret,
+                    token_issue_request.get_domain_url(),
+                )
+            ).encode()
+        ).hexdigest()
+
+    def is_valid(self, kis_token_response: KISTokenResponse) -> bool:
+        expired = datetime.strptime(
+            kis_token_response.access_token_token_expired, "%Y-%m-%d %H:%M:%S"
+        )
+        return datetime.now() + self.refresh_margin < expired
+
+    async def get_or_issue(
+        self,
+        token_issue_request: TokenIssueRequest,
+        issue: Callable[[], Awaitable[KISTokenResponse]],
+    ) -> KISTokenResponse:
+        key = self.cache_key(token_issue_request)
+        kis_token_response = self.entries.get(key)
+        if kis_token_response is not None and self.is_valid(kis_token_response):
+            self.hits += 1
+            return kis_token_response
+
+        # KIS 는 토큰 재발급을 강하게 제한하므로, 같은 appkey 의 동시 발급은 한 번으로 합친다.
+        task = self.inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._issue(key, issue))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.inflight[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _issue(
+        self, key: str, issue: Callable[[], Awaitable[KISTokenResponse]]
+    ) -> KISTokenResponse:
+        try:
+            kis_token_response = await issue()
+            self.entries[key] = kis_token_response
+            await asyncio.to_thread(self.save)
+            return kis_token_response
+        finally:
+            del self.inflight[key]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+
+        # 재시작 후에도 토큰을 재사용할 수 있도록 만료되지 않은 토큰만 파일에 남긴다.
+        entries = {
+            key: value.model_dump()
+            for key, value in list(self.entries.items())
+            if self.is_valid(value)
+        }
+        temp_path = f"{self.path}.tmp"
+        with self.lock:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+
+    def stats(self) -> dict:
+        return {
+            "name": "token",
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+class CachedKISTokenRepository(KISTokenRepository):
+    def __init__(self, kis_client: KISClient, token_cache: KISTokenCache):
+        super().__init__(kis_client)
+        self.token_cache = token_cache
+
+    async def issue_token(
+        self, token_issue_request: TokenIssueRequest
+    ) -> KISTokenResponse:
+        return await self.token_cache.get_or_issue(
+            token_issue_request, partial(super().issue_token, token_issue_request)
+        )
+
+
+def get_token_cache(request: Request) -> KISTokenCache:
+    return request.app.state.token_cache
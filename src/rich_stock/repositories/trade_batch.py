@@ -0,0 +1,274 @@
+import math
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from pydantic_core import to_json
+
+from ..core.responses import compute_etag
+from ..models.enums import CurrencyCode, SellBuyType
+from ..models.history_model import DailyHistoryDetailResponse, DailyHistoryResponse
+
+
+# DailyHistoryDetailResponse 와 같은 필드/순서. (JSON 키 순서도 이것을 따른다)
+TRADE_FIELDS = (
+    "trade_day",
+    "sell_buy_type",
+    "ticker",
+    "ticker_name",
+    "trade_quantity",
+    "trade_quantity_decimal",
+    "trade_price_unit",
+    "trade_price",
+    "trade_fee",
+    "currency",
+)
+
+ROW_JSON = b"{" + b",".join(b'"%s":%%s' % f.encode() for f in TRADE_FIELDS) + b"}"
+
+
+def encode_numbers(column: array) -> list[bytes]:
+    # 숫자 컬럼은 통째로 직렬화한 뒤 쉼표로 나눈다. (숫자 표현에는 쉼표가 없다)
+    return to_json(column.tolist())[1:-1].split(b",") if column else []
+
+
+def encode_strings(column: list) -> list[bytes]:
+    # 종목/일자/통화는 몇 가지 값이 반복되므로 값마다 한 번만 직렬화한다.
+    encoded = {value: to_json(value) for value in set(column)}
+    return list(map(encoded.__getitem__, column))
+
+
+def add_exact(partials: list[float], value: float) -> None:
+    # 합을 서로 겹치지 않는 float 들로 나눠 들고 있어서 반올림 오차가 쌓이지 않는다. (math.fsum 과 같은 방식)
+    index = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[index] = low
+            index += 1
+        value = high
+    partials[index:] = [value]
+
+
+class TradeTotals:
+    # 매수/매도 체결금액 합계. KIS 가 주는 합계 대신 행에서 계산해서, KIS 에서 받든 저장소에서 읽든
+    # 행 순서나 페이지 나눔과 상관없이 같은 값이 나오게 한다.
+    __slots__ = ("buy", "sell")
+
+    def __init__(self) -> None:
+        self.buy: list[float] = []
+        self.sell: list[float] = []
+
+    def add(self, batch: "TradeBatch") -> None:
+        buy, sell = SellBuyType.BUY.value, SellBuyType.SELL.value
+        for sell_buy_type, trade_price in zip(batch.sell_buy_type, batch.trade_price):
+            if sell_buy_type == buy:
+                add_exact(self.buy, trade_price)
+            elif sell_buy_type == sell:
+                add_exact(self.sell, trade_price)
+
+    def amounts(self) -> tuple[float, float]:
+        return math.fsum(self.buy), math.fsum(self.sell)
+
+
+class TradeRow:
+    # 행 객체를 따로 만들지 않고 TradeBatch 의 index 번째 값을 읽는 뷰.
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: "TradeBatch", index: int):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def trade_day(self) -> str:
+        return self.batch.trade_day[self.index]
+
+    @property
+    def sell_buy_type(self) -> SellBuyType:
+        return SellBuyType(self.batch.sell_buy_type[self.index])
+
+    @property
+    def ticker(self) -> str:
+        return self.batch.ticker[self.index]
+
+    @property
+    def ticker_name(self) -> str:
+        return self.batch.ticker_name[self.index]
+
+    @property
+    def trade_quantity(self) -> int:
+        return self.batch.trade_quantity[self.index]
+
+    @property
+    def trade_quantity_decimal(self) -> float:
+        return self.batch.trade_quantity_decimal[self.index]
+
+    @property
+    def trade_price_unit(self) -> float:
+        return self.batch.trade_price_unit[self.index]
+
+    @property
+    def trade_price(self) -> float:
+        return self.batch.trade_price[self.index]
+
+    @property
+    def trade_fee(self) -> float:
+        return self.batch.trade_fee[self.index]
+
+    @property
+    def currency(self) -> CurrencyCode:
+        return self.batch.currency[self.index]
+
+
+class TradeBatch:
+    # 거래내역 한 페이지를 행(모델) 대신 컬럼으로 들고 있는다.
+    # 숫자는 array 에 값으로, 문자열은 intern 해서 같은 값을 한 객체로 같이 쓴다.
+    __slots__ = (*TRADE_FIELDS, "total_buy_amount", "total_sell_amount")
+
+    def __init__(self, total_buy_amount: float = 0.0, total_sell_amount: float = 0.0):
+        self.trade_day: list[str] = []
+        self.sell_buy_type = array("b")
+        self.ticker: list[str] = []
+        self.ticker_name: list[str] = []
+        self.trade_quantity = array("q")
+        self.trade_quantity_decimal = array("d")
+        self.trade_price_unit = array("d")
+        self.trade_price = array("d")
+        self.trade_fee = array("d")
+        self.currency: list[CurrencyCode] = []
+        self.total_buy_amount = total_buy_amount
+        self.total_sell_amount = total_sell_amount
+
+    def append(
+        self,
+        trade_day: str,
+        sell_buy_type: int,
+        ticker: str,
+        ticker_name: str,
+        trade_quantity: int,
+        trade_quantity_decimal: float,
+        trade_price_unit: float,
+        trade_price: float,
+        trade_fee: float,
+        currency: str,
+    ) -> None:
+        self.trade_day.append(sys.intern(trade_day))
+        self.sell_buy_type.append(sell_buy_type)
+        self.ticker.append(sys.intern(ticker))
+        self.ticker_name.append(sys.intern(ticker_name))
+        self.trade_quantity.append(trade_quantity)
+        self.trade_quantity_decimal.append(trade_quantity_decimal)
+        self.trade_price_unit.append(trade_price_unit)
+        self.trade_price.append(trade_price)
+        self.trade_fee.append(trade_fee)
+        self.currency.append(CurrencyCode(currency))
+
+    def extend(self, other: "TradeBatch") -> None:
+        for field in TRADE_FIELDS:
+            getattr(self, field).extend(getattr(other, field))
+
+    @classmethod
+    def concatenate(
+        cls,
+        batches: Iterable["TradeBatch"],
+        total_buy_amount: float,
+        total_sell_amount: float,
+    ) -> "TradeBatch":
+        batch = cls(total_buy_amount, total_sell_amount)
+        for other in batches:
+            batch.extend(other)
+        return batch
+
+    def select(self, indexes: list[int]) -> "TradeBatch":
+        batch = TradeBatch(self.total_buy_amount, self.total_sell_amount)
+        for field in TRADE_FIELDS:
+            column = getattr(self, field)
+            getattr(batch, field).extend([column[index] for index in indexes])
+        return batch
+
+    def with_totals(
+        self, total_buy_amount: float, total_sell_amount: float
+    ) -> "TradeBatch":
+        # 컬럼은 복사하지 않고 같이 쓴다.
+        batch = TradeBatch.__new__(TradeBatch)
+        for field in TRADE_FIELDS:
+            setattr(batch, field, getattr(self, field))
+        batch.total_buy_amount = total_buy_amount
+        batch.total_sell_amount = total_sell_amount
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.trade_day)
+
+    def __iter__(self) -> Iterator[TradeRow]:
+        return (TradeRow(self, index) for index in range(len(self)))
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*(getattr(self, field) for field in TRADE_FIELDS))
+
+    def iter_json_rows(self) -> Iterator[bytes]:
+        columns = [
+            (
+                encode_numbers(column)
+                if isinstance(column, array)
+                else encode_strings(column)
+            )
+            for column in (getattr(self, field) for field in TRADE_FIELDS)
+        ]
+        return (ROW_JSON % row for row in zip(*columns))
+
+    def to_json(self) -> bytes:
+        # DailyHistoryResponse 와 같은 JSON 을 행 모델/dict 없이 컬럼에서 바로 만든다.
+        return b"".join(
+            (
+                b'{"items":[',
+                b",".join(self.iter_json_rows()),
+                b'],"total_buy_amount":',
+                to_json(float(self.total_buy_amount)),
+                b',"total_sell_amount":',
+                to_json(float(self.total_sell_amount)),
+                b"}",
+            )
+        )
+
+    def etag(self) -> str:
+        # JSON 을 만들지 않고 컬럼 내용으로 ETag 를 만든다. (If-None-Match 가 같으면 직렬화하지 않는다)
+        # 컬럼과 문자열 값마다 길이를 앞에 붙여서, 경계가 다른 두 내용이 같은 바이트열이 되지 않게 한다.
+        parts: list[bytes | array] = [
+            struct.pack(
+                "<qdd", len(self), self.total_buy_amount, self.total_sell_amount
+            )
+        ]
+        for field in TRADE_FIELDS:
+            column = getattr(self, field)
+            if isinstance(column, array):
+                parts += (struct.pack("<I", len(column) * column.itemsize), column)
+            else:
+                # 값마다 글자 수를 적어두면 이어붙인 문자열에서 경계가 하나로 정해진다.
+                data = "".join(column).encode()
+                parts += (
+                    struct.pack("<I", len(data)),
+                    array("I", map(len, column)),
+                    data,
+                )
+        return compute_etag(*parts)
+
+    def to_response(self) -> DailyHistoryResponse:
+        # 다른 응답 모델 안에 넣어야 할 때(포트폴리오)만 행 모델로 바꾼다.
+        return DailyHistoryResponse.model_construct(
+            items=[
+                DailyHistoryDetailResponse.model_construct(
+                    **{
+                        **dict(zip(TRADE_FIELDS, row)),
+                        "sell_buy_type": SellBuyType(row[1]),
+                    }
+                )
+                for row in self.rows()
+            ],
+            total_buy_amount=self.total_buy_amount,
+            total_sell_amount=self.total_sell_amount,
+        )
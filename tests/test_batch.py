@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, status
+
+from rich_stock.core.batch import gather_items, item_error
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_gather_items_bounds_concurrency_and_keeps_order():
+    running = 0
+    peak = 0
+
+    async def load(value: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (5 - value))
+        running -= 1
+        return value
+
+    assert await gather_items((load(value) for value in range(5)), 2) == [0, 1, 2, 3, 4]
+    assert peak == 2
+
+
+def test_item_error_keeps_http_detail_and_hides_other_errors():
+    assert item_error(
+        HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="없음"),
+        "조회 중 오류가 발생했습니다.",
+        "quote",
+    ) == (status.HTTP_404_NOT_FOUND, "없음")
+    assert item_error(
+        RuntimeError("secret upstream body"), "조회 중 오류가 발생했습니다.", "quote"
+    ) == (status.HTTP_502_BAD_GATEWAY, "조회 중 오류가 발생했습니다.")
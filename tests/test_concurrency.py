@@ -0,0 +1,79 @@
+import asyncio
+from functools import partial
+from typing import AsyncIterator
+
+import pytest
+
+from rich_stock.core.concurrency import merge_as_ready, merge_in_order
+
+
+class Source:
+    # 꺼내간 개수와 상관없이 source 가 지금까지 만든 개수를 센다.
+    def __init__(self, name: str, count: int):
+        self.name = name
+        self.count = count
+        self.produced = 0
+
+    async def __call__(self) -> AsyncIterator[str]:
+        for seq in range(self.count):
+            self.produced += 1
+            yield f"{self.name}{seq}"
+
+
+async def settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_merge_in_order_keeps_source_order():
+    sources = [Source("a", 3), Source("b", 2), Source("c", 1)]
+    items = [item async for item in merge_in_order(sources, concurrency=2)]
+
+    assert items == ["a0", "a1", "a2", "b0", "b1", "c0"]
+
+
+@pytest.mark.anyio
+async def test_merge_in_order_bounds_buffered_items():
+    sources = [Source("a", 100), Source("b", 100)]
+    merged = merge_in_order(sources, concurrency=2, buffer_size=1)
+
+    assert await anext(merged) == "a0"
+    await settle()
+    # 큐에 buffer_size 개, 넣으려고 기다리는 1 개까지만 만들고 멈춘다.
+    assert sources[0].produced <= 3
+    assert sources[1].produced <= 2
+    await merged.aclose()
+
+
+@pytest.mark.anyio
+async def test_merge_as_ready_bounds_buffered_items():
+    sources = [Source("a", 100), Source("b", 100), Source("c", 100)]
+    merged = merge_as_ready((source() for source in sources), buffer_size=1)
+
+    await anext(merged)
+    await settle()
+    assert sum(source.produced for source in sources) <= 1 + 1 + len(sources)
+    await merged.aclose()
+
+    items = [item async for item in merge_as_ready(source() for source in sources)]
+    assert sorted(items) == sorted(
+        f"{name}{seq}" for name in "abc" for seq in range(100)
+    )
+
+
+@pytest.mark.anyio
+async def test_merge_in_order_raises_source_errors():
+    async def failing() -> AsyncIterator[str]:
+        yield "x0"
+        raise RuntimeError("boom")
+
+    merged = merge_in_order([failing, partial(Source("b", 5))], concurrency=2)
+    assert await anext(merged) == "x0"
+    with pytest.raises(RuntimeError):
+        await anext(merged)
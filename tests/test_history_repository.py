@@ -0,0 +1,121 @@
+from typing import AsyncIterator, cast
+
+import pytest
+
+from rich_stock.core.kis_client import KISClient
+from rich_stock.core.settings import get_settings
+from rich_stock.models.enums import CurrencyCode, OverseasMarketCode
+from rich_stock.models.token_credential_model import TokenCredential
+from rich_stock.repositories.history_planner import HistoryWindow
+from rich_stock.repositories.history_repository import (
+    KISOverseasDailyHistoryRepository,
+)
+from rich_stock.repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+)
+from rich_stock.repositories.trade_batch import TradeBatch
+
+
+TOKEN_CREDENTIAL = TokenCredential(
+    appkey="appkey",
+    appsecret="appsecret",
+    account_number="12345678-01",
+    is_real_domain=True,
+    access_token="access",
+    token_type="Bearer",
+    expires_in=86400,
+    access_token_token_expired="2099-01-01 00:00:00",
+)
+
+
+class FakeOverseasHistoryRepository(KISOverseasDailyHistoryRepository):
+    # 거래소마다 그 거래소 종목 체결을 rows 건씩 돌려주고, 어느 거래소를 조회했는지 기록한다.
+    calls: list[OverseasMarketCode] = []
+    rows = 1
+
+    async def iter_market_history(
+        self, window: HistoryWindow, market: OverseasMarketCode
+    ) -> AsyncIterator[TradeBatch]:
+        FakeOverseasHistoryRepository.calls.append(market)
+        page = TradeBatch()
+        for seq in range(self.rows):
+            page.append(
+                window.begin_date,
+                2,
+                f"{market.value}{seq}",
+                market.value,
+                1,
+                1.0,
+                1.0,
+                1.0,
+                0.0,
+                CurrencyCode.USD,
+            )
+        yield page
+
+
+def create_repository(
+    markets: list[OverseasMarketCode] | None,
+) -> FakeOverseasHistoryRepository:
+    return FakeOverseasHistoryRepository(
+        TOKEN_CREDENTIAL, cast(KISClient, None), markets
+    )
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setenv("real_domain", "http://kis")
+    get_settings.cache_clear()
+    FakeOverseasHistoryRepository.calls = []
+    FakeOverseasHistoryRepository.rows = 1
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def store():
+    store = TradeHistoryStore(":memory:")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_deduplicates_markets():
+    FakeOverseasHistoryRepository.rows = 10
+    repository = create_repository(
+        [OverseasMarketCode.Nasdaq, OverseasMarketCode.Nasdaq]
+    )
+
+    assert repository.markets == [OverseasMarketCode.Nasdaq]
+    assert repository.market == "NASD"
+    batch = await repository.get_daily_history("20240101", "20240110")
+    assert len(batch) == 10
+    assert FakeOverseasHistoryRepository.calls == [OverseasMarketCode.Nasdaq]
+
+
+@pytest.mark.anyio
+async def test_stores_each_exchange_separately(store):
+    all_markets = StoredDailyHistoryRepository(create_repository(None), store)
+    batch = await all_markets.get_daily_history("20240101", "20240110")
+    assert sorted(batch.ticker_name) == ["AMEX", "NASD", "NYSE"]
+    assert len(FakeOverseasHistoryRepository.calls) == 3
+
+    # 전체 거래소 조회로 저장한 체결을 한 거래소 조회에서도 KIS 를 거치지 않고 읽는다.
+    nyse = StoredDailyHistoryRepository(
+        create_repository([OverseasMarketCode.NYSE]), store
+    )
+    batch = await nyse.get_daily_history("20240101", "20240110")
+    assert list(batch.ticker_name) == ["NYSE"]
+    assert len(FakeOverseasHistoryRepository.calls) == 3
+    assert store.get_synced_ranges(*nyse.key) == [("20240101", "20240110")]
+
+    # 다시 전체 조회를 해도 저장된 내용만으로 같은 결과를 돌려준다.
+    batch = await all_markets.get_daily_history("20240101", "20240110")
+    assert sorted(batch.ticker_name) == ["AMEX", "NASD", "NYSE"]
+    assert len(FakeOverseasHistoryRepository.calls) == 3
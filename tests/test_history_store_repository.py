@@ -0,0 +1,89 @@
+import pytest
+
+from rich_stock.models.enums import CurrencyCode
+from rich_stock.repositories.history_store_repository import (
+    TradeHistoryStore,
+    split_segments,
+)
+from rich_stock.repositories.trade_batch import TradeBatch
+
+
+OWNER = ("owner-hash", "12345678-01", True, "KRX")
+OTHER = ("other-hash", "12345678-01", True, "KRX")
+
+
+def create_batch(*trade_days: str) -> TradeBatch:
+    batch = TradeBatch()
+    for trade_day in trade_days:
+        batch.append(
+            trade_day,
+            2,
+            "005930",
+            "삼성",
+            1,
+            0.0,
+            70000.0,
+            70000.0,
+            0.0,
+            CurrencyCode.KRW,
+        )
+    return batch
+
+
+@pytest.fixture
+def store():
+    store = TradeHistoryStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_keeps_disjoint_synced_ranges(store):
+    store.save(*OWNER, "20240101", "20240131", create_batch("20240110"))
+    store.save(*OWNER, "20240301", "20240331", create_batch("20240310"))
+    # 떨어진 구간을 저장해도 앞의 동기화 구간을 잊지 않는다.
+    store.save(*OWNER, "20240101", "20240131", create_batch("20240110"))
+
+    assert store.get_synced_ranges(*OWNER) == [
+        ("20240101", "20240131"),
+        ("20240301", "20240331"),
+    ]
+    assert list(store.load(*OWNER, "20240101", "20240331").trade_day) == [
+        "20240110",
+        "20240310",
+    ]
+
+
+def test_merges_touching_and_overlapping_ranges(store):
+    store.save(*OWNER, "20240101", "20240131", create_batch())
+    store.save(*OWNER, "20240301", "20240331", create_batch())
+    store.save(*OWNER, "20240201", "20240305", create_batch())
+
+    assert store.get_synced_ranges(*OWNER) == [("20240101", "20240331")]
+
+
+def test_separates_credentials_with_the_same_account_number(store):
+    store.save(*OWNER, "20240101", "20240131", create_batch("20240110"))
+
+    assert store.get_synced_ranges(*OTHER) == []
+    assert len(store.load(*OTHER, "20240101", "20240131")) == 0
+
+
+def test_split_segments():
+    synced_ranges = [("20240105", "20240110"), ("20240115", "20240120")]
+
+    assert split_segments("20240101", "20240131", synced_ranges) == [
+        ("20240101", "20240104", False),
+        ("20240105", "20240110", True),
+        ("20240111", "20240114", False),
+        ("20240115", "20240120", True),
+        ("20240121", "20240131", False),
+    ]
+    assert split_segments("20240106", "20240108", synced_ranges) == [
+        ("20240106", "20240108", True)
+    ]
+    assert split_segments("20240201", "20240210", synced_ranges) == [
+        ("20240201", "20240210", False)
+    ]
+    assert split_segments("20240110", "20240105", synced_ranges) == [
+        ("20240110", "20240105", False)
+    ]
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import HTTPException
+
+from rich_stock.core.kis_client import KISClient
+from rich_stock.core.rate_limiter import KISRequestScheduler
+from rich_stock.core.resilience import ResiliencePolicy
+from rich_stock.models.token_model import TokenIssueRequest
+
+
+TOKEN_CREDENTIAL = TokenIssueRequest(
+    appkey="appkey",
+    appsecret="appsecret",
+    account_number="12345678-01",
+    is_real_domain=True,
+)
+HEADERS = {"tr_id": "TTTC8434R"}
+RATE_LIMITED = json.dumps(
+    {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+)
+OK = json.dumps({"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다."})
+
+
+class FakeKIS:
+    # 요청마다 정해둔 (status, body, 지연초) 를 차례로 돌려주는 로컬 KIS 대역 서버.
+    def __init__(self, *responses: tuple[int, str, float]):
+        self.responses = list(responses)
+        self.requests = 0
+        self.cancelled = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        status, body, delay = self.responses.pop(0) if self.responses else (200, OK, 0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return web.Response(status=status, text=body)
+
+
+class RecordingPolicy(ResiliencePolicy):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(
+            **{
+                "timeout": 1.0,
+                "retry_attempts": 2,
+                "retry_backoff": 0.01,
+                "retry_backoff_max": 0.01,
+                "retryable_msg_cds": frozenset({"EGW00201"}),
+                "breaker_failures": 100,
+                "breaker_reset": 30.0,
+                "hedge_delay": 0.0,
+                **kwargs,
+            }
+        )
+        self.backoffs: list[int] = []
+
+    def backoff(self, attempt: int) -> float:
+        self.backoffs.append(attempt)
+        return super().backoff(attempt)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@asynccontextmanager
+async def serve(
+    fake_kis: FakeKIS, policy: RecordingPolicy
+) -> AsyncIterator[tuple[KISClient, str]]:
+    app = web.Application()
+    app.router.add_get("/quote", fake_kis.handle)
+    # 클라이언트가 끊은 요청의 핸들러도 취소해서, 서버에서 취소 여부를 볼 수 있게 한다.
+    server = TestServer(app, handler_cancellation=True)
+    await server.start_server()
+    kis_client = KISClient(
+        aiohttp.ClientSession(),
+        KISRequestScheduler(1000, 1000, 1000, 1000),
+        policy,
+    )
+    try:
+        yield kis_client, str(server.make_url("/quote"))
+    finally:
+        await kis_client.session.close()
+        await server.close()
+
+
+async def get(kis_client: KISClient, url: str):
+    return await kis_client.get(TOKEN_CREDENTIAL, url, params={}, headers=HEADERS)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "status, body",
+    [(500, RATE_LIMITED), (502, ""), (503, ""), (504, ""), (429, "")],
+)
+async def test_retries_transient_errors_with_backoff(status, body):
+    fake_kis = FakeKIS((status, body, 0), (status, body, 0))
+    policy = RecordingPolicy()
+    async with serve(fake_kis, policy) as (kis_client, url):
+        response = await get(kis_client, url)
+
+    assert response.status == 200
+    assert fake_kis.requests == 3
+    assert policy.backoffs == [0, 1]
+
+
+@pytest.mark.anyio
+async def test_does_not_retry_business_errors():
+    fake_kis = FakeKIS((500, json.dumps({"rt_cd": "1", "msg_cd": "APBK0013"}), 0))
+    policy = RecordingPolicy()
+    async with serve(fake_kis, policy) as (kis_client, url):
+        response = await get(kis_client, url)
+
+    assert response.status == 500
+    assert fake_kis.requests == 1
+    assert policy.backoffs == []
+
+
+@pytest.mark.anyio
+async def test_gives_up_after_retries():
+    fake_kis = FakeKIS(*[(503, "", 0)] * 3)
+    async with serve(fake_kis, RecordingPolicy()) as (kis_client, url):
+        with pytest.raises(HTTPException) as exc_info:
+            await get(kis_client, url)
+
+    assert exc_info.value.status_code == 503
+    assert fake_kis.requests == 3
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_opens_half_opens_and_closes():
+    fake_kis = FakeKIS((503, "", 0), (503, "", 0), (503, "", 0))
+    policy = RecordingPolicy(retry_attempts=0, breaker_failures=2, breaker_reset=0.1)
+    async with serve(fake_kis, policy) as (kis_client, url):
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await get(kis_client, url)
+        breaker = kis_client.breakers[("real", HEADERS["tr_id"])]
+        assert breaker.is_open
+
+        # open: KIS 에 보내지 않고 바로 거절한다.
+        with pytest.raises(HTTPException) as exc_info:
+            await get(kis_client, url)
+        assert exc_info.value.status_code == 503
+        assert fake_kis.requests == 2
+
+        # half-open: 시험 요청이 실패하면 다시 열린다.
+        await asyncio.sleep(0.1)
+        with pytest.raises(HTTPException):
+            await get(kis_client, url)
+        assert fake_kis.requests == 3
+        assert breaker.is_open
+        with pytest.raises(HTTPException):
+            await get(kis_client, url)
+        assert fake_kis.requests == 3
+
+        # half-open: 시험 요청이 성공하면 닫힌다.
+        await asyncio.sleep(0.1)
+        assert (await get(kis_client, url)).status == 200
+        assert not breaker.is_open
+        assert (await get(kis_client, url)).status == 200
+        assert fake_kis.requests == 5
+
+
+@pytest.mark.anyio
+async def test_half_open_allows_a_single_trial():
+    fake_kis = FakeKIS((503, "", 0), (200, OK, 0.2))
+    policy = RecordingPolicy(retry_attempts=0, breaker_failures=1, breaker_reset=0.1)
+    async with serve(fake_kis, policy) as (kis_client, url):
+        with pytest.raises(HTTPException):
+            await get(kis_client, url)
+        await asyncio.sleep(0.1)
+
+        trial = asyncio.create_task(get(kis_client, url))
+        await asyncio.sleep(0.05)
+        # 시험 요청이 끝나기 전의 요청은 거절한다.
+        with pytest.raises(HTTPException) as exc_info:
+            await get(kis_client, url)
+        assert exc_info.value.status_code == 503
+        assert (await trial).status == 200
+        assert fake_kis.requests == 2
+
+
+@pytest.mark.anyio
+async def test_timeout_becomes_504():
+    fake_kis = FakeKIS((200, OK, 1.0))
+    policy = RecordingPolicy(timeout=0.1, retry_attempts=0)
+    async with serve(fake_kis, policy) as (kis_client, url):
+        with pytest.raises(HTTPException) as exc_info:
+            await get(kis_client, url)
+
+    assert exc_info.value.status_code == 504
+
+
+@pytest.mark.anyio
+async def test_hedged_request_is_cancelled_when_primary_wins():
+    # 1번 요청(primary)은 hedge 지연보다 늦지만, 2번 요청(hedge)보다는 먼저 끝난다.
+    fake_kis = FakeKIS(
+        (200, '{"from": "primary"}', 0.2), (200, '{"from": "hedge"}', 5.0)
+    )
+    policy = RecordingPolicy(retry_attempts=0, hedge_delay=0.05)
+    async with serve(fake_kis, policy) as (kis_client, url):
+        started = time.perf_counter()
+        response = await get(kis_client, url)
+        elapsed = time.perf_counter() - started
+
+        assert json.loads(response.body) == {"from": "primary"}
+        assert fake_kis.requests == 2
+        assert elapsed < 1.0
+        for _ in range(50):
+            if fake_kis.cancelled:
+                break
+            await asyncio.sleep(0.01)
+        assert fake_kis.cancelled == 1
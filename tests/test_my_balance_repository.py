@@ -0,0 +1,74 @@
+import pytest
+
+from rich_stock.core.cache import TTLCache
+from rich_stock.models.my_balance_model import MyBalanceResponse
+from rich_stock.models.token_credential_model import TokenCredential
+from rich_stock.repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
+    MyBalanceRepositoryABC,
+)
+
+
+def create_credential(appkey: str, appsecret: str = "appsecret") -> TokenCredential:
+    return TokenCredential(
+        appkey=appkey,
+        appsecret=appsecret,
+        account_number="12345678-01",
+        is_real_domain=True,
+        access_token="access",
+        token_type="Bearer",
+        expires_in=86400,
+        access_token_token_expired="2099-01-01 00:00:00",
+    )
+
+
+class FakeBalanceRepository(MyBalanceRepositoryABC):
+    market = "KRX"
+
+    def __init__(self, token_credential: TokenCredential, deposit: int):
+        self.token_credential = token_credential
+        self.deposit = deposit
+        self.calls = 0
+
+    async def get_my_balance(self) -> MyBalanceResponse:
+        self.calls += 1
+        return MyBalanceResponse(deposit=self.deposit)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_same_account_number_with_other_appkey_is_cached_separately():
+    cache = TTLCache("balance", ttl=60, max_size=16)
+    owner = FakeBalanceRepository(create_credential("owner"), deposit=1000)
+    other = FakeBalanceRepository(create_credential("other"), deposit=0)
+
+    assert (
+        await CachedMyBalanceRepository(owner, cache).get_my_balance()
+    ).deposit == 1000
+    # 계좌번호만 같은 다른 appkey 는 캐시된 잔고를 받지 못하고 직접 조회한다.
+    assert (await CachedMyBalanceRepository(other, cache).get_my_balance()).deposit == 0
+    assert owner.calls == 1
+    assert other.calls == 1
+    assert cache.stats()["size"] == 2
+
+
+@pytest.mark.anyio
+async def test_appsecret_is_part_of_the_cache_key():
+    cache = TTLCache("balance", ttl=60, max_size=16)
+    owner = FakeBalanceRepository(create_credential("owner"), deposit=1000)
+    guess = FakeBalanceRepository(create_credential("owner", "guess"), deposit=0)
+
+    await CachedMyBalanceRepository(owner, cache).get_my_balance()
+    assert (await CachedMyBalanceRepository(guess, cache).get_my_balance()).deposit == 0
+    assert guess.calls == 1
+
+    # 같은 자격증명은 캐시를 함께 쓴다.
+    again = FakeBalanceRepository(create_credential("owner"), deposit=1)
+    assert (
+        await CachedMyBalanceRepository(again, cache).get_my_balance()
+    ).deposit == 1000
+    assert again.calls == 0
@@ -0,0 +1,158 @@
+from datetime import date, timedelta
+from typing import AsyncIterator, cast
+
+import pytest
+
+from rich_stock.core.cache import TTLCache
+from rich_stock.core.kis_client import KISClient
+from rich_stock.core.rate_limiter import KISRequestScheduler
+from rich_stock.models.enums import CurrencyCode
+from rich_stock.models.my_balance_model import MyBalanceResponse
+from rich_stock.models.token_credential_model import TokenCredential
+from rich_stock.repositories import prefetch_repository
+from rich_stock.repositories.history_planner import HistoryWindow
+from rich_stock.repositories.history_repository import DailyHistoryRepository
+from rich_stock.repositories.history_store_repository import (
+    StoredDailyHistoryRepository,
+    TradeHistoryStore,
+)
+from rich_stock.repositories.my_balance_repository import (
+    CachedMyBalanceRepository,
+    MyBalanceRepositoryABC,
+)
+from rich_stock.repositories.prefetch_repository import PrefetchScheduler
+from rich_stock.repositories.token_repository import KISTokenCache
+from rich_stock.repositories.trade_batch import TradeBatch
+
+
+def create_credential(appkey: str) -> TokenCredential:
+    return TokenCredential(
+        appkey=appkey,
+        appsecret="appsecret",
+        account_number="12345678-01",
+        is_real_domain=True,
+        access_token="access",
+        token_type="Bearer",
+        expires_in=86400,
+        access_token_token_expired="2099-01-01 00:00:00",
+    )
+
+
+class FakeBalanceRepository(MyBalanceRepositoryABC):
+    market = "KRX"
+    calls = 0
+
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
+        self.token_credential = token_credential
+
+    async def get_my_balance(self) -> MyBalanceResponse:
+        FakeBalanceRepository.calls += 1
+        return MyBalanceResponse(deposit=1000)
+
+
+class FakeHistoryRepository(DailyHistoryRepository):
+    market = "KRX"
+    calls = 0
+
+    def __init__(self, token_credential: TokenCredential, kis_client: KISClient):
+        self.token_credential = token_credential
+
+    async def iter_window_history(
+        self, window: HistoryWindow
+    ) -> AsyncIterator[TradeBatch]:
+        FakeHistoryRepository.calls += 1
+        batch = TradeBatch()
+        batch.append(
+            window.begin_date,
+            2,
+            "005930",
+            "삼성",
+            1,
+            0.0,
+            1.0,
+            1.0,
+            0.0,
+            CurrencyCode.KRW,
+        )
+        yield batch
+
+
+class FakeKISClient:
+    def __init__(self) -> None:
+        self.scheduler = KISRequestScheduler(1, 1, 1, 1)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(
+        prefetch_repository, "BALANCE_REPOSITORIES", {"kr": FakeBalanceRepository}
+    )
+    monkeypatch.setattr(
+        prefetch_repository, "HISTORY_REPOSITORIES", {"kr": FakeHistoryRepository}
+    )
+    FakeBalanceRepository.calls = 0
+    FakeHistoryRepository.calls = 0
+    history_store = TradeHistoryStore(":memory:")
+    yield PrefetchScheduler(
+        cast(KISClient, FakeKISClient()),
+        KISTokenCache(None, refresh_margin=60),
+        TTLCache("balance", ttl=60, max_size=16),
+        history_store,
+        TTLCache("history", ttl=60, max_size=16),
+        accounts=[],
+        schedules={},
+        duration=0,
+        interval=0,
+        history_days=10,
+        concurrency=1,
+    )
+    history_store.close()
+
+
+@pytest.mark.anyio
+async def test_warmed_balance_is_only_served_to_the_same_credential(scheduler):
+    owner, other = create_credential("owner"), create_credential("other")
+    await scheduler.refresh_balance("kr", owner)
+    assert FakeBalanceRepository.calls == 1
+
+    kis_client = scheduler.kis_client
+    await CachedMyBalanceRepository(
+        FakeBalanceRepository(owner, kis_client), scheduler.balance_cache
+    ).get_my_balance()
+    assert FakeBalanceRepository.calls == 1
+
+    # 계좌번호만 같은 다른 appkey 는 미리 채운 잔고를 받지 못한다.
+    await CachedMyBalanceRepository(
+        FakeBalanceRepository(other, kis_client), scheduler.balance_cache
+    ).get_my_balance()
+    assert FakeBalanceRepository.calls == 2
+
+
+@pytest.mark.anyio
+async def test_synced_history_is_only_served_to_the_same_credential(scheduler):
+    owner, other = create_credential("owner"), create_credential("other")
+    assert scheduler.history_store is not None
+    await scheduler.sync_history("kr", owner, scheduler.history_store)
+    synced_calls = FakeHistoryRepository.calls
+
+    begin_date = (date.today() - timedelta(days=10)).strftime("%Y%m%d")
+    end_date = date.today().strftime("%Y%m%d")
+
+    def stored(credential: TokenCredential) -> StoredDailyHistoryRepository:
+        return StoredDailyHistoryRepository(
+            FakeHistoryRepository(credential, scheduler.kis_client),
+            scheduler.history_store,
+            scheduler.history_cache,
+        )
+
+    # 확정된 일자는 저장소에서, 최근 구간은 거래내역 캐시에서 읽는다.
+    await stored(owner).get_daily_history(begin_date, end_date)
+    assert FakeHistoryRepository.calls == synced_calls
+
+    await stored(other).get_daily_history(begin_date, end_date)
+    assert FakeHistoryRepository.calls > synced_calls
@@ -0,0 +1,189 @@
+import asyncio
+import json
+from typing import cast
+
+import aiohttp
+import pytest
+
+from rich_stock.core.kis_client import KISClient
+from rich_stock.core.metrics import realtime_invalid_messages
+from rich_stock.models.token_model import TokenIssueRequest
+from rich_stock.repositories import realtime_repository
+from rich_stock.repositories.realtime_repository import (
+    KISRealtimeFeed,
+    RealtimeSubscriber,
+)
+
+
+CHANNEL = ("H0STCNT0", "005930")
+
+
+class FakeWebSocket:
+    # KIS 실시간 웹소켓 대신 정해진 메시지를 보내고, 다 보내면 연결을 유지한 채 기다린다.
+    def __init__(self, messages: list[str]):
+        self.messages = messages
+        self.sent: list[str] = []
+        self.closed = False
+
+    async def send_str(self, data: str) -> None:
+        self.sent.append(data)
+
+    async def __aenter__(self) -> "FakeWebSocket":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.closed = True
+
+    async def __aiter__(self):
+        for data in self.messages:
+            yield aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, data, None)
+        await asyncio.Event().wait()
+
+
+class FakeSession:
+    def __init__(self, *connections):
+        # FakeWebSocket 을 돌려주거나, 예외면 연결할 때 던진다.
+        self.connections = list(connections)
+        self.connects = 0
+
+    def ws_connect(self, url: str):
+        self.connects += 1
+        connection = self.connections.pop(0)
+        if isinstance(connection, Exception):
+            raise connection
+        return connection
+
+
+class FakeKISClient:
+    def __init__(self, session: FakeSession):
+        self.session = session
+
+
+def create_feed(session: FakeSession) -> KISRealtimeFeed:
+    feed = KISRealtimeFeed(
+        cast(KISClient, FakeKISClient(session)),
+        TokenIssueRequest(
+            appkey="appkey",
+            appsecret="appsecret",
+            account_number="12345678-01",
+            is_real_domain=True,
+        ),
+        "ws://kis",
+        max_channels=41,
+    )
+    feed.approval_key = "approval"
+    return feed
+
+
+async def receive(subscriber: RealtimeSubscriber) -> dict:
+    message = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+    assert message is not None
+    return json.loads(message)
+
+
+async def wait_until(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(realtime_repository.random, "uniform", lambda a, b: 0)
+
+
+@pytest.mark.anyio
+async def test_publishes_records_to_subscribers():
+    websocket = FakeWebSocket(["0|H0STCNT0|002|005930^1^2^000660^3^4"])
+    feed = create_feed(FakeSession(websocket))
+    subscriber = RealtimeSubscriber(feed, queue_size=8)
+    other = RealtimeSubscriber(feed, queue_size=8)
+    await feed.subscribe(subscriber, CHANNEL)
+    await feed.subscribe(other, ("H0STCNT0", "000660"))
+
+    assert await receive(subscriber) == {
+        "channel": "H0STCNT0",
+        "key": "005930",
+        "fields": ["005930", "1", "2"],
+    }
+    assert (await receive(other))["fields"] == ["000660", "3", "4"]
+    assert feed.messages == 1
+    await feed.close()
+
+
+@pytest.mark.anyio
+async def test_skips_invalid_messages_without_reconnecting():
+    invalid = [
+        "",
+        "0|H0STCNT0|000|005930^1",
+        "0|H0STCNT0|-1|005930^1",
+        "0|H0STCNT0|abc|005930^1",
+        "0|H0STCNT0|003|005930^1",
+        "0|H0STCNT0",
+        "{not json",
+        "[]",
+    ]
+    session = FakeSession(FakeWebSocket([*invalid, "0|H0STCNT0|001|005930^9"]))
+    feed = create_feed(session)
+    subscriber = RealtimeSubscriber(feed, queue_size=8)
+    before = realtime_invalid_messages.values.get((), 0.0)
+    await feed.subscribe(subscriber, CHANNEL)
+
+    assert (await receive(subscriber))["fields"] == ["005930", "9"]
+    assert realtime_invalid_messages.values[()] - before == len(invalid)
+    assert session.connects == 1
+    assert feed.reconnects == 0
+    assert feed.messages == 1
+    await feed.close()
+
+
+@pytest.mark.anyio
+async def test_answers_pingpong():
+    pingpong = json.dumps({"header": {"tr_id": "PINGPONG"}})
+    websocket = FakeWebSocket([pingpong])
+    feed = create_feed(FakeSession(websocket))
+    await feed.subscribe(RealtimeSubscriber(feed, queue_size=8), CHANNEL)
+
+    await wait_until(lambda: pingpong in websocket.sent)
+    await feed.close()
+
+
+@pytest.mark.anyio
+async def test_reconnects_after_unexpected_error():
+    websocket = FakeWebSocket(["0|H0STCNT0|001|005930^1"])
+    feed = create_feed(FakeSession(RuntimeError("boom"), websocket))
+    subscriber = RealtimeSubscriber(feed, queue_size=8)
+    await feed.subscribe(subscriber, CHANNEL)
+
+    assert (await receive(subscriber))["fields"] == ["005930", "1"]
+    assert feed.reconnects == 1
+    # 다시 연결할 때 기존 구독을 다시 등록한다.
+    assert json.loads(websocket.sent[0])["body"]["input"]["tr_key"] == "005930"
+    await feed.close()
+
+
+@pytest.mark.anyio
+async def test_clears_task_when_it_ends():
+    feed = create_feed(FakeSession(FakeWebSocket([])))
+    await feed.subscribe(RealtimeSubscriber(feed, queue_size=8), CHANNEL)
+    task = feed.task
+    assert task is not None
+    await wait_until(lambda: feed.websocket is not None)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert feed.task is None
+
+    # 다음 구독에서 새로 시작한다.
+    feed.kis_client.session.connections.append(FakeWebSocket([]))
+    await feed.subscribe(RealtimeSubscriber(feed, queue_size=8), ("H0STCNT0", "1"))
+    assert feed.task is not None and feed.task is not task
+    await feed.close()